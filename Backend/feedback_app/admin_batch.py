@@ -0,0 +1,134 @@
+"""
+Multi-row admin mutations.
+
+A batch names a list of pks and either a field patch or a delete. Existing pks
+are found with one query and the change is applied with a single
+``QuerySet.update()`` / ``QuerySet.delete()`` inside one transaction, so only
+the patched columns are written. Results are reported per pk.
+"""
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import transaction
+
+from feedback_app import cache as feedback_cache
+from feedback_app import progress
+from feedback_app import student_auth
+
+# Keeps the pk IN (...) list well under SQL Server's 2100 parameter limit
+MAX_BATCH_ROWS = 1000
+
+
+class BatchError(ValueError):
+    """The batch request itself is invalid; nothing was written."""
+
+
+def _coerce_pks(model, raw_pks):
+    """(valid pks in request order, {raw pk: error}) after converting with the pk field."""
+    if not isinstance(raw_pks, list) or not raw_pks:
+        raise BatchError("pks must be a non-empty list")
+    if len(raw_pks) > MAX_BATCH_ROWS:
+        raise BatchError(f"at most {MAX_BATCH_ROWS} rows per batch")
+
+    pk_field = model._meta.pk
+    pks, invalid = [], {}
+    for raw in raw_pks:
+        try:
+            pk = pk_field.to_python(raw)
+        except ValidationError as e:
+            invalid[str(raw)] = "; ".join(e.messages)
+            continue
+        if pk not in pks:
+            pks.append(pk)
+    return pks, invalid
+
+
+def clean_patch(model, patch):
+    """{attname: value} for a field patch, validated with the model fields."""
+    if not isinstance(patch, dict) or not patch:
+        raise BatchError("patch must be a non-empty object")
+
+    cleaned, errors = {}, {}
+    for name, value in patch.items():
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            errors[name] = ["unknown field"]
+            continue
+        if not field.concrete or field.primary_key:
+            errors[name] = ["field cannot be updated"]
+            continue
+
+        if value in (None, ""):
+            if field.null:
+                cleaned[field.attname] = None
+            else:
+                errors[name] = ["This field cannot be null."]
+            continue
+
+        try:
+            if field.is_relation:
+                value = field.target_field.to_python(value)
+                if not field.related_model.objects.filter(pk=value).exists():
+                    raise ValidationError(f"Invalid ID {value} for field {name}")
+                cleaned[field.attname] = value
+            else:
+                cleaned[field.attname] = field.clean(value, None)
+        except ValidationError as e:
+            errors[name] = e.messages
+
+    if errors:
+        raise BatchError(errors)
+    return cleaned
+
+
+def _results(pks, found, invalid, done_status):
+    results = [{"pk": pk, "status": "invalid", "error": err} for pk, err in invalid.items()]
+    results += [
+        {"pk": pk, "status": done_status if pk in found else "not_found"} for pk in pks
+    ]
+    return results
+
+
+def batch_update(model, raw_pks, patch):
+    """Apply one field patch to every listed row; returns (updated count, per-pk results)."""
+    pks, invalid = _coerce_pks(model, raw_pks)
+    values = clean_patch(model, patch)
+
+    with transaction.atomic():
+        found = set(
+            model.objects.select_for_update().filter(pk__in=pks).values_list("pk", flat=True)
+        ) if pks else set()
+        cohorts = progress.cohorts_of(model, found)
+        updated = model.objects.filter(pk__in=found).update(**values) if found else 0
+        if updated:
+            progress.refresh_cohorts(cohorts | progress.cohorts_of(model, found))
+
+    if updated:
+        feedback_cache.invalidate_for_model(model)
+        student_auth.revoke_for_rows(model, found)
+    return updated, _results(pks, found, invalid, "updated")
+
+
+def batch_delete(model, raw_pks):
+    """Delete every listed row; returns ({table: deleted count}, per-pk results)."""
+    pks, invalid = _coerce_pks(model, raw_pks)
+
+    with transaction.atomic():
+        found = set(
+            model.objects.select_for_update().filter(pk__in=pks).values_list("pk", flat=True)
+        ) if pks else set()
+        cohorts = progress.cohorts_of(model, found)
+        _, per_model = model.objects.filter(pk__in=found).delete() if found else (0, {})
+        progress.refresh_cohorts(cohorts)
+
+    student_auth.revoke_for_rows(model, found)
+
+    # Cascades touch other tables too (responses, logs, rollups)
+    deleted = {}
+    for label, count in per_model.items():
+        if not count:
+            continue
+        related = apps.get_model(label)
+        deleted[related._meta.db_table] = count
+        feedback_cache.invalidate_for_model(related)
+    return deleted, _results(pks, found, invalid, "deleted")
@@ -0,0 +1,176 @@
+"""
+Admin schema registry.
+
+Built once in ``FeedbackAppConfig.ready()``: table name -> TableSchema with the
+field list, the field metadata the admin UI renders forms from, and a
+precompiled serializer for ``values_list`` rows. The admin views look tables
+up here instead of scanning ``get_models()`` and rebuilding ``field_meta`` on
+every request.
+"""
+import hashlib
+import json
+from types import MappingProxyType
+from typing import Callable, NamedTuple
+
+from django.apps import apps
+from django.db import models
+
+# Tables the admin API never writes to
+READ_ONLY_TABLES = frozenset({
+    'feedback_response', 'feedback_submissionlog', 'feedback_ratingrollup', 'feedback_cohortprogress',
+    'feedback_tokenrevocation', 'feedback_allocationprogress', 'feedback_tableversion',
+})
+
+AUTO_FIELD_TYPES = (models.AutoField, models.BigAutoField, models.SmallAutoField)
+
+
+def _field_meta(f):
+    """Form metadata for one field, as rendered by the admin dashboard."""
+    internal_type = f.get_internal_type()
+
+    meta = {
+        'type': 'text',
+        'required': not f.blank and not f.null,
+        'choices': [],
+        'is_auto': False
+    }
+
+    if internal_type == 'BooleanField':
+        meta['type'] = 'boolean'
+    elif internal_type in ['DateField', 'DateTimeField']:
+        meta['type'] = 'date'
+    elif internal_type in ['IntegerField', 'BigIntegerField', 'PositiveSmallIntegerField']:
+        meta['type'] = 'number'
+        if isinstance(f, AUTO_FIELD_TYPES):
+            meta['is_auto'] = True
+    elif internal_type in ['FloatField', 'DecimalField']:
+        meta['type'] = 'float'
+
+    # Extract choices if available
+    if f.choices:
+        meta['type'] = 'select'  # Override type to select if choices exist
+        meta['choices'] = [{'value': c[0], 'label': str(c[1])} for c in f.choices]
+
+    return meta
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def converter_for(field):
+    """Function turning a raw column value into its JSON form (None when no conversion is needed)."""
+    if isinstance(field, (models.DateField, models.DateTimeField, models.TimeField)):
+        return _isoformat
+    return None
+
+
+def _compile_serializer(names, converters):
+    """
+    Serializer for ``values_list(*attnames)`` rows (FKs arrive as their ``*_id``
+    value). Each row becomes one ``dict(zip())``; only columns with a converter
+    are touched individually.
+    """
+    converted = tuple((i, convert) for i, convert in enumerate(converters) if convert)
+
+    if not converted:
+        def serialize_rows(rows):
+            return [dict(zip(names, row)) for row in rows]
+        return serialize_rows
+
+    def serialize_rows(rows):
+        data = []
+        for row in rows:
+            row = list(row)
+            for i, convert in converted:
+                row[i] = convert(row[i])
+            data.append(dict(zip(names, row)))
+        return data
+
+    return serialize_rows
+
+
+class TableSchema(NamedTuple):
+    """Immutable description of one admin-visible table."""
+    model: type
+    model_name: str
+    table_name: str
+    pk_field: str
+    fields: tuple
+    attnames: tuple
+    field_meta: MappingProxyType
+    converters: tuple
+    read_only: bool
+    serialize_rows: Callable
+
+    def as_dict(self):
+        return {
+            "model_name": self.model_name,
+            "table_name": self.table_name,
+            "pk_field": self.pk_field,
+            "fields": list(self.fields),
+            "field_meta": dict(self.field_meta),
+            "read_only": self.read_only,
+        }
+
+
+def build_table_schema(model):
+    columns = [
+        f for f in model._meta.get_fields()
+        # Reverse relations (e.g. the rating rollup) are not columns of this table
+        if not (f.many_to_many or f.one_to_many or (f.one_to_one and not f.concrete))
+    ]
+    fields = tuple(f.name for f in columns)
+    attnames = tuple(f.attname for f in columns)
+    converters = tuple(converter_for(f) for f in columns)
+
+    return TableSchema(
+        model=model,
+        model_name=model.__name__,
+        table_name=model._meta.db_table,
+        pk_field=model._meta.pk.name,
+        fields=fields,
+        attnames=attnames,
+        field_meta=MappingProxyType({f.name: _field_meta(f) for f in columns}),
+        converters=converters,
+        read_only=model._meta.db_table.lower() in READ_ONLY_TABLES,
+        serialize_rows=_compile_serializer(fields, converters),
+    )
+
+
+_registry = MappingProxyType({})
+_tables = ()
+_etag = None
+
+
+def load():
+    """Build the registry from the app's models (called from AppConfig.ready)."""
+    global _registry, _tables, _etag
+
+    schemas = [build_table_schema(m) for m in apps.get_app_config('feedback_app').get_models()]
+    registry = {}
+    for schema in schemas:
+        registry[schema.table_name] = schema
+        registry.setdefault(schema.model_name, schema)
+
+    _tables = tuple(sorted(schemas, key=lambda s: s.model_name))
+    _registry = MappingProxyType(registry)
+    payload = json.dumps([s.as_dict() for s in _tables], sort_keys=True, default=str)
+    _etag = hashlib.sha1(payload.encode()).hexdigest()
+
+
+def get_schema(table_name):
+    """TableSchema for a db_table or model name, or None."""
+    return _registry.get(table_name)
+
+
+def all_tables():
+    return _tables
+
+
+def is_read_only(table_name):
+    return table_name.lower() in READ_ONLY_TABLES
+
+
+def etag():
+    return _etag
@@ -0,0 +1,250 @@
+"""
+Vectorized rating analytics.
+
+Feedback_Response is streamed once through ``values_list`` into an N x 10
+``uint8`` matrix plus an allocation-index vector; every statistic is then a
+NumPy group-by (``bincount`` / ``lexsort``) over those arrays instead of a loop
+over model instances. NumPy is optional: ``is_available()`` reports whether
+the module can be used. It is imported on first use rather than with the
+views, since it makes up a large share of a worker's import time.
+"""
+from itertools import chain, islice
+
+from feedback_app.models.academic_allocation import Academic_Allocation
+from feedback_app.models.feedback_response import Feedback_Response
+
+np = None
+
+RATING_COLUMNS = tuple(f"Q{i}_Rating" for i in range(1, 11))
+PERCENTILES = (25, 50, 75)
+CHUNK_SIZE = 10000
+
+# group_by name -> allocation column identifying the group
+GROUP_COLUMNS = {
+    "teacher": "TeacherID",
+    "subject": "SubjectCode",
+    "allocation": "AllocationID",
+}
+
+
+def _load_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - optional dependency
+            return None
+        np = numpy
+    return np
+
+
+def is_available():
+    return _load_numpy() is not None
+
+
+class RatingMatrix:
+    """Ratings as ``ratings`` (N x 10 uint8) and ``alloc_index`` (N, into ``allocations``)."""
+
+    def __init__(self, ratings, alloc_index, allocations):
+        self.ratings = ratings
+        self.alloc_index = alloc_index
+        self.allocations = allocations  # list of per-allocation value dicts
+
+    def __len__(self):
+        return len(self.ratings)
+
+
+def load_matrix(branch=None, semester=None):
+    """Stream responses (and the allocation table) into a RatingMatrix."""
+    if _load_numpy() is None:
+        raise ImportError("numpy is required for analytics")
+    allocations = Academic_Allocation.objects.order_by("AllocationID")
+    responses = Feedback_Response.objects.order_by()
+    if branch:
+        allocations = allocations.filter(TargetBranch__iexact=branch)
+        responses = responses.filter(AllocationID__TargetBranch__iexact=branch)
+    if semester:
+        allocations = allocations.filter(Target_Semester=semester)
+        responses = responses.filter(AllocationID__Target_Semester=semester)
+
+    allocations = list(allocations.values(
+        "AllocationID", "TeacherID", "TeacherID__FullName", "SubjectCode",
+        "SubjectCode__SubjectName", "TargetBranch",
+    ))
+    allocation_ids = np.fromiter((a["AllocationID"] for a in allocations), dtype=np.int64, count=len(allocations))
+
+    # Filled chunk by chunk; only one chunk of allocation ids is ever held as int64
+    ratings = np.empty((CHUNK_SIZE, len(RATING_COLUMNS)), dtype=np.uint8)
+    alloc_index = np.empty(CHUNK_SIZE, dtype=np.int32)
+    n = 0
+
+    rows = responses.values_list("AllocationID", *RATING_COLUMNS).iterator(chunk_size=CHUNK_SIZE)
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            break
+        end = n + len(chunk)
+        if end > len(ratings):
+            ratings = _grow(ratings, n, max(end, 2 * len(ratings)))
+            alloc_index = _grow(alloc_index, n, len(ratings))
+
+        ratings[n:end] = np.fromiter(
+            chain.from_iterable(row[1:] for row in chunk), dtype=np.uint8, count=len(chunk) * len(RATING_COLUMNS)
+        ).reshape(len(chunk), len(RATING_COLUMNS))
+        # allocation_ids is sorted, so the dense index is a binary search
+        alloc_index[n:end] = np.searchsorted(
+            allocation_ids, np.fromiter((row[0] for row in chunk), dtype=np.int64, count=len(chunk))
+        )
+        n = end
+
+    if n < len(ratings):
+        ratings, alloc_index = ratings[:n].copy(), alloc_index[:n].copy()
+    return RatingMatrix(ratings, alloc_index, allocations)
+
+
+def _grow(array, used, capacity):
+    """A larger array holding the first ``used`` rows of ``array``."""
+    grown = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[:used] = array[:used]
+    return grown
+
+
+def _encode(values):
+    """Dense integer codes for a list of hashable values."""
+    codes = {}
+    out = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        out[i] = codes.setdefault(value, len(codes))
+    return out, list(codes)
+
+
+def _grouped_stats(codes, ratings, n_groups):
+    """
+    Counts, per-question means/stddevs and 1-5 histograms per group code.
+
+    The histograms are counted one question column at a time and the sums are
+    taken from them, so the uint8 matrix is never widened as a whole.
+    """
+    counts = np.bincount(codes, minlength=n_groups)
+    safe = np.maximum(counts, 1)[:, None]
+
+    histograms = np.empty((n_groups, 10, 5), dtype=np.int64)
+    offsets = codes.astype(np.int32) * 5
+    for q in range(10):
+        # Ratings are 1-5, so (group, rating - 1) packs into one small index
+        histograms[:, q] = np.bincount(offsets + (ratings[:, q] - 1), minlength=n_groups * 5).reshape(n_groups, 5)
+
+    levels = np.arange(1, 6)
+    sums = histograms @ levels
+    sums_sq = histograms @ (levels ** 2)
+    means = sums / safe
+    stddevs = np.sqrt(np.maximum(sums_sq / safe - means ** 2, 0.0))
+
+    return counts, means, stddevs, histograms
+
+
+def _grouped_percentiles(codes, scores, counts):
+    """Nearest-rank percentiles of ``scores`` within each group (NaN for empty groups)."""
+    order = np.lexsort((scores, codes))
+    sorted_scores = scores[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    last = np.maximum(counts - 1, 0)
+    result = {}
+    for p in PERCENTILES:
+        positions = np.minimum(starts + np.floor(last * p / 100).astype(np.int64), len(sorted_scores) - 1)
+        result[f"p{p}"] = np.where(counts > 0, sorted_scores[positions], np.nan)
+    return result
+
+
+def _round(value, digits=3):
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def question_summary(matrix):
+    """Dataset-wide mean, stddev and 1-5 histogram for every question."""
+    codes = np.zeros(len(matrix), dtype=np.int32)
+    counts, means, stddevs, histograms = _grouped_stats(codes, matrix.ratings, 1)
+    if not counts[0]:
+        return {}
+    return {
+        f"q{q + 1}": {
+            "mean": _round(means[0, q]),
+            "stddev": _round(stddevs[0, q]),
+            "histogram": histograms[0, q].tolist(),
+        }
+        for q in range(10)
+    }
+
+
+def group_report(matrix, group_by):
+    """
+    Per-group statistics, each group compared with its department (branch):
+    z-score and percentile rank of the group's mean among department peers.
+    """
+    column = GROUP_COLUMNS[group_by]
+    allocations = matrix.allocations
+    if not allocations or not len(matrix):
+        return []
+
+    # Group = (entity, department); computed per allocation then broadcast to rows
+    alloc_groups, group_keys = _encode([
+        (a[column], a["TargetBranch"].strip().upper()) for a in allocations
+    ])
+    codes = alloc_groups[matrix.alloc_index]
+    n_groups = len(group_keys)
+
+    counts, means, stddevs, histograms = _grouped_stats(codes, matrix.ratings, n_groups)
+    scores = matrix.ratings.sum(axis=1, dtype=np.uint16) / len(RATING_COLUMNS)
+    overall = np.bincount(codes, weights=scores, minlength=n_groups) / np.maximum(counts, 1)
+    percentiles = _grouped_percentiles(codes, scores, counts)
+
+    # Department peers: groups with responses sharing the same branch
+    dept_codes, departments = _encode([key[1] for key in group_keys])
+    has_data = counts > 0
+    dept_n = np.bincount(dept_codes, weights=has_data, minlength=len(departments))
+    dept_mean = np.bincount(dept_codes, weights=np.where(has_data, overall, 0), minlength=len(departments)) / np.maximum(dept_n, 1)
+    dept_sq = np.bincount(dept_codes, weights=np.where(has_data, overall ** 2, 0), minlength=len(departments)) / np.maximum(dept_n, 1)
+    dept_std = np.sqrt(np.maximum(dept_sq - dept_mean ** 2, 0.0))
+    peer_std = dept_std[dept_codes]
+    z_scores = np.where(peer_std > 0, (overall - dept_mean[dept_codes]) / np.where(peer_std > 0, peer_std, 1), 0.0)
+
+    # Percentile rank of each group's mean inside its department
+    rank_order = np.lexsort((np.where(has_data, overall, -np.inf), dept_codes))
+    ranks = np.empty(n_groups, dtype=np.int64)
+    dept_sizes = np.bincount(dept_codes, minlength=len(departments))
+    dept_starts = np.concatenate(([0], np.cumsum(dept_sizes)[:-1]))
+    ranks[rank_order] = np.arange(n_groups) - dept_starts[dept_codes[rank_order]]
+    # Groups without responses sort first; discount them from the rank
+    empty_in_dept = np.bincount(dept_codes, weights=~has_data, minlength=len(departments))
+    ranks = ranks - empty_in_dept[dept_codes]
+    percentile_rank = np.where(dept_n[dept_codes] > 1, ranks / np.maximum(dept_n[dept_codes] - 1, 1) * 100, 100.0)
+
+    labels = {}
+    label_column = {"teacher": "TeacherID__FullName", "subject": "SubjectCode__SubjectName"}.get(group_by)
+    for a in allocations:
+        labels.setdefault(a[column], a[label_column] if label_column else a[column])
+
+    results = []
+    for g in np.flatnonzero(has_data):
+        entity, department = group_keys[g]
+        results.append({
+            "key": entity,
+            "label": labels.get(entity, entity),
+            "department": department,
+            "responses": int(counts[g]),
+            "mean": _round(overall[g]),
+            "z_score": _round(z_scores[g]),
+            "percentile_rank": _round(percentile_rank[g], 1),
+            "percentiles": {name: _round(values[g]) for name, values in percentiles.items()},
+            "questions": {
+                f"q{q + 1}": {
+                    "mean": _round(means[g, q]),
+                    "stddev": _round(stddevs[g, q]),
+                    "histogram": histograms[g, q].tolist(),
+                }
+                for q in range(10)
+            },
+        })
+
+    return sorted(results, key=lambda r: (r["department"], str(r["key"])))
@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class FeedbackAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'feedback_app'
+
+    def ready(self):
+        from feedback_app import admin_schema, instrumentation, student_auth
+        student_auth.check_revocation_store()
+        admin_schema.load()
+        instrumentation.install()
+
+
+def server_started():
+    """Called by wsgi.py / asgi.py once the application is loaded; not run for other management commands."""
+    from django.db import connections
+    from feedback_app import student_lookup, write_behind
+    from feedback_app.db import pool
+    pool.startup_report(connections)
+    write_behind.start_on_server_start()
+    student_lookup.warm()
@@ -0,0 +1,336 @@
+"""
+Benchmark harness for the feedback-window traffic pattern.
+
+``seed`` fills a local stand-in database (see feedbacksystem/settings_bench.py)
+with a configurable college: branches x years x sections of students, subjects
+per branch/semester, and one teacher allocation per subject and section.
+
+``replay`` drives the real views through Django's test client the way the
+frontend does - login -> my_teachers -> submit_feedback for each subject ->
+my_feedbacks, plus admin table browsing - and records latency and SQL query
+count per endpoint. Results are plain JSON so they can be saved as baselines
+and compared with ``compare``.
+
+Latencies depend on the machine, so every run also times a fixed, CPU-only
+calibration workload (before and after the replay, keeping the fastest round)
+and ``compare`` checks p95 latencies in units of it. Query counts are
+deterministic: ``compare`` fails on any growth. Latency drift is reported as a
+warning unless the caller asks for it to be gated too.
+"""
+import datetime
+import json
+import os
+import platform
+import random
+import time
+
+import django
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from feedback_app import cache as feedback_cache
+from feedback_app import progress, rollup
+from feedback_app.loadtest import summarize
+from feedback_app.models import (
+    Academic_Allocation, Academic_Subject, Faculty_Teacher, Feedback_CohortProgress,
+    Feedback_RatingRollup, Feedback_Response, Feedback_SubmissionLog, Users_Student,
+)
+
+DEFAULT_SCALE = {
+    "branches": 2,
+    "years": 2,
+    "sections": 3,
+    "students_per_section": 60,
+    "subjects": 6,
+    "teachers": 30,
+    "seed": 42,
+}
+
+# Allowed p95 slowdown before a latency is reported; query counts must not grow at all
+DEFAULT_TOLERANCE = 0.5
+
+# Endpoints with fewer requests than this in either run have their latency reported, not gated
+MIN_LATENCY_SAMPLES = 50
+
+# Rounds of the calibration workload; the fastest is kept, as other processes only ever add time
+CALIBRATION_ROUNDS = 31
+
+BRANCH_NAMES = ("CSE", "IT", "ECE", "ME", "CE", "EE", "AIML", "DS")
+
+
+# -------------------------------------
+# Dataset
+# -------------------------------------
+def prepare_database():
+    """Create the tables (managed and unmanaged) in the stand-in database."""
+    if connection.vendor != "sqlite":
+        raise RuntimeError(
+            "the benchmark seeds and wipes its database; run it with --settings=feedbacksystem.settings_bench"
+        )
+    call_command("migrate", verbosity=0)
+    existing = set(connection.introspection.table_names())
+    with connection.schema_editor() as editor:
+        for model in apps.get_app_config("feedback_app").get_models():
+            if not model._meta.managed and model._meta.db_table not in existing:
+                editor.create_model(model)
+
+
+def seed(branches, years, sections, students_per_section, subjects, teachers, seed=42):
+    """Replace the stand-in database's contents with a generated college. Returns row counts."""
+    rng = random.Random(seed)
+    branch_names = BRANCH_NAMES[:branches]
+
+    teacher_rows = [
+        Faculty_Teacher(TeacherID=f"T{i:04d}", FullName=f"Teacher {i}", Designation=rng.choice(["Prof", "Asst Prof", None]))
+        for i in range(1, teachers + 1)
+    ]
+
+    subject_rows, allocation_rows, student_rows = [], [], []
+    for branch in branch_names:
+        for year in range(1, years + 1):
+            semester = 2 * year - 1
+            codes = [f"{branch}{semester}{j:02d}" for j in range(1, subjects + 1)]
+            subject_rows += [
+                Academic_Subject(SubjectCode=code, SubjectName=f"{branch} subject {semester}.{j}", Semester=semester, Branch=branch)
+                for j, code in enumerate(codes, start=1)
+            ]
+            for section in range(1, sections + 1):
+                for code in codes:
+                    allocation_rows.append(Academic_Allocation(
+                        TeacherID_id=rng.choice(teacher_rows).TeacherID,
+                        SubjectCode_id=code,
+                        TargetBranch=branch,
+                        Target_Year=year,
+                        Target_Semester=semester,
+                        Target_Section=section,
+                    ))
+                for n in range(1, students_per_section + 1):
+                    enrollment = f"{branch}{year}{section}{n:04d}"
+                    student_rows.append(Users_Student(
+                        EnrollmentNo=enrollment,
+                        FullName=f"Student {enrollment}",
+                        Gender=rng.choice("MFO"),
+                        Email=f"{enrollment.lower()}@acropolis.in",
+                        Branch=branch,
+                        Year=year,
+                        Semester=semester,
+                        Section=section,
+                        IsActive=rng.random() > 0.02,
+                        DateOfBirth=datetime.date(2002, 1, 1) + datetime.timedelta(days=rng.randrange(4 * 365)),
+                    ))
+
+    with transaction.atomic():
+        for model in (Feedback_CohortProgress, Feedback_RatingRollup, Feedback_SubmissionLog,
+                      Feedback_Response, Academic_Allocation, Users_Student, Academic_Subject, Faculty_Teacher):
+            model.objects.all().delete()
+        Faculty_Teacher.objects.bulk_create(teacher_rows, batch_size=500)
+        Academic_Subject.objects.bulk_create(subject_rows, batch_size=500)
+        Academic_Allocation.objects.bulk_create(allocation_rows, batch_size=500)
+        Users_Student.objects.bulk_create(student_rows, batch_size=500)
+
+    rollup.rebuild()
+    progress.rebuild()
+    for model in (Faculty_Teacher, Academic_Subject, Academic_Allocation, Users_Student):
+        feedback_cache.invalidate_for_model(model)
+
+    return {
+        "teachers": len(teacher_rows),
+        "subjects": len(subject_rows),
+        "allocations": len(allocation_rows),
+        "students": len(student_rows),
+    }
+
+
+# -------------------------------------
+# Replay
+# -------------------------------------
+class Recorder:
+    """Latency and query count per endpoint name."""
+
+    def __init__(self):
+        self.samples = {}
+        self.failures = {}
+        self.started = time.perf_counter()
+
+    def call(self, name, send, expect=(200,)):
+        with CaptureQueriesContext(connection) as queries:
+            t0 = time.perf_counter()
+            response = send()
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed = (time.perf_counter() - t0) * 1000
+        self.samples.setdefault(name, []).append((elapsed, len(queries.captured_queries)))
+        if response.status_code not in expect:
+            self.failures[name] = self.failures.get(name, 0) + 1
+        return response
+
+    def results(self):
+        wall = time.perf_counter() - self.started
+        endpoints = {}
+        for name, samples in sorted(self.samples.items()):
+            latencies = [ms for ms, _ in samples]
+            counts = [n for _, n in samples]
+            endpoints[name] = {
+                **summarize(latencies),
+                "throughput_rps": round(len(samples) / (sum(latencies) / 1000), 1) if sum(latencies) else None,
+                "queries_mean": round(sum(counts) / len(counts), 2),
+                "queries_max": max(counts),
+                "failures": self.failures.get(name, 0),
+            }
+        total = sum(len(s) for s in self.samples.values())
+        return {"wall_seconds": round(wall, 2), "requests": total,
+                "throughput_rps": round(total / wall, 1) if wall else None, "endpoints": endpoints}
+
+
+def _post_json(client, path, data):
+    return lambda: client.post(path, json.dumps(data), content_type="application/json")
+
+
+def replay_student(recorder, student, submissions):
+    """One student's visit: login, list teachers, submit up to ``submissions`` feedbacks, review them."""
+    client = Client()
+    recorder.call("login", _post_json(client, "/login/", {
+        "email": student["Email"], "dob": student["DateOfBirth"].isoformat(),
+    }))
+
+    response = recorder.call("my_teachers", lambda: client.get("/my-teachers/"))
+    pending = [
+        (subject["subject_code"], teacher["allocation_id"])
+        for subject in response.json().get("subjects", [])
+        for teacher in subject["teachers"]
+        if not teacher["is_submitted"]
+    ]
+
+    for subject_code, allocation_id in pending[:submissions]:
+        ratings = {f"q{i}": random.randint(1, 5) for i in range(1, 11)}
+        recorder.call("submit_feedback", _post_json(client, "/submit-feedback/", {
+            "allocation_id": allocation_id, "subject_code": subject_code, **ratings,
+        }), expect=(200, 202))
+
+    recorder.call("my_feedbacks", lambda: client.get("/my-feedbacks/"))
+
+
+def replay_admin(recorder, pages):
+    """Admin dashboard browsing: table list, paging through tables, searching and sorting."""
+    client = Client()
+    recorder.call("admin_login", _post_json(client, "/dashboard-admin/login/", {
+        "username": os.getenv("ADMIN_USERNAME"), "password": os.getenv("ADMIN_PASSWORD"),
+    }))
+    recorder.call("admin_tables", lambda: client.get("/dashboard-admin/tables/"))
+
+    for table in ("Users_Student", "Academic_Allocation", "Feedback_Response", "Feedback_SubmissionLog"):
+        recorder.call("admin_table_page", lambda: client.get(f"/dashboard-admin/table/{table}/?page=1&page_size=50"))
+        cursor = None
+        for _ in range(pages):
+            suffix = f"&cursor={cursor}" if cursor else ""
+            response = recorder.call(
+                "admin_table_cursor",
+                lambda: client.get(f"/dashboard-admin/table/{table}/?pagination=cursor&page_size=50{suffix}"),
+            )
+            cursor = response.json().get("next_cursor")
+            if not cursor:
+                break
+
+    recorder.call("admin_table_search", lambda: client.get("/dashboard-admin/table/Users_Student/?search=Student%20CSE1"))
+    recorder.call("admin_table_search", lambda: client.get("/dashboard-admin/table/Users_Student/?search=Branch:IT"))
+    recorder.call("admin_table_sort", lambda: client.get("/dashboard-admin/table/Users_Student/?sort_by=FullName&order=desc"))
+    recorder.call("admin_progress", lambda: client.get("/dashboard-admin/reports/progress/"))
+    recorder.call("admin_rating_report", lambda: client.get("/dashboard-admin/reports/ratings/?group_by=teacher"))
+
+
+def replay(students=100, submissions=6, admin_sessions=5, admin_pages=5, seed=42):
+    """Run the workload against the seeded data and return the results document."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    pool = list(
+        Users_Student.objects.filter(IsActive=True).order_by("EnrollmentNo")
+        .values("Email", "DateOfBirth")
+    )
+    sample = rng.sample(pool, min(students, len(pool)))
+
+    recorder = Recorder()
+    admin_every = max(1, len(sample) // max(admin_sessions, 1)) if admin_sessions else None
+    for i, student in enumerate(sample, start=1):
+        replay_student(recorder, student, submissions)
+        if admin_every and i % admin_every == 0:
+            replay_admin(recorder, admin_pages)
+    return recorder.results()
+
+
+def _calibration_workload():
+    rows = [{"id": i, "name": f"row {i}", "ratings": [(i * q) % 5 + 1 for q in range(10)]} for i in range(2000)]
+    rows.sort(key=lambda row: (row["ratings"][0], row["name"]))
+    json.dumps(rows)
+    return sum(sum(row["ratings"]) for row in rows)
+
+
+def calibrate(rounds=CALIBRATION_ROUNDS):
+    """
+    Milliseconds of the fastest round of a fixed CPU-only workload (building,
+    sorting and encoding rows). It touches no database or disk, so it measures
+    the interpreter and the CPU only.
+    """
+    _calibration_workload()  # warm-up
+    timings = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        _calibration_workload()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return round(min(timings), 3)
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "machine": platform.machine(),
+        "calibration_ms": calibrate(),
+    }
+
+
+def run(workload):
+    """(environment, replay results); calibrated on both sides of the replay, keeping the faster."""
+    env = environment()
+    results = replay(**workload)
+    env["calibration_ms"] = min(env["calibration_ms"], calibrate())
+    return env, results
+
+
+# -------------------------------------
+# Baselines
+# -------------------------------------
+def compare(baseline, current, tolerance=DEFAULT_TOLERANCE, min_samples=MIN_LATENCY_SAMPLES, strict_latency=False):
+    """
+    (regressions, warnings) of ``current`` against ``baseline``. Any growth in
+    an endpoint's max query count is a regression. A p95 latency more than
+    ``tolerance`` slower, once each run is divided by its own calibration
+    time, is a warning (a regression with ``strict_latency``).
+
+    Latency is only compared for endpoints with at least ``min_samples``
+    requests in both runs, and only when both runs carry a calibration.
+    """
+    regressions, warnings = [], []
+    before_unit = baseline.get("environment", {}).get("calibration_ms")
+    after_unit = current.get("environment", {}).get("calibration_ms")
+    for name, before in baseline["results"]["endpoints"].items():
+        after = current["results"]["endpoints"].get(name)
+        if after is None:
+            continue
+        if after["queries_max"] > before["queries_max"]:
+            regressions.append(f"{name}: queries_max {before['queries_max']} -> {after['queries_max']}")
+        if not (before_unit and after_unit and before.get("p95_ms") and after.get("p95_ms")):
+            continue
+        if min(before["requests"], after["requests"]) < min_samples:
+            continue
+        before_p95 = before["p95_ms"] / before_unit
+        after_p95 = after["p95_ms"] / after_unit
+        if after_p95 > before_p95 * (1 + tolerance):
+            (regressions if strict_latency else warnings).append(
+                f"{name}: p95 {before_p95:.1f} -> {after_p95:.1f} calibration units "
+                f"({before['p95_ms']}ms -> {after['p95_ms']}ms)"
+            )
+    return regressions, warnings
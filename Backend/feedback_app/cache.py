@@ -0,0 +1,191 @@
+"""
+Shared caches for the read-heavy student endpoints.
+
+Entries live in the ``feedback`` cache alias (see ``CACHES`` in settings), which
+provides TTL expiry and LRU culling. Invalidation is done by rotating a version
+token that is part of every key, so stale entries simply stop being addressed.
+
+Version tokens live in this process's cache. Data that must agree across
+workers (the allocation tree, ETags) is keyed on the tables' write counters
+in ``Feedback_TableVersion`` instead, which ``invalidate_for_model()``
+advances in the database.
+"""
+import uuid
+from urllib.parse import quote
+
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from feedback_app.models.academic_allocation import Academic_Allocation
+from feedback_app.models.academic_subject import Academic_Subject
+from feedback_app.models.faculty_teacher import Faculty_Teacher
+from feedback_app.models.feedback_tableversion import Feedback_TableVersion
+
+CACHE_ALIAS = "feedback"
+
+ALLOCATION_TREE = "allocation-tree"
+
+# Tables whose rows end up in the cached subject/teacher tree
+ALLOCATION_TREE_MODELS = (Academic_Allocation, Academic_Subject, Faculty_Teacher)
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_version(namespace):
+    """Return the current version token for a cache namespace."""
+    cache = _cache()
+    key = f"version:{namespace}"
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate every entry of a namespace by rotating its version token."""
+    _cache().set(f"version:{namespace}", uuid.uuid4().hex, timeout=None)
+
+
+def table_namespace(model):
+    """Version namespace that changes whenever rows of the model's table are written."""
+    return f"table:{model._meta.db_table}"
+
+
+def touch_tables(*models):
+    """Rotate the models' table versions once the current transaction commits (now, outside one)."""
+    def bump():
+        for model in models:
+            bump_version(table_namespace(model))
+    transaction.on_commit(bump)
+
+
+def bump_table_versions(*models):
+    """Advance the models' shared write counters (as part of the current transaction, if any)."""
+    tables = sorted({model._meta.db_table for model in models})
+    counters = Feedback_TableVersion.objects.filter(pk__in=tables)
+    if counters.update(Version=F("Version") + 1) == len(tables):
+        return
+    existing = set(counters.values_list("pk", flat=True))
+    for table in tables:
+        if table in existing:
+            continue
+        try:
+            with transaction.atomic():
+                Feedback_TableVersion.objects.create(TableName=table, Version=1)
+        except IntegrityError:
+            # Another writer created the row first
+            Feedback_TableVersion.objects.filter(pk=table).update(Version=F("Version") + 1)
+
+
+def _versions_stamp(models, rows):
+    versions = dict(rows)
+    return ".".join(str(versions.get(model._meta.db_table, 0)) for model in models)
+
+
+def _versions_query(models):
+    return Feedback_TableVersion.objects.filter(
+        pk__in=[model._meta.db_table for model in models]
+    ).values_list("TableName", "Version")
+
+
+def table_versions(*models):
+    """Validator of the models' shared write counters, e.g. ``"3.0.12"``; one query."""
+    return _versions_stamp(models, _versions_query(models))
+
+
+async def atable_versions(*models):
+    return _versions_stamp(models, [row async for row in _versions_query(models)])
+
+
+def tree_version():
+    """Shared version of the subject/teacher tree (allocations, subjects, teachers)."""
+    return table_versions(*ALLOCATION_TREE_MODELS)
+
+
+async def atree_version():
+    return await atable_versions(*ALLOCATION_TREE_MODELS)
+
+
+def invalidate_for_model(model):
+    """Drop cached data derived from the given model's table."""
+    bump_table_versions(model)
+    bump_version(table_namespace(model))
+    bump_version("table-counts")
+
+
+def cohort_key(branch, year, semester, section):
+    """Normalized (Branch, Year, Semester, Section) tuple; branch matching is case-insensitive."""
+    return (branch.strip().lower(), int(year), int(semester), int(section))
+
+
+def build_allocation_tree(branch, year, semester, section):
+    """
+    Build the subject -> teachers tree for one cohort.
+    The result holds no per-student state so it can be shared by the whole section.
+    """
+    qs = Academic_Allocation.objects.select_related("TeacherID", "SubjectCode") \
+        .filter(
+            TargetBranch__iexact=branch,
+            Target_Year=year,
+            Target_Section=section,
+            Target_Semester=semester,
+            SubjectCode__Semester=semester,          # subject's Semester matches student
+            SubjectCode__Branch__iexact=branch       # subject's Branch matches student
+        ) \
+        .order_by("SubjectCode__SubjectCode")
+
+    subjects_map = {}
+
+    for alloc in qs:
+        subj = alloc.SubjectCode
+        teacher = alloc.TeacherID
+
+        if not subj or not teacher:
+            continue
+
+        key = subj.SubjectCode
+
+        if key not in subjects_map:
+            subjects_map[key] = {
+                "subject_code": subj.SubjectCode,
+                "subject_name": subj.SubjectName,
+                "semester": subj.Semester,
+                "branch": subj.Branch,
+                "teachers": []
+            }
+
+        subjects_map[key]["teachers"].append({
+            "allocation_id": alloc.AllocationID,
+            "teacher_id": teacher.TeacherID,
+            "teacher_name": teacher.FullName,
+            "designation": teacher.Designation,
+        })
+
+    return list(subjects_map.values())
+
+
+def get_allocation_tree(branch, year, semester, section, version=None):
+    """
+    Return the cohort's subject/teacher tree, building it on a cache miss.
+    ``version`` is the ``tree_version()`` the caller already read, if any.
+    """
+    if version is None:
+        version = tree_version()
+    cohort = cohort_key(branch, year, semester, section)
+    key = "{}:{}:{}".format(
+        ALLOCATION_TREE,
+        version,
+        ":".join(quote(str(part), safe="") for part in cohort),
+    )
+
+    cache = _cache()
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_allocation_tree(branch, year, semester, section)
+        cache.set(key, tree)
+    return tree
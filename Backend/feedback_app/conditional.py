@@ -0,0 +1,85 @@
+"""
+HTTP conditional GET for the read endpoints.
+
+When a request carries If-None-Match / If-Modified-Since, a view computes
+cheap validators first (the tables' shared write counters, one aggregate over
+the student's submission log) and returns ``not_modified()`` if they still match. It only
+runs its queries and serializes the body otherwise, then stamps the response
+with ``set_validators()``. The student endpoints skip the validator query on
+unconditional requests and derive the same values from the rows they read;
+admin table pages read their counter row either way, as it is the ETag.
+
+Validators are read from the database, never from per-process state, so a
+write handled by one worker changes the ETags every worker computes.
+
+Responses are per user, so they are marked ``private, no-cache``: browsers
+keep them but revalidate before every use.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+from feedback_app import cache as feedback_cache
+from feedback_app.models.feedback_submissionlog import Feedback_SubmissionLog
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts):
+    """Quoted ETag for a tuple of validator parts."""
+    return quote_etag(hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest())
+
+
+def _epoch(value):
+    if value is None:
+        return None
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return int(value.timestamp())
+
+
+def is_conditional(request):
+    """Whether the request carries validators worth checking before doing the work."""
+    return "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
+
+
+def not_modified(request, etag, last_modified=None):
+    """A 304 (or 412) response when the request's preconditions say so, else None."""
+    response = get_conditional_response(request, etag=etag, last_modified=_epoch(last_modified))
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(_epoch(last_modified))
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+# -------------------------------------
+# Per-student submission log stamp
+# -------------------------------------
+_LOG_STAMP = {"last_id": Max("LogID"), "count": Count("LogID"), "last_at": Max("Timestamp")}
+
+
+async def alog_stamp(enrollment_no):
+    """{last_id, count, last_at} of the student's submissions, from one aggregate query."""
+    return await Feedback_SubmissionLog.objects.filter(EnrollmentNo_id=enrollment_no).order_by() \
+        .aaggregate(**_LOG_STAMP)
+
+
+# -------------------------------------
+# Whole-table stamp
+# -------------------------------------
+def table_stamp(model):
+    """
+    Validator of a table's rows: its shared write counter, advanced by admin
+    writes, imports, rebuilds and the submit path. One primary-key lookup.
+    """
+    return feedback_cache.table_versions(model)
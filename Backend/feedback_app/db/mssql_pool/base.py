@@ -0,0 +1,16 @@
+"""
+SQL Server backend with a bounded connection pool.
+
+    DATABASES = {"default": {"ENGINE": "feedback_app.db.mssql_pool", "CONN_MAX_AGE": 0,
+                             "POOL": {"MAX_SIZE": 20, "TIMEOUT": 10}, ...}}
+
+Everything except opening/closing connections is the stock ``mssql`` backend.
+"""
+from mssql.base import *  # noqa: F401,F403
+from mssql.base import DatabaseWrapper as MssqlDatabaseWrapper
+
+from feedback_app.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, MssqlDatabaseWrapper):
+    pass
@@ -0,0 +1,278 @@
+"""
+Process-wide pool of raw DB-API connections.
+
+Django opens one connection per thread and request; against SQL Server every
+open is a TCP connect plus a TDS login. The pooled backend
+(``feedback_app.db.mssql_pool``) hands Django connections from this pool
+instead and returns them when Django "closes" them at the end of a request.
+
+* bounded: at most MAX_SIZE connections exist; further requests wait up to
+  TIMEOUT seconds and then fail with PoolTimeout
+* health checks: a connection idle for more than HEALTH_CHECK_INTERVAL seconds
+  is pinged before reuse, and one older than RECYCLE seconds is replaced
+* metrics: ``stats()`` reports size, idle/in-use counts, waits and failures
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "MAX_SIZE": 20,
+    "TIMEOUT": 10,                # seconds to wait for a free connection
+    "RECYCLE": 1800,              # seconds before a connection is replaced
+    "HEALTH_CHECK_INTERVAL": 30,  # idle seconds before a connection is pinged on checkout
+}
+
+
+class PoolTimeout(Exception):
+    """No connection became free within the pool's acquire timeout."""
+
+
+class _Entry:
+    __slots__ = ("connection", "created_at", "released_at")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.released_at = self.created_at
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def _ping(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+class ConnectionPool:
+    def __init__(self, alias, max_size, timeout, recycle, health_check_interval):
+        self.alias = alias
+        self.max_size = max(1, int(max_size))
+        self.timeout = float(timeout)
+        self.recycle = float(recycle)
+        self.health_check_interval = float(health_check_interval)
+
+        self._cond = threading.Condition()
+        self._idle = []       # _Entry, most recently released last
+        self._in_use = {}     # id(connection) -> _Entry
+        self._opening = 0     # connections being created outside the lock
+
+        self.created = 0
+        self.acquired = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.health_check_failures = 0
+        self.recycled = 0
+        self.discarded = 0
+
+    @property
+    def size(self):
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def acquire(self, create):
+        """A connection from the pool; ``create()`` opens a new raw connection when needed."""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    self._in_use[id(entry.connection)] = entry
+                    break
+                if self.size < self.max_size:
+                    entry = None
+                    self._opening += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f"no database connection free in pool '{self.alias}' "
+                        f"after {self.timeout:g}s (max size {self.max_size})"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            if waited:
+                elapsed = time.monotonic() - started
+                self.waits += 1
+                self.wait_seconds += elapsed
+                self.max_wait_seconds = max(self.max_wait_seconds, elapsed)
+
+        if entry is not None and not self._usable(entry):
+            with self._cond:
+                del self._in_use[id(entry.connection)]
+                self._opening += 1
+            entry = None
+
+        if entry is None:
+            try:
+                entry = _Entry(create())
+            except Exception:
+                with self._cond:
+                    self._opening -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._opening -= 1
+                self._in_use[id(entry.connection)] = entry
+                self.created += 1
+
+        with self._cond:
+            self.acquired += 1
+        return entry.connection
+
+    def _usable(self, entry):
+        """Whether an idle connection can be handed out again; closes it if not."""
+        now = time.monotonic()
+        if now - entry.created_at > self.recycle:
+            _close_quietly(entry.connection)
+            self.recycled += 1
+            return False
+        if now - entry.released_at > self.health_check_interval:
+            try:
+                _ping(entry.connection)
+            except Exception:
+                _close_quietly(entry.connection)
+                self.health_check_failures += 1
+                return False
+        return True
+
+    def release(self, connection, discard=False):
+        """Return a connection; it is rolled back, or closed if it is broken or ``discard`` is set."""
+        with self._cond:
+            entry = self._in_use.pop(id(connection), None)
+        if entry is None:
+            # Not ours (e.g. opened before the pool existed)
+            _close_quietly(connection)
+            return
+
+        if not discard:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if discard:
+                self.discarded += 1
+            else:
+                entry.released_at = time.monotonic()
+                self._idle.append(entry)
+            self._cond.notify()
+
+        if discard:
+            _close_quietly(connection)
+
+    def close_idle(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            _close_quietly(entry.connection)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "size": self.size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "created": self.created,
+                "acquired": self.acquired,
+                "waits": self.waits,
+                "mean_wait_ms": round(self.wait_seconds / self.waits * 1000, 2) if self.waits else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+                "timeouts": self.timeouts,
+                "health_check_failures": self.health_check_failures,
+                "recycled": self.recycled,
+                "discarded": self.discarded,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool_options(settings_dict):
+    return {**DEFAULTS, **(settings_dict.get("POOL") or {})}
+
+
+def get_pool(alias, settings_dict):
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                options = pool_options(settings_dict)
+                pool = _pools[alias] = ConnectionPool(
+                    alias,
+                    max_size=options["MAX_SIZE"],
+                    timeout=options["TIMEOUT"],
+                    recycle=options["RECYCLE"],
+                    health_check_interval=options["HEALTH_CHECK_INTERVAL"],
+                )
+    return pool
+
+
+def stats():
+    """{alias: pool stats} for every pool created in this process."""
+    return {alias: pool.stats() for alias, pool in list(_pools.items())}
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Mix into a backend's DatabaseWrapper: raw connections come from and go back
+    to the alias's ConnectionPool. Use with CONN_MAX_AGE = 0 so Django hands
+    the connection back at the end of every request.
+    """
+
+    def get_new_connection(self, conn_params):
+        create = super().get_new_connection
+        return get_pool(self.alias, self.settings_dict).acquire(lambda: create(conn_params))
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                get_pool(self.alias, self.settings_dict).release(
+                    self.connection, discard=self.errors_occurred and not self._is_usable_quietly()
+                )
+
+    def _is_usable_quietly(self):
+        try:
+            return self.is_usable()
+        except Exception:
+            return False
+
+
+def startup_report(connections):
+    """Log how each database connects; opens no connection."""
+    for alias in connections:
+        wrapper = connections[alias]
+        settings_dict = wrapper.settings_dict
+        if isinstance(wrapper, PooledDatabaseWrapperMixin):
+            options = pool_options(settings_dict)
+            logger.info(
+                "database '%s': pooled %s, max_size=%s timeout=%ss recycle=%ss health_check_interval=%ss",
+                alias, wrapper.vendor, options["MAX_SIZE"], options["TIMEOUT"], options["RECYCLE"],
+                options["HEALTH_CHECK_INTERVAL"],
+            )
+        else:
+            logger.info(
+                "database '%s': %s, CONN_MAX_AGE=%s, CONN_HEALTH_CHECKS=%s",
+                alias, wrapper.vendor, settings_dict["CONN_MAX_AGE"], settings_dict["CONN_HEALTH_CHECKS"],
+            )
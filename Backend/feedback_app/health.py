@@ -0,0 +1,85 @@
+"""
+Liveness and readiness checks behind ``/healthz`` and ``/readyz``.
+
+Nothing here runs at import time: workers start without touching the
+database, and a load balancer or orchestrator asks explicitly.
+
+* liveness only says the process is serving requests
+* readiness runs ``SELECT 1`` on every database and a round trip through the
+  ``feedback`` cache; the result is kept for FEEDBACK_READY_CACHE_SECONDS so
+  frequent probes from several sources cost one check per interval
+"""
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+from feedback_app import cache as feedback_cache
+from feedback_app.db import pool as db_pool
+
+_started = time.time()
+
+_lock = threading.Lock()
+_last = None        # (checked_at monotonic, ready, checks)
+
+
+def liveness():
+    return {"pid": os.getpid(), "uptime_s": round(time.time() - _started, 1)}
+
+
+def _timed(check):
+    started = time.perf_counter()
+    try:
+        check()
+    except Exception as e:
+        result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    else:
+        result = {"ok": True}
+    result["ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def _check_database(alias):
+    with connections[alias].cursor() as cur:
+        cur.execute("SELECT 1")
+        cur.fetchone()
+
+
+def _check_cache():
+    cache = caches[feedback_cache.CACHE_ALIAS]
+    key = f"readyz:{os.getpid()}"
+    cache.set(key, 1, 30)
+    if cache.get(key) != 1:
+        raise RuntimeError("cache round trip failed")
+
+
+def run_checks():
+    checks = {f"database:{alias}": _timed(lambda alias=alias: _check_database(alias)) for alias in connections}
+    checks["cache"] = _timed(_check_cache)
+    pools = db_pool.stats()
+    for alias, stats in pools.items():
+        checks[f"database:{alias}"]["pool"] = stats
+    return all(c["ok"] for c in checks.values()), checks
+
+
+def readiness():
+    """(ready, checks, age in seconds of the result); re-checked at most once per cache interval."""
+    global _last
+    ttl = getattr(settings, "FEEDBACK_READY_CACHE_SECONDS", 5)
+    now = time.monotonic()
+    last = _last
+    if last is None or now - last[0] >= ttl:
+        # One probe runs the checks, concurrent ones reuse the previous result
+        if _lock.acquire(blocking=last is None):
+            try:
+                last = _last
+                if last is None or time.monotonic() - last[0] >= ttl:
+                    ready, checks = run_checks()
+                    last = _last = (time.monotonic(), ready, checks)
+            finally:
+                _lock.release()
+    checked_at, ready, checks = last
+    return ready, checks, round(time.monotonic() - checked_at, 2)
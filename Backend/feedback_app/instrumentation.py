@@ -0,0 +1,246 @@
+"""
+Per-request instrumentation.
+
+``InstrumentationMiddleware`` measures every database call of a request through
+an execute wrapper installed on each connection (``install``, called from
+``FeedbackAppConfig.ready``) and records the query count, total DB time, the
+slowest statements and the time spent serializing the JSON response. Each
+response gets a ``Server-Timing`` header, and the numbers are aggregated per URL
+name into histograms served by ``dashboard-admin/metrics/``.
+
+Aggregates live in the process that served the requests.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SLOWEST_KEPT = 5
+SQL_PREVIEW = 300
+
+
+class RequestMetrics:
+    __slots__ = ("queries", "db_seconds", "serialize_seconds", "slowest")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.slowest = []  # (seconds, sql), longest first
+
+    def add_query(self, seconds, sql):
+        self.queries += 1
+        self.db_seconds += seconds
+        if len(self.slowest) < SLOWEST_KEPT or seconds > self.slowest[-1][0]:
+            self.slowest.append((seconds, sql))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[SLOWEST_KEPT:]
+
+
+_current = ContextVar("feedback_request_metrics", default=None)
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    """Installed on every connection; records into the metrics of the request running in this context."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(time.perf_counter() - started, sql)
+
+
+def _install_wrapper(connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+def install():
+    """
+    Hook every database connection. The wrapper looks the current request up
+    in a context variable, which asgiref carries into the worker threads of
+    async views, so sync and async requests are measured the same way.
+    """
+    connection_created.connect(_install_wrapper, dispatch_uid="feedback_app.instrumentation")
+    for connection in connections.all(initialized_only=True):
+        _install_wrapper(connection)
+
+
+def record_serialization(seconds):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.serialize_seconds += seconds
+
+
+# -------------------------------------
+# Aggregates per URL name
+# -------------------------------------
+def _bucket(value, bounds):
+    for i, bound in enumerate(bounds):
+        if value <= bound:
+            return i
+    return len(bounds)
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.db_ms = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.serialize_ms = 0.0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.query_histogram = [0] * (len(QUERY_BUCKETS) + 1)
+        self.slowest = []  # (ms, sql)
+
+    def add(self, total_ms, metrics, status):
+        self.count += 1
+        if status >= 500:
+            self.errors += 1
+        self.total_ms += total_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        self.db_ms += metrics.db_seconds * 1000
+        self.queries += metrics.queries
+        self.max_queries = max(self.max_queries, metrics.queries)
+        self.serialize_ms += metrics.serialize_seconds * 1000
+        self.latency_histogram[_bucket(total_ms, LATENCY_BUCKETS_MS)] += 1
+        self.query_histogram[_bucket(metrics.queries, QUERY_BUCKETS)] += 1
+        for seconds, sql in metrics.slowest:
+            self.slowest.append((seconds * 1000, sql))
+        self.slowest.sort(key=lambda item: item[0], reverse=True)
+        del self.slowest[SLOWEST_KEPT:]
+
+    def as_dict(self):
+        n = self.count or 1
+        return {
+            "requests": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / n, 2),
+            "max_ms": round(self.max_ms, 2),
+            "mean_db_ms": round(self.db_ms / n, 2),
+            "mean_serialize_ms": round(self.serialize_ms / n, 3),
+            "mean_queries": round(self.queries / n, 2),
+            "max_queries": self.max_queries,
+            "latency_histogram_ms": _histogram(self.latency_histogram, LATENCY_BUCKETS_MS),
+            "query_histogram": _histogram(self.query_histogram, QUERY_BUCKETS),
+            "slowest_queries": [
+                {"ms": round(ms, 2), "sql": sql[:SQL_PREVIEW]} for ms, sql in self.slowest
+            ],
+        }
+
+
+def _histogram(counts, bounds):
+    labels = [f"<={b}" for b in bounds] + [f">{bounds[-1]}"]
+    return dict(zip(labels, counts))
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+_since = time.time()
+
+
+def record(name, total_ms, metrics, status):
+    with _stats_lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = _EndpointStats()
+        stats.add(total_ms, metrics, status)
+
+
+def snapshot(reset=False):
+    """{"since": epoch seconds, "endpoints": {url name: stats}}; optionally start a new window."""
+    global _stats, _since
+    with _stats_lock:
+        data = {
+            "since": _since,
+            "endpoints": {name: stats.as_dict() for name, stats in sorted(_stats.items())},
+        }
+        if reset:
+            _stats = {}
+            _since = time.time()
+    return data
+
+
+# -------------------------------------
+# Middleware
+# -------------------------------------
+class InstrumentationMiddleware:
+    """Records DB and serialization time per request and adds a Server-Timing header."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "FEEDBACK_INSTRUMENTATION", True)
+        self.slow_ms = getattr(settings, "FEEDBACK_SLOW_REQUEST_MS", 1000)
+        self.many_queries = getattr(settings, "FEEDBACK_MANY_QUERIES", 50)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, started)
+
+    def _finish(self, request, response, metrics, started):
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = metrics.db_seconds * 1000
+        serialize_ms = metrics.serialize_seconds * 1000
+
+        response["Server-Timing"] = ", ".join((
+            f'db;dur={db_ms:.2f};desc="{metrics.queries} queries"',
+            f"serialize;dur={serialize_ms:.2f}",
+            f"app;dur={max(total_ms - db_ms - serialize_ms, 0):.2f}",
+            f"total;dur={total_ms:.2f}",
+        ))
+
+        match = getattr(request, "resolver_match", None)
+        # Unnamed routes fall back to the view function's name
+        name = (match.url_name or match.view_name.rsplit(".", 1)[-1]) if match else "unresolved"
+        record(name, total_ms, metrics, response.status_code)
+
+        if total_ms >= self.slow_ms or metrics.queries >= self.many_queries:
+            logger.warning(
+                "%s %s took %.0fms with %d queries (%.0fms in DB); slowest: %s",
+                request.method, request.path, total_ms, metrics.queries, db_ms,
+                metrics.slowest[0][1][:SQL_PREVIEW] if metrics.slowest else "-",
+            )
+        return response
@@ -0,0 +1,163 @@
+"""
+In-process pub/sub for live submission events.
+
+Submissions are published after their transaction commits, and every connected
+admin stream (``dashboard-admin/live/``) gets a copy on its own bounded asyncio
+queue. One producer therefore fans out to any number of viewers without them
+polling the database.
+
+Per allocation the broker also keeps the response count, the overall mean
+rating and a rolling mean over the last ROLLING_WINDOW submissions. These are
+seeded once from Feedback_RatingRollup when the first viewer connects. Events
+carry no EnrollmentNo, so the feed never links a student to their ratings.
+
+The broker lives in one process. With several workers, each viewer sees the
+submissions handled by the worker that serves its stream.
+
+The stream is an async generator, so it needs an ASGI server (uvicorn). Under
+WSGI (runserver, gunicorn) Django would buffer it forever and hold a worker,
+so the view answers 501 there; clients should poll
+``dashboard-admin/reports/ratings/?group_by=allocation`` instead.
+"""
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+
+from django.db import transaction
+
+from feedback_app.models.feedback_ratingrollup import Feedback_RatingRollup
+
+QUESTIONS = tuple(range(1, 11))
+ROLLING_WINDOW = 50
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+class _AllocationStats:
+    __slots__ = ("count", "total", "recent")
+
+    def __init__(self, count=0, total=0):
+        self.count = count
+        self.total = total  # sum of every Q1..Q10 rating
+        self.recent = deque(maxlen=ROLLING_WINDOW)
+
+    def add(self, average):
+        self.count += 1
+        self.total += average * len(QUESTIONS)
+        self.recent.append(average)
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean": round(self.total / (self.count * len(QUESTIONS)), 3) if self.count else None,
+            "rolling_mean": round(sum(self.recent) / len(self.recent), 3) if self.recent else None,
+        }
+
+
+class Subscription:
+    """One viewer: an asyncio queue bound to the viewer's event loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def _put(self, event):
+        if self.queue.full():
+            # Slow viewer: drop the oldest event rather than block the producer
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class Broker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._stats = {}
+        self._seeded = False
+        self._ids = itertools.count(1)
+
+    # -------------------------------------
+    # Viewers
+    # -------------------------------------
+    def subscribe(self):
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def snapshot(self):
+        """Current per-allocation aggregates (seeds them from the rollup on first use)."""
+        if not self._seeded:
+            rows = Feedback_RatingRollup.objects.values_list(
+                "AllocationID", "ResponseCount", *(f"Q{q}_Sum" for q in QUESTIONS)
+            )
+            seeded = {pk: _AllocationStats(count, sum(sums)) for pk, count, *sums in rows}
+            with self._lock:
+                if not self._seeded:
+                    # The rollup already includes everything published so far; keep the rolling windows
+                    for pk, stats in seeded.items():
+                        if pk in self._stats:
+                            stats.recent = self._stats[pk].recent
+                    self._stats.update(seeded)
+                    self._seeded = True
+        with self._lock:
+            return {pk: stats.as_dict() for pk, stats in self._stats.items()}
+
+    # -------------------------------------
+    # Producer
+    # -------------------------------------
+    def publish(self, submissions):
+        """
+        Fan out submission events; ``submissions`` are (allocation_id, ratings dict) pairs.
+        Safe to call from any thread.
+        """
+        now = time.time()
+        with self._lock:
+            events = []
+            for allocation_id, ratings in submissions:
+                average = sum(ratings[f"q{q}"] for q in QUESTIONS) / len(QUESTIONS)
+                stats = self._stats.get(allocation_id)
+                if stats is None:
+                    stats = self._stats[allocation_id] = _AllocationStats()
+                stats.add(average)
+                events.append({
+                    "id": next(self._ids),
+                    "type": "submission",
+                    "allocation_id": allocation_id,
+                    "average": round(average, 3),
+                    "timestamp": now,
+                    "aggregate": stats.as_dict(),
+                })
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            for event in events:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._put, event)
+                except RuntimeError:
+                    # The viewer's loop is closed; it will unsubscribe on its way out
+                    self.unsubscribe(subscription)
+                    break
+
+
+broker = Broker()
+
+
+def publish_on_commit(submissions):
+    """Publish once the surrounding transaction commits (immediately outside one)."""
+    submissions = list(submissions)
+    if submissions:
+        transaction.on_commit(lambda: broker.publish(submissions))
@@ -0,0 +1,117 @@
+"""
+Small HTTP load generator for comparing deployments (e.g. WSGI vs ASGI).
+
+It speaks plain HTTP/1.1 over asyncio streams, so thousands of concurrent
+requests need no extra dependency and no thread per connection.
+"""
+import asyncio
+import json
+import statistics
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies_ms, wall_seconds=None):
+    """p50/p95/p99 etc. for a list of latencies in milliseconds."""
+    values = sorted(latencies_ms)
+    if not values:
+        return {"requests": 0}
+    summary = {
+        "requests": len(values),
+        "mean_ms": round(statistics.fmean(values), 2),
+        "p50_ms": round(percentile(values, 50), 2),
+        "p95_ms": round(percentile(values, 95), 2),
+        "p99_ms": round(percentile(values, 99), 2),
+        "max_ms": round(values[-1], 2),
+    }
+    if wall_seconds:
+        summary["throughput_rps"] = round(len(values) / wall_seconds, 1)
+    return summary
+
+
+async def request(base_url, method, path, body=None, headers=None, timeout=30):
+    """(status, headers dict with lower-case names and list values, body bytes)."""
+    url = urlsplit(base_url)
+    port = url.port or (443 if url.scheme == "https" else 80)
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(url.hostname, port, ssl=url.scheme == "https"), timeout
+    )
+    try:
+        payload = body.encode() if isinstance(body, str) else (body or b"")
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {url.netloc}", "Connection: close"]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        if payload:
+            lines.append(f"Content-Length: {len(payload)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + payload)
+        await writer.drain()
+
+        raw = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+
+    head, _, content = raw.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    response_headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        response_headers.setdefault(name.strip().lower(), []).append(value.strip())
+    return int(status_line.split()[1]), response_headers, content
+
+
+async def login(base_url, email, dob):
+    """Cookie header value for a logged-in student, or None."""
+    status, headers, _ = await request(
+        base_url, "POST", "/login/",
+        body=json.dumps({"email": email, "dob": dob}),
+        headers={"Content-Type": "application/json"},
+    )
+    if status != 200:
+        return None
+    cookie = SimpleCookie()
+    for value in headers.get("set-cookie", []):
+        cookie.load(value)
+    return "; ".join(f"{name}={morsel.value}" for name, morsel in cookie.items())
+
+
+async def run(base_url, paths, cookies, total, concurrency):
+    """Issue ``total`` GETs spread over ``paths`` and ``cookies`` with ``concurrency`` in flight."""
+    latencies = {path: [] for path in paths}
+    statuses = {}
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        nonlocal errors
+        path = paths[i % len(paths)]
+        headers = {"Cookie": cookies[i % len(cookies)]} if cookies else {}
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                status, _, _ = await request(base_url, "GET", path, headers=headers)
+            except (OSError, asyncio.TimeoutError):
+                errors += 1
+                return
+            latencies[path].append((time.perf_counter() - t0) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    wall = time.perf_counter() - wall
+
+    every = [ms for values in latencies.values() for ms in values]
+    return {
+        "concurrency": concurrency,
+        "statuses": statuses,
+        "errors": errors,
+        "overall": summarize(every, wall),
+        "paths": {path: summarize(values) for path, values in latencies.items()},
+    }
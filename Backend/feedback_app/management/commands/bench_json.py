@@ -0,0 +1,98 @@
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from feedback_app import responses
+from feedback_app.rating_schema import RATING_KEYS
+
+
+def admin_page(rows):
+    """dashboard-admin/table/Feedback_SubmissionLog/ style page: flat rows, timestamps already ISO strings."""
+    start = datetime(2025, 1, 6, 9, 30)
+    return {
+        "status": "ok",
+        "table_name": "Feedback_SubmissionLog",
+        "total_count": rows,
+        "data": [
+            {
+                "LogID": i,
+                "ResponseID": i,
+                "EnrollmentNo": f"0827CS{221000 + i}",
+                "AllocationID": i % 400 + 1,
+                "Timestamp": (start + timedelta(seconds=i * 37, microseconds=i)).isoformat(),
+            }
+            for i in range(1, rows + 1)
+        ],
+    }
+
+
+def feedback_page(rows):
+    """my-feedbacks style page: nested ratings, raw datetimes and Decimals left to the encoder."""
+    start = datetime(2025, 1, 6, 9, 30)
+    return {
+        "status": "ok",
+        "feedbacks": [
+            {
+                "log_id": i,
+                "timestamp": start + timedelta(seconds=i * 37, microseconds=i),
+                "teacher_name": "Dr. Teacher Name",
+                "subject_name": "Design and Analysis of Algorithms",
+                "subject_code": "CS501",
+                "ratings": {key: (i + q) % 5 + 1 for q, key in enumerate(RATING_KEYS)},
+                "mean": Decimal(i % 500) / 100,
+                "comments": "Clear explanations, more examples please." if i % 3 else None,
+            }
+            for i in range(1, rows + 1)
+        ],
+    }
+
+
+def timed_ms(func, data, repeats):
+    func(data)
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func(data)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+class Command(BaseCommand):
+    help = "Compare stdlib json (DjangoJSONEncoder) and orjson encoding of large API payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000, help="Rows per payload")
+        parser.add_argument("--repeats", type=int, default=20, help="Encodes per payload and backend (median reported)")
+        parser.add_argument("--json", dest="json_out", help="Also write the results to this JSON file")
+
+    def handle(self, *args, **options):
+        if responses.orjson is None:
+            raise CommandError("orjson is not installed; only the stdlib encoder is available")
+
+        rows = max(1, options["rows"])
+        repeats = max(1, options["repeats"])
+        result = {"rows": rows, "repeats": repeats, "payloads": {}}
+
+        for name, build in (("admin_page", admin_page), ("feedback_page", feedback_page)):
+            data = build(rows)
+            stdlib_out = responses.stdlib_dumps(data)
+            orjson_out = responses.orjson_dumps(data)
+            stdlib_ms = timed_ms(responses.stdlib_dumps, data, repeats)
+            orjson_ms = timed_ms(responses.orjson_dumps, data, repeats)
+            result["payloads"][name] = {
+                "stdlib_ms": round(stdlib_ms, 2),
+                "orjson_ms": round(orjson_ms, 2),
+                "speedup": round(stdlib_ms / orjson_ms, 1) if orjson_ms else None,
+                "stdlib_bytes": len(stdlib_out),
+                "orjson_bytes": len(orjson_out),
+                "same_document": json.loads(stdlib_out) == json.loads(orjson_out),
+            }
+
+        self.stdout.write(json.dumps(result, indent=2))
+        if options["json_out"]:
+            with open(options["json_out"], "w") as fh:
+                json.dump(result, fh, indent=2)
@@ -0,0 +1,92 @@
+import json
+import statistics
+import threading
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from feedback_app.loadtest import percentile
+from feedback_app.models.users_student import Users_Student
+
+
+class Command(BaseCommand):
+    help = "Fire a concurrent burst of student logins and report latency percentiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=20, help="Parallel clients")
+        parser.add_argument("--requests", type=int, default=500, help="Total logins")
+        parser.add_argument("--students", type=int, default=200, help="Distinct active students to log in as")
+        parser.add_argument("--json", dest="json_out", help="Also write the results to this JSON file")
+        parser.add_argument("--keep-sessions", action="store_true", help="Do not delete the sessions created")
+
+    def handle(self, *args, **options):
+        accounts = list(
+            Users_Student.objects.filter(IsActive=True, DateOfBirth__isnull=False)
+            .values_list("Email", "DateOfBirth")[:options["students"]]
+        )
+        if not accounts:
+            raise CommandError("no active students with a date of birth to log in as")
+
+        total = options["requests"]
+        concurrency = max(1, options["concurrency"])
+        latencies, statuses, session_keys = [], {}, []
+        lock = threading.Lock()
+        counter = iter(range(total))
+        start_gate = threading.Barrier(concurrency)
+
+        def worker():
+            client = Client()
+            start_gate.wait()
+            try:
+                while True:
+                    with lock:
+                        i = next(counter, None)
+                    if i is None:
+                        return
+                    email, dob = accounts[i % len(accounts)]
+                    body = json.dumps({"email": email.upper() if i % 2 else email, "dob": dob.isoformat()})
+                    t0 = time.perf_counter()
+                    response = client.post("/login/", body, content_type="application/json")
+                    elapsed = (time.perf_counter() - t0) * 1000
+                    key = response.cookies.get("sessionid")
+                    with lock:
+                        latencies.append(elapsed)
+                        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                        if key:
+                            session_keys.append(key.value)
+                    client.cookies.clear()
+            finally:
+                connection.close()
+
+        wall = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - wall
+
+        latencies.sort()
+        result = {
+            "requests": len(latencies),
+            "concurrency": concurrency,
+            "statuses": statuses,
+            "throughput_rps": round(len(latencies) / wall, 1) if wall else None,
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+
+        if not options["keep_sessions"]:
+            for i in range(0, len(session_keys), 1000):
+                Session.objects.filter(session_key__in=session_keys[i:i + 1000]).delete()
+
+        self.stdout.write(json.dumps(result, indent=2))
+        if options["json_out"]:
+            with open(options["json_out"], "w") as fh:
+                json.dump(result, fh, indent=2)
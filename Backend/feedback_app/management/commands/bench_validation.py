@@ -0,0 +1,74 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from feedback_app.models.feedback_response import Feedback_Response
+from feedback_app.rating_schema import RATING_KEYS, validate_feedback
+from feedback_app.serializers import FeedbackSerializer
+
+PAYLOADS = {
+    # JSON body as sent by the frontend
+    "json": {"subject_code": "cs101", "allocation_id": 1, **{k: (i % 5) + 1 for i, k in enumerate(RATING_KEYS)},
+             "comments": "Clear explanations, more examples please."},
+    # form-encoded body: every value is a string
+    "form": {"subject_code": "cs101", "allocation_id": "1", **{k: str((i % 5) + 1) for i, k in enumerate(RATING_KEYS)},
+             "comments": "Clear explanations, more examples please."},
+    # one bad rating, one missing field
+    "invalid": {"subject_code": "cs101", "allocation_id": 1, **{k: 3 for k in RATING_KEYS[:-1]}, "q1": 9},
+}
+
+
+def old_path(payload):
+    """The previous submission check: bound form, then full_clean() on the model instance."""
+    form = FeedbackSerializer(data=payload)
+    if not form.is_valid():
+        return form.errors
+    data = form.cleaned_data
+    feedback = Feedback_Response(
+        AllocationID_id=data["allocation_id"],
+        Comments=data["comments"] or None,
+        **{f"Q{i}_Rating": data[key] for i, key in enumerate(RATING_KEYS, start=1)},
+    )
+    # The FK check issued a query as well; it is excluded so only CPU is compared
+    feedback.full_clean(exclude=["AllocationID"])
+    return {}
+
+
+def new_path(payload):
+    return validate_feedback(payload)[1]
+
+
+def cpu_us_per_call(func, payload, iterations):
+    func(payload)
+    started = time.process_time_ns()
+    for _ in range(iterations):
+        func(payload)
+    return (time.process_time_ns() - started) / iterations / 1000
+
+
+class Command(BaseCommand):
+    help = "Compare the CPU cost of validating one feedback submission: form + full_clean() vs validate_feedback()"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=5000, help="Calls per payload and path")
+        parser.add_argument("--json", dest="json_out", help="Also write the results to this JSON file")
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+        result = {"iterations": iterations, "payloads": {}}
+
+        for name, payload in PAYLOADS.items():
+            old_us = cpu_us_per_call(old_path, payload, iterations)
+            new_us = cpu_us_per_call(new_path, payload, iterations)
+            result["payloads"][name] = {
+                "form_full_clean_us": round(old_us, 2),
+                "validate_feedback_us": round(new_us, 2),
+                "saved_us": round(old_us - new_us, 2),
+                "speedup": round(old_us / new_us, 1) if new_us else None,
+            }
+
+        self.stdout.write(json.dumps(result, indent=2))
+        if options["json_out"]:
+            with open(options["json_out"], "w") as fh:
+                json.dump(result, fh, indent=2)
@@ -0,0 +1,95 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from feedback_app import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a stand-in database and replay the feedback-window workload through the real views. "
+        "Run with --settings=feedbacksystem.settings_bench"
+    )
+
+    def add_arguments(self, parser):
+        for name, default in benchmark.DEFAULT_SCALE.items():
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+        parser.add_argument("--no-seed", action="store_true", help="Replay against the data already in the database")
+        parser.add_argument("--replay-students", type=int, default=100, help="Students that log in and submit")
+        parser.add_argument("--submissions", type=int, default=6, help="Feedbacks submitted per student")
+        parser.add_argument("--admin-sessions", type=int, default=5)
+        parser.add_argument("--admin-pages", type=int, default=5, help="Cursor pages browsed per table")
+        parser.add_argument("--json", dest="json_out", help="Write the results to this file")
+        parser.add_argument("--baseline", help="Compare against this results file and fail on query count growth")
+        parser.add_argument("--tolerance", type=float, default=benchmark.DEFAULT_TOLERANCE,
+                            help="Allowed p95 slowdown as a fraction, after calibration (default 0.5)")
+        parser.add_argument("--min-samples", type=int, default=benchmark.MIN_LATENCY_SAMPLES,
+                            help="Requests an endpoint needs in both runs before its latency is compared")
+        parser.add_argument("--strict-latency", action="store_true",
+                            help="Fail on p95 slowdowns too, not only warn (for quiet, dedicated machines)")
+
+    def handle(self, *args, **options):
+        try:
+            benchmark.prepare_database()
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        # The replay logs in to the admin dashboard with the configured credentials
+        os.environ.setdefault("ADMIN_USERNAME", "bench-admin")
+        os.environ.setdefault("ADMIN_PASSWORD", "bench-admin")
+
+        scale = {name: options[name] for name in benchmark.DEFAULT_SCALE}
+        dataset = None
+        if not options["no_seed"]:
+            dataset = benchmark.seed(**scale)
+            self.stdout.write(f"seeded {dataset}")
+
+        workload = {
+            "students": options["replay_students"],
+            "submissions": options["submissions"],
+            "admin_sessions": options["admin_sessions"],
+            "admin_pages": options["admin_pages"],
+            "seed": scale["seed"],
+        }
+        environment, results = benchmark.run(workload)
+        document = {
+            "scale": scale,
+            "dataset": dataset,
+            "workload": workload,
+            "environment": environment,
+            "results": results,
+        }
+
+        self.report(document)
+        if options["json_out"]:
+            with open(options["json_out"], "w") as fh:
+                json.dump(document, fh, indent=2, default=str)
+            self.stdout.write(f"results written to {options['json_out']}")
+
+        if options["baseline"]:
+            with open(options["baseline"]) as fh:
+                baseline = json.load(fh)
+            regressions, warnings = benchmark.compare(
+                baseline, document, options["tolerance"], options["min_samples"], options["strict_latency"]
+            )
+            for line in warnings:
+                self.stderr.write(f"WARNING {line}")
+            if regressions:
+                for line in regressions:
+                    self.stderr.write(f"REGRESSION {line}")
+                raise CommandError(f"{len(regressions)} regressions against {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS("no regressions against baseline"))
+
+    def report(self, document):
+        results = document["results"]
+        self.stdout.write(
+            f"{results['requests']} requests in {results['wall_seconds']}s ({results['throughput_rps']} req/s), "
+            f"calibration {document['environment']['calibration_ms']}ms"
+        )
+        self.stdout.write(f"{'endpoint':<22}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'fail':>6}")
+        for name, r in results["endpoints"].items():
+            self.stdout.write(
+                f"{name:<22}{r['requests']:>6}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}"
+                f"{r['queries_max']:>9}{r['failures']:>6}"
+            )
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from feedback_app import write_behind
+
+
+class Command(BaseCommand):
+    help = "Drain the write-behind feedback queue into Feedback_Response / Feedback_SubmissionLog"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain what is queued now and exit")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--list-dead", action="store_true", help="List rows that used up their attempts and exit")
+        parser.add_argument(
+            "--requeue-dead", nargs="*", type=int, metavar="ID",
+            help="Give dead rows (all, or the given journal ids) a fresh set of attempts and exit"
+        )
+
+    def handle(self, *args, **options):
+        queue = write_behind.get_queue()
+
+        if options["list_dead"]:
+            for row in queue.dead_rows(limit=1000):
+                self.stdout.write(
+                    f"{row['id']}: {row['enrollment_no']} allocation={row['allocation_id']} "
+                    f"attempts={row['attempts']} error={row['last_error']}"
+                )
+            return
+
+        if options["requeue_dead"] is not None:
+            count = queue.requeue_dead(options["requeue_dead"] or None)
+            self.stdout.write(self.style.SUCCESS(f"requeued {count} dead submissions"))
+            return
+
+        failures = 0
+        while True:
+            try:
+                drained = queue.drain_once()
+                failures = 0
+            except write_behind.TRANSIENT_ERRORS as e:
+                # Batch released without counting an attempt; wait for the database
+                failures += 1
+                delay = min(queue.BACKOFF_MAX, options["interval"] * 2 ** failures)
+                self.stderr.write(f"database unavailable ({e}), retrying in {delay:.0f}s")
+                time.sleep(delay)
+                continue
+            if drained:
+                stats = queue.stats()
+                self.stdout.write(f"drained {drained} submissions, depth={stats['depth']} lag={stats['drain_lag_seconds']}s")
+            if drained < queue.batch_size:
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS("queue drained"))
@@ -0,0 +1,45 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from feedback_app import roster_import
+
+
+class Command(BaseCommand):
+    help = "Bulk import a CSV/Excel roster into Users_Student, Faculty_Teacher, Academic_Subject or Academic_Allocation"
+
+    def add_arguments(self, parser):
+        parser.add_argument("table", help="Table or model name, e.g. Users_Student")
+        parser.add_argument("path", help="CSV or .xlsx file whose header row uses the model field names")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only, write nothing")
+        parser.add_argument("--chunk-size", type=int, default=roster_import.DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--errors", help="Write the per-row error report to this CSV file")
+
+    def handle(self, *args, **options):
+        try:
+            importer = roster_import.RosterImporter(
+                options["table"], dry_run=options["dry_run"], chunk_size=options["chunk_size"]
+            )
+            with open(options["path"], "rb") as fh:
+                report = importer.run(roster_import.open_rows(fh, options["path"]))
+        except (roster_import.ImportFormatError, OSError) as e:
+            raise CommandError(str(e))
+
+        if options["errors"] and report["errors"]:
+            with open(options["errors"], "w", newline="", encoding="utf-8") as out:
+                writer = csv.writer(out)
+                writer.writerow(["row", "field", "error"])
+                for item in report["errors"]:
+                    for field, messages in item["errors"].items():
+                        for message in messages:
+                            writer.writerow([item["row"], field, message])
+
+        prefix = "[dry run] " if report["dry_run"] else ""
+        self.stdout.write(
+            f"{prefix}{report['table']}: {report['rows']} rows, {report['created']} created, "
+            f"{report['updated']} updated, {report['failed']} failed"
+        )
+        for item in report["errors"][:20]:
+            self.stdout.write(f"  row {item['row']}: {item['errors']}")
+        if report["failed"] > 20:
+            self.stdout.write(f"  ... {report['failed'] - 20} more")
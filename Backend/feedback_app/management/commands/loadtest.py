@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from feedback_app import loadtest
+from feedback_app.models.users_student import Users_Student
+
+COMPARED = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the student read endpoints of a running server, e.g. once under "
+        "`gunicorn feedbacksystem.wsgi` and once under `uvicorn feedbacksystem.asgi:application`, "
+        "then compare the two result files with --compare"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--path", action="append", dest="paths",
+                            help="Endpoint to hit (repeatable); default /my-teachers/ and /my-feedbacks/")
+        parser.add_argument("--students", type=int, default=50, help="Students to log in as")
+        parser.add_argument("--concurrency", type=int, default=500)
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument("--label", default="run", help="Name of this deployment in the results, e.g. wsgi or asgi")
+        parser.add_argument("--json", dest="json_out", help="Write the results to this JSON file")
+        parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"),
+                            help="Compare two result files instead of running")
+
+    def handle(self, *args, **options):
+        if options["compare"]:
+            return self.compare(*options["compare"])
+
+        accounts = list(
+            Users_Student.objects.filter(IsActive=True, DateOfBirth__isnull=False)
+            .values_list("Email", "DateOfBirth")[:options["students"]]
+        )
+        if not accounts:
+            raise CommandError("no active students with a date of birth to log in as")
+
+        result = asyncio.run(self.run(options, accounts))
+        self.stdout.write(json.dumps(result, indent=2))
+        if options["json_out"]:
+            with open(options["json_out"], "w") as fh:
+                json.dump(result, fh, indent=2)
+
+    async def run(self, options, accounts):
+        base_url = options["base_url"]
+        cookies = [
+            c for c in await asyncio.gather(*(
+                loadtest.login(base_url, email, dob.isoformat()) for email, dob in accounts
+            )) if c
+        ]
+        if not cookies:
+            raise CommandError(f"could not log in any student at {base_url}")
+
+        result = await loadtest.run(
+            base_url,
+            options["paths"] or ["/my-teachers/", "/my-feedbacks/"],
+            cookies,
+            options["requests"],
+            options["concurrency"],
+        )
+        return {"label": options["label"], "base_url": base_url, "students": len(cookies), **result}
+
+    def compare(self, baseline_path, candidate_path):
+        with open(baseline_path) as fh:
+            baseline = json.load(fh)
+        with open(candidate_path) as fh:
+            candidate = json.load(fh)
+
+        self.stdout.write(f"{'metric':<16}{baseline['label']:>14}{candidate['label']:>14}{'change':>10}")
+        for metric in COMPARED:
+            before = baseline["overall"].get(metric)
+            after = candidate["overall"].get(metric)
+            change = f"{(after - before) / before * 100:+.1f}%" if before and after is not None else "-"
+            self.stdout.write(f"{metric:<16}{before!s:>14}{after!s:>14}{change:>10}")
+        self.stdout.write(f"{'errors':<16}{baseline['errors']!s:>14}{candidate['errors']!s:>14}")
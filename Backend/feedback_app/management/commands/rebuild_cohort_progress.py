@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from feedback_app import progress
+
+
+class Command(BaseCommand):
+    help = "Rebuild Feedback_CohortProgress from Users_Student, Academic_Allocation and Feedback_SubmissionLog"
+
+    def handle(self, *args, **options):
+        count = progress.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"progress counters rebuilt for {count} cohorts"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from feedback_app import rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild Feedback_RatingRollup from scratch out of Feedback_Response"
+
+    def handle(self, *args, **options):
+        count = rollup.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"rollup rebuilt for {count} allocations"))
@@ -1,8 +1,13 @@
 """
 Custom middleware to exempt specific URLs from CSRF verification
 """
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
 
 class CsrfExemptMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
         # List of URL paths to exempt from CSRF
@@ -10,13 +15,23 @@ class CsrfExemptMiddleware:
             '/admin/login/',
             '/admin/table/',
         ]
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self._exempt(request)
+        response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request):
+        self._exempt(request)
+        return await self.get_response(request)
+
+    def _exempt(self, request):
         # Check if the request path should be exempt from CSRF
         for url in self.exempt_urls:
             if request.path.startswith(url):
                 setattr(request, '_dont_enforce_csrf_checks', True)
                 break
-        
-        response = self.get_response(request)
-        return response
@@ -0,0 +1,137 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:25
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Academic_Allocation',
+            fields=[
+                ('AllocationID', models.AutoField(primary_key=True, serialize=False)),
+                ('TargetBranch', models.CharField(max_length=50)),
+                ('Target_Year', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('Target_Semester', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('Target_Section', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+            ],
+            options={
+                'db_table': 'Academic_Allocation',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Academic_Subject',
+            fields=[
+                ('SubjectCode', models.CharField(max_length=50, primary_key=True, serialize=False, validators=[django.core.validators.MaxLengthValidator(50)])),
+                ('SubjectName', models.CharField(max_length=255)),
+                ('Semester', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('Branch', models.CharField(max_length=20)),
+            ],
+            options={
+                'db_table': 'Academic_Subject',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Faculty_Teacher',
+            fields=[
+                ('TeacherID', models.CharField(max_length=50, primary_key=True, serialize=False, validators=[django.core.validators.MaxLengthValidator(50)], verbose_name='Teacher ID')),
+                ('FullName', models.CharField(max_length=255)),
+                ('Designation', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+            options={
+                'db_table': 'Faculty_Teacher',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Feedback_Response',
+            fields=[
+                ('ResponseID', models.AutoField(primary_key=True, serialize=False)),
+                ('Q1_Rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('Q2_Rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('Q3_Rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('Q4_Rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('Q5_Rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('Q6_Rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('Q7_Rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('Q8_Rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('Q9_Rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('Q10_Rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('Comments', models.CharField(blank=True, max_length=500, null=True, validators=[django.core.validators.MaxLengthValidator(500)])),
+            ],
+            options={
+                'db_table': 'Feedback_Response',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Feedback_SubmissionLog',
+            fields=[
+                ('LogID', models.AutoField(primary_key=True, serialize=False)),
+                ('Timestamp', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'Feedback_SubmissionLog',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Users_Student',
+            fields=[
+                ('EnrollmentNo', models.CharField(max_length=50, primary_key=True, serialize=False, validators=[django.core.validators.MaxLengthValidator(50)])),
+                ('FullName', models.CharField(max_length=255)),
+                ('Gender', models.CharField(choices=[('M', 'Male'), ('F', 'Female'), ('O', 'Other')], max_length=1)),
+                ('Email', models.CharField(max_length=255, validators=[django.core.validators.EmailValidator()])),
+                ('Branch', models.CharField(max_length=255)),
+                ('Year', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('Semester', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('Section', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('IsActive', models.BooleanField(default=True)),
+                ('DateOfBirth', models.DateField(blank=True, null=True, verbose_name='Date of Birth')),
+            ],
+            options={
+                'db_table': 'Users_Student',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Feedback_RatingRollup',
+            fields=[
+                ('AllocationID', models.OneToOneField(db_column='AllocationID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='feedback_app.academic_allocation')),
+                ('ResponseCount', models.PositiveIntegerField(default=0)),
+                ('Q1_Sum', models.PositiveIntegerField(default=0)),
+                ('Q2_Sum', models.PositiveIntegerField(default=0)),
+                ('Q3_Sum', models.PositiveIntegerField(default=0)),
+                ('Q4_Sum', models.PositiveIntegerField(default=0)),
+                ('Q5_Sum', models.PositiveIntegerField(default=0)),
+                ('Q6_Sum', models.PositiveIntegerField(default=0)),
+                ('Q7_Sum', models.PositiveIntegerField(default=0)),
+                ('Q8_Sum', models.PositiveIntegerField(default=0)),
+                ('Q9_Sum', models.PositiveIntegerField(default=0)),
+                ('Q10_Sum', models.PositiveIntegerField(default=0)),
+                ('Q1_SumSq', models.PositiveIntegerField(default=0)),
+                ('Q2_SumSq', models.PositiveIntegerField(default=0)),
+                ('Q3_SumSq', models.PositiveIntegerField(default=0)),
+                ('Q4_SumSq', models.PositiveIntegerField(default=0)),
+                ('Q5_SumSq', models.PositiveIntegerField(default=0)),
+                ('Q6_SumSq', models.PositiveIntegerField(default=0)),
+                ('Q7_SumSq', models.PositiveIntegerField(default=0)),
+                ('Q8_SumSq', models.PositiveIntegerField(default=0)),
+                ('Q9_SumSq', models.PositiveIntegerField(default=0)),
+                ('Q10_SumSq', models.PositiveIntegerField(default=0)),
+                ('UpdatedAt', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'Feedback_RatingRollup',
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Feedback_CohortProgress',
+            fields=[
+                ('CohortID', models.AutoField(primary_key=True, serialize=False)),
+                ('Branch', models.CharField(max_length=255)),
+                ('Year', models.PositiveSmallIntegerField()),
+                ('Semester', models.PositiveSmallIntegerField()),
+                ('Section', models.PositiveSmallIntegerField()),
+                ('RosterSize', models.PositiveIntegerField(default=0)),
+                ('AllocationCount', models.PositiveIntegerField(default=0)),
+                ('ExpectedCount', models.PositiveIntegerField(default=0)),
+                ('SubmissionCount', models.PositiveIntegerField(default=0)),
+                ('UpdatedAt', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'Feedback_CohortProgress',
+                'constraints': [models.UniqueConstraint(fields=('Branch', 'Year', 'Semester', 'Section'), name='uniq_cohort_progress')],
+            },
+        ),
+    ]
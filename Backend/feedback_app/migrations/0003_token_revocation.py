@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0002_cohort_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Feedback_TokenRevocation',
+            fields=[
+                ('Key', models.CharField(max_length=80, primary_key=True, serialize=False)),
+                ('Value', models.BigIntegerField()),
+                ('ExpiresAt', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'db_table': 'Feedback_TokenRevocation',
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0003_token_revocation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Feedback_AllocationProgress',
+            fields=[
+                ('AllocationID', models.OneToOneField(db_column='AllocationID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='feedback_app.academic_allocation')),
+                ('ExpectedCount', models.PositiveIntegerField(default=0)),
+                ('SubmissionCount', models.PositiveIntegerField(default=0)),
+                ('UpdatedAt', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'Feedback_AllocationProgress',
+            },
+        ),
+    ]
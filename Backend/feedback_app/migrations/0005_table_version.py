@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0004_allocation_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Feedback_TableVersion',
+            fields=[
+                ('TableName', models.CharField(max_length=128, primary_key=True, serialize=False)),
+                ('Version', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'Feedback_TableVersion',
+            },
+        ),
+    ]
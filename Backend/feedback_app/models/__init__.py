@@ -4,6 +4,11 @@ from .users_student import Users_Student
 from .academic_allocation import Academic_Allocation
 from .feedback_response import Feedback_Response
 from .feedback_submissionlog import Feedback_SubmissionLog
+from .feedback_ratingrollup import Feedback_RatingRollup
+from .feedback_cohortprogress import Feedback_CohortProgress
+from .feedback_allocationprogress import Feedback_AllocationProgress
+from .feedback_tokenrevocation import Feedback_TokenRevocation
+from .feedback_tableversion import Feedback_TableVersion
 
 __all__ = [
     "Faculty_Teacher",
@@ -12,4 +17,9 @@ __all__ = [
     "Academic_Allocation",
     "Feedback_Response",
     "Feedback_SubmissionLog",
+    "Feedback_RatingRollup",
+    "Feedback_CohortProgress",
+    "Feedback_AllocationProgress",
+    "Feedback_TokenRevocation",
+    "Feedback_TableVersion",
 ]
\ No newline at end of file
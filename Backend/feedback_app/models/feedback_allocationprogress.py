@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class Feedback_AllocationProgress(models.Model):
+    """
+    Expected-versus-received submission counters for one allocation.
+    Maintained with the cohort counters by feedback_app.progress; rebuild with
+    `manage.py rebuild_cohort_progress`.
+    """
+    AllocationID = models.OneToOneField(
+        "feedback_app.Academic_Allocation",
+        db_column="AllocationID",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    ExpectedCount = models.PositiveIntegerField(default=0)    # active students of the target cohort
+    SubmissionCount = models.PositiveIntegerField(default=0)  # submissions by those students
+
+    UpdatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "Feedback_AllocationProgress"
+
+    def __str__(self):
+        return f"Allocation {self.AllocationID_id}: {self.SubmissionCount}/{self.ExpectedCount}"
@@ -0,0 +1,32 @@
+from django.db import models
+
+
+class Feedback_CohortProgress(models.Model):
+    """
+    Expected-versus-received submission counters for one class cohort.
+    Kept in step with submissions and roster/allocation edits by
+    feedback_app.progress; rebuild with `manage.py rebuild_cohort_progress`.
+    """
+    CohortID = models.AutoField(primary_key=True)
+    Branch = models.CharField(max_length=255)  # stored lower-cased
+    Year = models.PositiveSmallIntegerField()
+    Semester = models.PositiveSmallIntegerField()
+    Section = models.PositiveSmallIntegerField()
+
+    RosterSize = models.PositiveIntegerField(default=0)       # active students
+    AllocationCount = models.PositiveIntegerField(default=0)  # teacher/subject allocations
+    ExpectedCount = models.PositiveIntegerField(default=0)    # RosterSize * AllocationCount
+    SubmissionCount = models.PositiveIntegerField(default=0)  # submissions by those active students
+
+    UpdatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "Feedback_CohortProgress"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["Branch", "Year", "Semester", "Section"], name="uniq_cohort_progress"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.Branch} Y{self.Year} S{self.Semester} Sec{self.Section}: {self.SubmissionCount}/{self.ExpectedCount}"
@@ -0,0 +1,46 @@
+from django.db import models
+
+
+class Feedback_RatingRollup(models.Model):
+    """
+    Running per-allocation totals of Feedback_Response ratings.
+    Kept in step with inserts by feedback_app.rollup; rebuild with
+    `manage.py rebuild_rating_rollup`.
+    """
+    AllocationID = models.OneToOneField(
+        "feedback_app.Academic_Allocation",
+        db_column="AllocationID",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    ResponseCount = models.PositiveIntegerField(default=0)
+
+    Q1_Sum = models.PositiveIntegerField(default=0)
+    Q2_Sum = models.PositiveIntegerField(default=0)
+    Q3_Sum = models.PositiveIntegerField(default=0)
+    Q4_Sum = models.PositiveIntegerField(default=0)
+    Q5_Sum = models.PositiveIntegerField(default=0)
+    Q6_Sum = models.PositiveIntegerField(default=0)
+    Q7_Sum = models.PositiveIntegerField(default=0)
+    Q8_Sum = models.PositiveIntegerField(default=0)
+    Q9_Sum = models.PositiveIntegerField(default=0)
+    Q10_Sum = models.PositiveIntegerField(default=0)
+
+    Q1_SumSq = models.PositiveIntegerField(default=0)
+    Q2_SumSq = models.PositiveIntegerField(default=0)
+    Q3_SumSq = models.PositiveIntegerField(default=0)
+    Q4_SumSq = models.PositiveIntegerField(default=0)
+    Q5_SumSq = models.PositiveIntegerField(default=0)
+    Q6_SumSq = models.PositiveIntegerField(default=0)
+    Q7_SumSq = models.PositiveIntegerField(default=0)
+    Q8_SumSq = models.PositiveIntegerField(default=0)
+    Q9_SumSq = models.PositiveIntegerField(default=0)
+    Q10_SumSq = models.PositiveIntegerField(default=0)
+
+    UpdatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "Feedback_RatingRollup"
+
+    def __str__(self):
+        return f"Rollup for Allocation {self.AllocationID_id} ({self.ResponseCount} responses)"
\ No newline at end of file
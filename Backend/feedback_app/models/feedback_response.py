@@ -1,8 +1,7 @@
 from django.db import models
-from django.core.validators import MinValueValidator, MaxValueValidator, MaxLengthValidator
 
-RATING_MIN = 1
-RATING_MAX = 5
+from feedback_app.rating_schema import COMMENTS_MAX_LENGTH, comments_validators, rating_validators
+
 
 class Feedback_Response(models.Model):
     ResponseID = models.AutoField(primary_key=True)
@@ -12,18 +11,18 @@ class Feedback_Response(models.Model):
         on_delete=models.CASCADE,
     )
 
-    Q1_Rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)])
-    Q2_Rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)])
-    Q3_Rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)])
-    Q4_Rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)])
-    Q5_Rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)])
-    Q6_Rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)])
-    Q7_Rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)])
-    Q8_Rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)])
-    Q9_Rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)])
-    Q10_Rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)])
+    Q1_Rating = models.PositiveSmallIntegerField(validators=rating_validators())
+    Q2_Rating = models.PositiveSmallIntegerField(validators=rating_validators())
+    Q3_Rating = models.PositiveSmallIntegerField(validators=rating_validators())
+    Q4_Rating = models.PositiveSmallIntegerField(validators=rating_validators())
+    Q5_Rating = models.PositiveSmallIntegerField(validators=rating_validators())
+    Q6_Rating = models.PositiveSmallIntegerField(validators=rating_validators())
+    Q7_Rating = models.PositiveSmallIntegerField(validators=rating_validators())
+    Q8_Rating = models.PositiveSmallIntegerField(validators=rating_validators())
+    Q9_Rating = models.PositiveSmallIntegerField(validators=rating_validators())
+    Q10_Rating = models.PositiveSmallIntegerField(validators=rating_validators())
 
-    Comments = models.CharField(max_length=500, blank=True, null=True, validators=[MaxLengthValidator(500)])
+    Comments = models.CharField(max_length=COMMENTS_MAX_LENGTH, blank=True, null=True, validators=comments_validators())
 
     class Meta:
         db_table = "Feedback_Response"
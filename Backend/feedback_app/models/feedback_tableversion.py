@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class Feedback_TableVersion(models.Model):
+    """
+    Write counter per table, kept by feedback_app.cache. Admin writes, imports
+    and counter rebuilds advance it in the database, so every worker derives
+    the same validators (ETags) and cache keys from it.
+    """
+    TableName = models.CharField(max_length=128, primary_key=True)
+    Version = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "Feedback_TableVersion"
+
+    def __str__(self):
+        return f"{self.TableName} v{self.Version}"
@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class Feedback_TokenRevocation(models.Model):
+    """
+    Deny-list entry for student tokens, kept by feedback_app.student_auth.
+    ``token-deny:<id>`` denies one token (logout); ``token-nbf:<EnrollmentNo>`` denies
+    every token of that student issued at or before ``Value`` (ms since the
+    epoch). Rows are dropped once the tokens they cover have expired.
+    """
+    Key = models.CharField(max_length=80, primary_key=True)
+    Value = models.BigIntegerField()
+    ExpiresAt = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "Feedback_TokenRevocation"
+
+    def __str__(self):
+        return f"{self.Key} until {self.ExpiresAt}"
@@ -0,0 +1,103 @@
+"""
+Keyset (seek) pagination for the admin table view.
+
+Pages are addressed by an opaque cursor holding the (sort column, pk) values of
+the row at the page edge, so every page is an index seek plus TOP(n) instead of
+OFFSET/FETCH over all preceding rows.
+"""
+import base64
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values, direction):
+    raw = json.dumps({"k": values, "d": direction}, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        values, direction = data["k"], data["d"]
+    except Exception:
+        raise InvalidCursor("invalid cursor")
+    if direction not in ("next", "prev") or not isinstance(values, list):
+        raise InvalidCursor("invalid cursor")
+    return values, direction
+
+
+def keyset_fields(model, sort_by=None):
+    """Fields the keyset orders on: (sort column, pk), or just pk."""
+    pk = model._meta.pk
+    if not sort_by or sort_by == pk.name:
+        return [pk]
+
+    try:
+        field = model._meta.get_field(sort_by)
+    except Exception:
+        return [pk]
+    if not field.concrete:
+        return [pk]
+    if field.null:
+        raise InvalidCursor("cursor pagination requires a non-nullable sort_by column")
+    return [field, pk]
+
+
+def keyset_page(queryset, fields, descending=False, cursor=None, page_size=50):
+    """
+    Return (rows, next_cursor, prev_cursor) for one page of ``queryset``
+    ordered by ``fields``. Rows are whatever the queryset yields.
+    """
+    direction = "next"
+    if cursor:
+        values, direction = decode_cursor(cursor)
+        if len(values) != len(fields):
+            raise InvalidCursor("cursor does not match sort_by")
+        try:
+            values = [f.to_python(v) for f, v in zip(fields, values)]
+        except Exception:
+            raise InvalidCursor("invalid cursor")
+
+    backwards = direction == "prev"
+    # Walking backwards is a forward seek on the reversed ordering
+    desc = descending != backwards
+    op = "lt" if desc else "gt"
+    names = [f.attname for f in fields]
+
+    if cursor:
+        if len(names) == 2:
+            condition = Q(**{f"{names[0]}__{op}": values[0]}) | \
+                Q(**{names[0]: values[0], f"{names[1]}__{op}": values[1]})
+        else:
+            condition = Q(**{f"{names[0]}__{op}": values[0]})
+        queryset = queryset.filter(condition)
+
+    ordering = [f"-{name}" if desc else name for name in names]
+    rows = list(queryset.order_by(*ordering)[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    def key_of(row):
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if backwards:
+            next_cursor = encode_cursor(key_of(rows[-1]), "next")
+            prev_cursor = encode_cursor(key_of(rows[0]), "prev") if has_more else None
+        else:
+            next_cursor = encode_cursor(key_of(rows[-1]), "next") if has_more else None
+            prev_cursor = encode_cursor(key_of(rows[0]), "prev") if cursor else None
+
+    return rows, next_cursor, prev_cursor
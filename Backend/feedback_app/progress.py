@@ -0,0 +1,377 @@
+"""
+Cohort response-rate counters.
+
+Feedback_CohortProgress keeps, per (Branch, Year, Semester, Section), the active
+roster size, the number of allocations targeting the cohort, the expected
+submissions (roster x allocations) and the submissions received.
+Feedback_AllocationProgress keeps the same expected / received pair for each
+allocation. Both only count submissions by active students of the allocation's
+cohort, the same students the roster counts, so completion cannot pass 100%.
+
+* ``record_submissions`` adds new submissions inside the insert transaction.
+* ``refresh_cohorts`` recounts a few cohorts after roster or allocation edits;
+  every count it runs is filtered to one cohort.
+* ``rebuild`` recomputes both tables (``manage.py rebuild_cohort_progress``,
+  run once after migrating); reports never build them on demand.
+
+Admin reports read the counters, and pending-student lists only touch the
+submissions of one cohort's incomplete allocations.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from feedback_app.cache import bump_table_versions, cohort_key, touch_tables
+from feedback_app.models.academic_allocation import Academic_Allocation
+from feedback_app.models.academic_subject import Academic_Subject
+from feedback_app.models.faculty_teacher import Faculty_Teacher
+from feedback_app.models.feedback_allocationprogress import Feedback_AllocationProgress
+from feedback_app.models.feedback_cohortprogress import Feedback_CohortProgress
+from feedback_app.models.feedback_submissionlog import Feedback_SubmissionLog
+from feedback_app.models.users_student import Users_Student
+from feedback_app.rollup import lock_against_inserts
+
+ALLOCATION_COHORT = ("TargetBranch", "Target_Year", "Target_Semester", "Target_Section")
+STUDENT_COHORT = ("Branch", "Year", "Semester", "Section")
+
+
+def _key(row):
+    """Normalized cohort for a (branch, year, semester, section) row, or None if incomplete."""
+    if any(value in (None, "") for value in row):
+        return None
+    return cohort_key(*row)
+
+
+def _students(cohort):
+    branch, year, semester, section = cohort
+    return Users_Student.objects.filter(
+        IsActive=True, Branch__iexact=branch, Year=year, Semester=semester, Section=section
+    )
+
+
+def _allocations(cohort):
+    branch, year, semester, section = cohort
+    return Academic_Allocation.objects.filter(
+        TargetBranch__iexact=branch, Target_Year=year, Target_Semester=semester, Target_Section=section
+    )
+
+
+# -------------------------------------
+# Which cohorts does a write touch?
+# -------------------------------------
+def cohorts_of(model, pks):
+    """Cohorts of the given rows (students, allocations, or the allocations of teachers/subjects)."""
+    pks = list(pks)
+    if not pks:
+        return set()
+    if model is Users_Student:
+        rows = Users_Student.objects.filter(pk__in=pks).values_list(*STUDENT_COHORT)
+    elif model is Academic_Allocation:
+        rows = Academic_Allocation.objects.filter(pk__in=pks).values_list(*ALLOCATION_COHORT)
+    elif model is Faculty_Teacher:
+        rows = Academic_Allocation.objects.filter(TeacherID__in=pks).values_list(*ALLOCATION_COHORT)
+    elif model is Academic_Subject:
+        rows = Academic_Allocation.objects.filter(SubjectCode__in=pks).values_list(*ALLOCATION_COHORT)
+    else:
+        return set()
+    return {key for key in map(_key, rows) if key}
+
+
+def cohorts_of_objects(model, objs):
+    """Cohorts of in-memory Users_Student / Academic_Allocation instances."""
+    if model is Users_Student:
+        fields = STUDENT_COHORT
+    elif model is Academic_Allocation:
+        fields = ALLOCATION_COHORT
+    else:
+        return set()
+    keys = (_key(tuple(getattr(obj, f) for f in fields)) for obj in objs)
+    return {key for key in keys if key}
+
+
+# -------------------------------------
+# Maintenance
+# -------------------------------------
+def _save_counters(cohort, values):
+    branch, year, semester, section = cohort
+    lookup = {"Branch": branch, "Year": year, "Semester": semester, "Section": section}
+    if Feedback_CohortProgress.objects.filter(**lookup).update(**values):
+        return
+    try:
+        with transaction.atomic():
+            Feedback_CohortProgress.objects.create(**lookup, **values)
+    except IntegrityError:
+        # Created concurrently; our counts are at least as fresh
+        Feedback_CohortProgress.objects.filter(**lookup).update(**values)
+
+
+def _save_allocation_counters(allocation_ids, roster, received):
+    """Replace the per-allocation rows of one cohort's allocations."""
+    Feedback_AllocationProgress.objects.filter(AllocationID__in=allocation_ids).delete()
+    Feedback_AllocationProgress.objects.bulk_create([
+        Feedback_AllocationProgress(
+            AllocationID_id=allocation_id, ExpectedCount=roster, SubmissionCount=received[allocation_id]
+        )
+        for allocation_id in allocation_ids
+    ])
+
+
+def refresh_cohorts(cohorts):
+    """Recount the given cohorts (and their allocations) from the source tables."""
+    if cohorts:
+        touch_tables(Feedback_CohortProgress, Feedback_AllocationProgress)
+        bump_table_versions(Feedback_CohortProgress, Feedback_AllocationProgress)
+    for cohort in cohorts:
+        roster = _students(cohort).count()
+        allocation_ids = list(_allocations(cohort).values_list("AllocationID", flat=True))
+        received = Counter(dict(
+            Feedback_SubmissionLog.objects.filter(
+                AllocationID__in=allocation_ids, EnrollmentNo__in=_students(cohort).values("pk")
+            ).order_by().values("AllocationID").annotate(n=Count("LogID")).values_list("AllocationID", "n")
+        )) if allocation_ids else Counter()
+
+        with transaction.atomic():
+            _save_allocation_counters(allocation_ids, roster, received)
+            _save_counters(cohort, {
+                "RosterSize": roster,
+                "AllocationCount": len(allocation_ids),
+                "ExpectedCount": roster * len(allocation_ids),
+                "SubmissionCount": sum(received.values()),
+            })
+
+
+def record_submissions(pairs):
+    """
+    Count newly inserted (enrollment_no, allocation_id) submissions (call
+    inside the insert transaction). Only submissions by active students of the
+    allocation's cohort are counted, matching the roster.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return
+    students = {
+        enrollment_no: _key(cohort) for enrollment_no, *cohort in Users_Student.objects.filter(
+            pk__in={e for e, _ in pairs}, IsActive=True
+        ).values_list("EnrollmentNo", *STUDENT_COHORT)
+    }
+    allocations = {
+        allocation_id: _key(cohort) for allocation_id, *cohort in Academic_Allocation.objects.filter(
+            pk__in={a for _, a in pairs}
+        ).values_list("AllocationID", *ALLOCATION_COHORT)
+    }
+    per_allocation = Counter(
+        allocation_id for enrollment_no, allocation_id in pairs
+        if allocations.get(allocation_id) and students.get(enrollment_no) == allocations[allocation_id]
+    )
+    if not per_allocation:
+        return
+    touch_tables(Feedback_CohortProgress, Feedback_AllocationProgress)
+
+    per_cohort = Counter()
+    for allocation_id, n in per_allocation.items():
+        per_cohort[allocations[allocation_id]] += n
+
+    missing = set()
+    for (branch, year, semester, section), n in per_cohort.items():
+        updated = Feedback_CohortProgress.objects.filter(
+            Branch=branch, Year=year, Semester=semester, Section=section
+        ).update(SubmissionCount=F("SubmissionCount") + n)
+        if not updated:
+            missing.add((branch, year, semester, section))
+
+    for allocation_id, n in per_allocation.items():
+        updated = Feedback_AllocationProgress.objects.filter(AllocationID=allocation_id) \
+            .update(SubmissionCount=F("SubmissionCount") + n)
+        if not updated:
+            missing.add(allocations[allocation_id])
+
+    # First submission for a cohort without counters: count it from scratch
+    refresh_cohorts(missing)
+
+
+def rebuild():
+    """
+    Recompute every cohort's and allocation's counters. Returns the number of cohorts.
+    Runs in one transaction that holds off new submissions until it commits.
+    """
+    with transaction.atomic():
+        lock_against_inserts(Feedback_SubmissionLog)
+
+        roster = Counter()
+        for row in Users_Student.objects.filter(IsActive=True).order_by() \
+                .values(*STUDENT_COHORT).annotate(n=Count("EnrollmentNo")):
+            key = _key(tuple(row[f] for f in STUDENT_COHORT))
+            if key:
+                roster[key] += row["n"]
+
+        allocation_cohorts = {}
+        for allocation_id, *cohort in Academic_Allocation.objects.order_by() \
+                .values_list("AllocationID", *ALLOCATION_COHORT):
+            key = _key(cohort)
+            if key:
+                allocation_cohorts[allocation_id] = key
+        allocations = Counter(allocation_cohorts.values())
+
+        # Submissions by active students who are still in the allocation's cohort
+        received = Counter(dict(
+            Feedback_SubmissionLog.objects.filter(
+                EnrollmentNo__IsActive=True,
+                EnrollmentNo__Branch__iexact=F("AllocationID__TargetBranch"),
+                EnrollmentNo__Year=F("AllocationID__Target_Year"),
+                EnrollmentNo__Semester=F("AllocationID__Target_Semester"),
+                EnrollmentNo__Section=F("AllocationID__Target_Section"),
+            ).order_by().values("AllocationID").annotate(n=Count("LogID")).values_list("AllocationID", "n")
+        ))
+        submissions = Counter()
+        for allocation_id, n in received.items():
+            if allocation_id in allocation_cohorts:
+                submissions[allocation_cohorts[allocation_id]] += n
+
+        rows = []
+        for cohort in set(roster) | set(allocations):
+            branch, year, semester, section = cohort
+            rows.append(Feedback_CohortProgress(
+                Branch=branch, Year=year, Semester=semester, Section=section,
+                RosterSize=roster[cohort],
+                AllocationCount=allocations[cohort],
+                ExpectedCount=roster[cohort] * allocations[cohort],
+                SubmissionCount=submissions[cohort],
+            ))
+
+        Feedback_CohortProgress.objects.all().delete()
+        Feedback_CohortProgress.objects.bulk_create(rows, batch_size=500)
+        Feedback_AllocationProgress.objects.all().delete()
+        Feedback_AllocationProgress.objects.bulk_create([
+            Feedback_AllocationProgress(
+                AllocationID_id=allocation_id,
+                ExpectedCount=roster[cohort],
+                SubmissionCount=received[allocation_id],
+            )
+            for allocation_id, cohort in allocation_cohorts.items()
+        ], batch_size=500)
+        touch_tables(Feedback_CohortProgress, Feedback_AllocationProgress)
+        bump_table_versions(Feedback_CohortProgress, Feedback_AllocationProgress)
+
+    return len(rows)
+
+
+# -------------------------------------
+# Reports
+# -------------------------------------
+def _completion(received, expected):
+    return round(received / expected, 4) if expected else None
+
+
+def counters_built():
+    return Feedback_CohortProgress.objects.exists()
+
+
+def cohort_summary(branch=None, year=None, semester=None, section=None, incomplete_only=False):
+    """Counters and completion ratio per cohort, least complete first."""
+    qs = Feedback_CohortProgress.objects.all()
+    if branch:
+        qs = qs.filter(Branch=branch.strip().lower())
+    if year:
+        qs = qs.filter(Year=year)
+    if semester:
+        qs = qs.filter(Semester=semester)
+    if section:
+        qs = qs.filter(Section=section)
+
+    results = []
+    for row in qs.values(
+        "Branch", "Year", "Semester", "Section", "RosterSize",
+        "AllocationCount", "ExpectedCount", "SubmissionCount", "UpdatedAt",
+    ):
+        completion = _completion(row["SubmissionCount"], row["ExpectedCount"])
+        if incomplete_only and (completion is None or completion >= 1):
+            continue
+        results.append({
+            "branch": row["Branch"].upper(),
+            "year": row["Year"],
+            "semester": row["Semester"],
+            "section": row["Section"],
+            "roster_size": row["RosterSize"],
+            "allocations": row["AllocationCount"],
+            "expected": row["ExpectedCount"],
+            "received": row["SubmissionCount"],
+            "pending": max(row["ExpectedCount"] - row["SubmissionCount"], 0),
+            "completion": completion,
+            "updated_at": row["UpdatedAt"],
+        })
+
+    return sorted(results, key=lambda r: (r["completion"] is None, r["completion"] or 0))
+
+
+def cohort_detail(branch, year, semester, section, allocation_id=None):
+    """
+    Per-allocation completion and the students still pending for one cohort
+    (optionally for a single allocation of it). Received counts come from the
+    allocation counters; submission logs are read only for the cohort's
+    allocations that are still incomplete (or have no counters yet).
+    """
+    cohort = cohort_key(branch, year, semester, section)
+
+    allocations = _allocations(cohort).order_by("SubjectCode", "AllocationID")
+    if allocation_id is not None:
+        allocations = allocations.filter(AllocationID=allocation_id)
+    allocations = list(allocations.values(
+        "AllocationID", "TeacherID", "TeacherID__FullName", "SubjectCode", "SubjectCode__SubjectName"
+    ))
+    allocation_ids = [a["AllocationID"] for a in allocations]
+
+    students = list(_students(cohort).order_by("EnrollmentNo").values_list("EnrollmentNo", "FullName", "Email"))
+
+    roster = len(students)
+
+    counters = dict(
+        Feedback_AllocationProgress.objects.filter(AllocationID__in=allocation_ids)
+        .values_list("AllocationID", "SubmissionCount")
+    ) if allocation_ids else {}
+    open_ids = [a for a in allocation_ids if a not in counters or counters[a] < roster]
+
+    submitted = {}
+    scanned = Counter()
+    if open_ids:
+        for enrollment_no, alloc_id in Feedback_SubmissionLog.objects.filter(
+            AllocationID__in=open_ids, EnrollmentNo__in=_students(cohort).values("pk")
+        ).values_list("EnrollmentNo", "AllocationID"):
+            submitted.setdefault(enrollment_no, set()).add(alloc_id)
+            scanned[alloc_id] += 1
+    received = {a: counters[a] if a in counters else scanned[a] for a in allocation_ids}
+
+    pending = []
+    for enrollment_no, name, email in students:
+        done = submitted.get(enrollment_no, set())
+        missing = [alloc_id for alloc_id in open_ids if alloc_id not in done]
+        if missing:
+            pending.append({
+                "enrollment_no": enrollment_no,
+                "full_name": name,
+                "email": email,
+                "submitted": len(allocation_ids) - len(missing),
+                "pending_allocations": missing,
+            })
+
+    return {
+        "branch": cohort[0].upper(),
+        "year": cohort[1],
+        "semester": cohort[2],
+        "section": cohort[3],
+        "roster_size": roster,
+        "allocations": [
+            {
+                "allocation_id": a["AllocationID"],
+                "teacher_id": a["TeacherID"],
+                "teacher_name": a["TeacherID__FullName"],
+                "subject_code": a["SubjectCode"],
+                "subject_name": a["SubjectCode__SubjectName"],
+                "expected": roster,
+                "received": received[a["AllocationID"]],
+                "completion": _completion(received[a["AllocationID"]], roster),
+            }
+            for a in allocations
+        ],
+        "pending_students": pending,
+    }
@@ -0,0 +1,147 @@
+"""
+Validation rules for a feedback submission.
+
+The rules are declared once here: rating range, field lengths and messages.
+``Feedback_Response`` builds its field validators from them and
+``FeedbackSerializer`` builds its form fields from them.
+
+``validate_feedback()`` is the hot-path check used by the submit views. It
+walks the fixed schema once over a plain dict, without binding a form or
+calling ``full_clean()`` on the model, and it returns the same
+{field: [messages]} errors the form would. Django's own validators are only
+consulted on the error path, to produce identical messages.
+"""
+import re
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.validators import (
+    MaxLengthValidator, MaxValueValidator, MinValueValidator, ProhibitNullCharactersValidator,
+)
+
+RATING_MIN = 1
+RATING_MAX = 5
+RATING_KEYS = tuple(f"q{i}" for i in range(1, 11))
+
+SUBJECT_CODE_MAX_LENGTH = 50
+COMMENTS_MAX_LENGTH = 500
+
+RATING_MESSAGE = f"rating must be {RATING_MIN}–{RATING_MAX}"
+SUBJECT_CODE_MESSAGES = {
+    "required": "subject_code is required",
+    "max_length": f"subject_code must be at most {SUBJECT_CODE_MAX_LENGTH} characters",
+}
+ALLOCATION_ID_MESSAGES = {
+    "required": "allocation_id is required",
+    "invalid": "allocation_id must be an integer",
+}
+RATING_MESSAGES = {
+    key: {"required": f"{key} is required", "min_value": RATING_MESSAGE, "max_value": RATING_MESSAGE}
+    for key in RATING_KEYS
+}
+
+# Same normalisation and empty values as forms.IntegerField / forms.Field
+_DECIMAL_SUFFIX = re.compile(r"\.0*\s*$")
+_EMPTY_VALUES = (None, "", [], (), {})
+
+
+def rating_validators():
+    """Validators for one Q*_Rating model field."""
+    return [MinValueValidator(RATING_MIN), MaxValueValidator(RATING_MAX)]
+
+
+def comments_validators():
+    return [MaxLengthValidator(COMMENTS_MAX_LENGTH)]
+
+
+def rating_form_field(key):
+    return forms.IntegerField(
+        min_value=RATING_MIN, max_value=RATING_MAX, required=True, error_messages=RATING_MESSAGES[key]
+    )
+
+
+# -------------------------------------
+# One-pass payload validation
+# -------------------------------------
+def _text(value):
+    return "" if value in _EMPTY_VALUES else str(value).strip()
+
+
+def _text_errors(value, max_length, messages):
+    """Messages for a text value that is too long or has NUL characters; [] on the fast path."""
+    if len(value) <= max_length and "\x00" not in value:
+        return []
+    errors = []
+    for validator in (MaxLengthValidator(max_length), ProhibitNullCharactersValidator()):
+        try:
+            validator(value)
+        except ValidationError as e:
+            errors.append(messages.get(e.code) or e.messages[0])
+    return errors
+
+
+def _integer(value):
+    """int for a form-style integer value; raises ValueError / TypeError like IntegerField."""
+    if type(value) is int:
+        return value
+    return int(_DECIMAL_SUFFIX.sub("", str(value)))
+
+
+def validate_feedback(data):
+    """
+    (cleaned, errors) for one submission payload.
+
+    ``cleaned`` has subject_code (upper-cased), allocation_id, q1..q10 and
+    comments. ``errors`` is {} when the payload is valid, otherwise the same
+    {field: [messages]} shape as ``FeedbackSerializer(data=data).errors``.
+    """
+    if not isinstance(data, dict):
+        return {}, {"__all__": ["payload must be an object"]}
+
+    cleaned = {}
+    errors = {}
+    get = data.get
+
+    subject_code = _text(get("subject_code"))
+    if not subject_code:
+        errors["subject_code"] = [SUBJECT_CODE_MESSAGES["required"]]
+    else:
+        messages = _text_errors(subject_code, SUBJECT_CODE_MAX_LENGTH, SUBJECT_CODE_MESSAGES)
+        if messages:
+            errors["subject_code"] = messages
+        else:
+            cleaned["subject_code"] = subject_code.upper()
+
+    allocation_id = get("allocation_id")
+    if allocation_id in _EMPTY_VALUES:
+        errors["allocation_id"] = [ALLOCATION_ID_MESSAGES["required"]]
+    else:
+        try:
+            cleaned["allocation_id"] = _integer(allocation_id)
+        except (ValueError, TypeError):
+            errors["allocation_id"] = [ALLOCATION_ID_MESSAGES["invalid"]]
+
+    for key in RATING_KEYS:
+        value = get(key)
+        if type(value) is not int:
+            if value in _EMPTY_VALUES:
+                errors[key] = [RATING_MESSAGES[key]["required"]]
+                continue
+            try:
+                value = _integer(value)
+            except (ValueError, TypeError):
+                errors[key] = [str(forms.IntegerField.default_error_messages["invalid"])]
+                continue
+        if RATING_MIN <= value <= RATING_MAX:
+            cleaned[key] = value
+        else:
+            errors[key] = [RATING_MESSAGE]
+
+    comments = _text(get("comments"))
+    messages = _text_errors(comments, COMMENTS_MAX_LENGTH, {})
+    if messages:
+        errors["comments"] = messages
+    else:
+        cleaned["comments"] = comments
+
+    return cleaned, errors
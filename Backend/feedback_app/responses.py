@@ -0,0 +1,104 @@
+"""
+JSON response used by the API views.
+
+Same interface as ``django.http.JsonResponse``, with a pluggable encoder:
+
+* ``orjson`` (used when installed) encodes str/int/float/bool/None, dicts,
+  lists, tuples and UUIDs in C. Anything else (datetimes, Decimals, lazy
+  translation strings, subclasses such as form ``ErrorList``) is handed to
+  ``DjangoJSONEncoder.default``. The output therefore matches Django's
+  formatting, e.g. millisecond timestamps, but without the spaces after
+  separators or the ``\\uXXXX`` escapes.
+* ``stdlib``: ``json.dumps`` with ``DjangoJSONEncoder``, exactly as before.
+
+FEEDBACK_JSON_BACKEND selects ``auto`` (default), ``orjson`` or ``stdlib``.
+A payload orjson cannot encode (e.g. integers beyond 64 bits) falls back to
+stdlib. The time spent encoding is reported to the request instrumentation
+(see instrumentation.py).
+"""
+import json
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from feedback_app import instrumentation
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+BACKENDS = ("auto", "orjson", "stdlib")
+
+_django_default = DjangoJSONEncoder().default
+
+
+def _orjson_default(o):
+    # Subclasses of the native types arrive here because of OPT_PASSTHROUGH_SUBCLASS
+    if isinstance(o, dict):
+        return dict(o)
+    if isinstance(o, (list, tuple)):
+        return list(o)
+    if isinstance(o, str):
+        return str(o)
+    if isinstance(o, int):
+        return int(o)
+    return _django_default(o)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_SUBCLASS
+
+
+def stdlib_dumps(data, encoder=DjangoJSONEncoder, **params):
+    return json.dumps(data, cls=encoder, **params).encode()
+
+
+def orjson_dumps(data):
+    try:
+        return orjson.dumps(data, default=_orjson_default, option=_ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        return stdlib_dumps(data)
+
+
+def backend():
+    """Name of the encoder in use: ``orjson`` or ``stdlib``."""
+    choice = getattr(settings, "FEEDBACK_JSON_BACKEND", "auto")
+    if choice not in BACKENDS:
+        raise ValueError(f"FEEDBACK_JSON_BACKEND must be one of {', '.join(BACKENDS)}")
+    if choice == "stdlib" or orjson is None:
+        if choice == "orjson":
+            raise ImportError("FEEDBACK_JSON_BACKEND is 'orjson' but orjson is not installed")
+        return "stdlib"
+    return "orjson"
+
+
+def dumps(data):
+    """Encode ``data`` to UTF-8 JSON bytes with the configured backend."""
+    if backend() == "orjson":
+        return orjson_dumps(data)
+    return stdlib_dumps(data)
+
+
+class JsonResponse(HttpResponse):
+    """
+    ``django.http.JsonResponse`` with the configured encoder. A custom
+    ``encoder`` or ``json_dumps_params`` switches to stdlib for that response.
+    """
+
+    def __init__(self, data, encoder=DjangoJSONEncoder, safe=True, json_dumps_params=None, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False."
+            )
+        kwargs.setdefault("content_type", "application/json")
+        started = time.perf_counter()
+        if encoder is DjangoJSONEncoder and not json_dumps_params:
+            content = dumps(data)
+        else:
+            content = stdlib_dumps(data, encoder, **(json_dumps_params or {}))
+        super().__init__(content=content, **kwargs)
+        instrumentation.record_serialization(time.perf_counter() - started)
@@ -0,0 +1,221 @@
+"""
+Incremental rating rollup.
+
+Feedback_RatingRollup keeps, per allocation, the response count and the sum and
+sum of squares of each Q1..Q10 rating. ``apply_responses`` must run inside the
+transaction that inserts the responses; reports then read O(allocations) rows
+instead of scanning Feedback_Response.
+"""
+import math
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from feedback_app.cache import bump_table_versions, cohort_key, touch_tables
+from feedback_app.models.academic_allocation import Academic_Allocation
+from feedback_app.models.feedback_ratingrollup import Feedback_RatingRollup
+from feedback_app.models.feedback_response import Feedback_Response
+from feedback_app.models.users_student import Users_Student
+
+QUESTIONS = tuple(range(1, 11))
+
+# group_by name -> (key column, label column) on the per-allocation row
+REPORT_GROUPS = {
+    "allocation": ("AllocationID", None),
+    "teacher": ("TeacherID", "TeacherID__FullName"),
+    "subject": ("SubjectCode", "SubjectCode__SubjectName"),
+    "branch": ("TargetBranch", None),
+    "semester": ("Target_Semester", None),
+}
+
+
+def _totals(responses):
+    """Per-allocation count / sums / sums of squares for a list of responses."""
+    totals = {}
+    for resp in responses:
+        t = totals.setdefault(resp.AllocationID_id, [0] + [0] * 20)
+        t[0] += 1
+        for q in QUESTIONS:
+            value = getattr(resp, f"Q{q}_Rating")
+            t[q] += value
+            t[10 + q] += value * value
+    return totals
+
+
+def apply_responses(responses):
+    """Add newly inserted responses to the rollup (call inside the insert transaction)."""
+    touch_tables(Feedback_RatingRollup)
+    for allocation_id, t in _totals(responses).items():
+        increments = {"ResponseCount": F("ResponseCount") + t[0]}
+        for q in QUESTIONS:
+            increments[f"Q{q}_Sum"] = F(f"Q{q}_Sum") + t[q]
+            increments[f"Q{q}_SumSq"] = F(f"Q{q}_SumSq") + t[10 + q]
+
+        if Feedback_RatingRollup.objects.filter(AllocationID=allocation_id).update(**increments):
+            continue
+
+        initial = {"ResponseCount": t[0]}
+        for q in QUESTIONS:
+            initial[f"Q{q}_Sum"] = t[q]
+            initial[f"Q{q}_SumSq"] = t[10 + q]
+        try:
+            with transaction.atomic():
+                Feedback_RatingRollup.objects.create(AllocationID_id=allocation_id, **initial)
+        except IntegrityError:
+            # A concurrent submission created the row first
+            Feedback_RatingRollup.objects.filter(AllocationID=allocation_id).update(**increments)
+
+
+# Statement that blocks inserts into a table until the transaction ends,
+# while still letting other sessions read it
+_SHARE_LOCK_SQL = {
+    "microsoft": "SELECT COUNT(*) FROM {table} WITH (TABLOCK, HOLDLOCK)",
+    "postgresql": "LOCK TABLE {table} IN SHARE MODE",
+    "mysql": "SELECT COUNT(*) FROM {table} LOCK IN SHARE MODE",
+    # A write takes SQLite's database-wide RESERVED lock, which no other writer can get
+    "sqlite": "UPDATE {table} SET rowid = rowid WHERE 0",
+}
+
+
+def lock_against_inserts(model):
+    """
+    Hold off inserts into ``model``'s table for the rest of the current
+    transaction. In-flight inserts are waited for, so an aggregate read after
+    this sees every submission that will ever be counted before the commit.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        raise transaction.TransactionManagementError("lock_against_inserts() must run inside a transaction")
+    sql = _SHARE_LOCK_SQL.get(connection.vendor)
+    if sql is None:
+        raise NotImplementedError(f"no table lock for database vendor '{connection.vendor}'")
+    with connection.cursor() as cur:
+        cur.execute(sql.format(table=connection.ops.quote_name(model._meta.db_table)))
+
+
+def rebuild():
+    """
+    Recompute the whole rollup from Feedback_Response. Returns the number of rows written.
+
+    Aggregate and replace run in one transaction that blocks new responses
+    until it commits, so no submission lands between the read and the write.
+    """
+    aggregates = {"ResponseCount": Count("ResponseID")}
+    for q in QUESTIONS:
+        aggregates[f"Q{q}_Sum"] = Sum(f"Q{q}_Rating")
+        aggregates[f"Q{q}_SumSq"] = Sum(F(f"Q{q}_Rating") * F(f"Q{q}_Rating"))
+
+    with transaction.atomic():
+        lock_against_inserts(Feedback_Response)
+        rows = [
+            Feedback_RatingRollup(AllocationID_id=row.pop("AllocationID"), **row)
+            for row in Feedback_Response.objects.order_by().values("AllocationID").annotate(**aggregates)
+        ]
+        Feedback_RatingRollup.objects.all().delete()
+        Feedback_RatingRollup.objects.bulk_create(rows, batch_size=500)
+        touch_tables(Feedback_RatingRollup)
+        bump_table_versions(Feedback_RatingRollup)
+
+    return len(rows)
+
+
+def _roster_sizes():
+    """
+    Active students per normalized (Branch, Year, Semester, Section), counted
+    from Users_Student; only used for allocations without progress counters.
+    """
+    sizes = {}
+    for row in Users_Student.objects.filter(IsActive=True).order_by() \
+            .values("Branch", "Year", "Semester", "Section").annotate(n=Count("EnrollmentNo")):
+        key = cohort_key(row["Branch"], row["Year"], row["Semester"], row["Section"])
+        sizes[key] = sizes.get(key, 0) + row["n"]
+    return sizes
+
+
+def _question_stats(n, total, total_sq):
+    if not n:
+        return {"mean": None, "stddev": None}
+    mean = total / n
+    variance = max(total_sq / n - mean * mean, 0.0)
+    return {"mean": round(mean, 3), "stddev": round(math.sqrt(variance), 3)}
+
+
+def summarize(group_by, branch=None, semester=None):
+    """
+    Mean, standard deviation and response rate per group, computed from the
+    rollup and the per-allocation roster sizes in Feedback_AllocationProgress
+    (kept by feedback_app.progress), both read in the allocation query.
+    """
+    key_field, label_field = REPORT_GROUPS[group_by]
+
+    columns = [
+        "AllocationID", "TeacherID", "TeacherID__FullName", "SubjectCode",
+        "SubjectCode__SubjectName", "TargetBranch", "Target_Year",
+        "Target_Semester", "Target_Section", "feedback_ratingrollup__ResponseCount",
+        "feedback_allocationprogress__ExpectedCount",
+    ]
+    for q in QUESTIONS:
+        columns.append(f"feedback_ratingrollup__Q{q}_Sum")
+        columns.append(f"feedback_ratingrollup__Q{q}_SumSq")
+
+    allocations = Academic_Allocation.objects.order_by()
+    if branch:
+        allocations = allocations.filter(TargetBranch__iexact=branch)
+    if semester:
+        allocations = allocations.filter(Target_Semester=semester)
+
+    roster = None
+    groups = {}
+
+    for row in allocations.values(*columns):
+        key = row[key_field]
+        if group_by == "branch":
+            key = key.strip().upper()
+
+        g = groups.get(key)
+        if g is None:
+            g = groups[key] = {
+                "key": key,
+                "label": row[label_field] if label_field else key,
+                "allocations": 0,
+                "responses": 0,
+                "expected": 0,
+                "sums": [0] * 21,
+            }
+
+        g["allocations"] += 1
+        expected = row["feedback_allocationprogress__ExpectedCount"]
+        if expected is None:
+            # Counters not built for this allocation yet
+            if roster is None:
+                roster = _roster_sizes()
+            expected = roster.get(cohort_key(
+                row["TargetBranch"], row["Target_Year"], row["Target_Semester"], row["Target_Section"]
+            ), 0)
+        g["expected"] += expected
+
+        n = row["feedback_ratingrollup__ResponseCount"] or 0
+        if not n:
+            continue
+        g["responses"] += n
+        g["sums"][0] += n
+        for q in QUESTIONS:
+            g["sums"][q] += row[f"feedback_ratingrollup__Q{q}_Sum"]
+            g["sums"][10 + q] += row[f"feedback_ratingrollup__Q{q}_SumSq"]
+
+    results = []
+    for g in groups.values():
+        sums = g.pop("sums")
+        n = sums[0]
+        g["response_rate"] = round(g["responses"] / g["expected"], 4) if g["expected"] else None
+        g["questions"] = {
+            f"q{q}": _question_stats(n, sums[q], sums[10 + q]) for q in QUESTIONS
+        }
+        g["overall"] = _question_stats(
+            n * len(QUESTIONS),
+            sum(sums[q] for q in QUESTIONS),
+            sum(sums[10 + q] for q in QUESTIONS),
+        )
+        results.append(g)
+
+    return sorted(results, key=lambda g: str(g["key"]))
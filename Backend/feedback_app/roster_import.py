@@ -0,0 +1,269 @@
+"""
+Bulk roster import (students, teachers, subjects, allocations).
+
+A CSV or Excel file is read in chunks. For every chunk the importer:
+
+1. validates each column with the model field's own ``clean()`` (types,
+   choices, max length, validators) without a per-row ``full_clean()``;
+2. resolves every foreign key with one ``in_bulk`` per FK column;
+3. splits rows into inserts and updates with one pk lookup;
+4. writes them with ``bulk_create`` / ``bulk_update`` inside one transaction.
+
+Rows that fail are reported with their line number and do not stop the
+import. In dry-run mode nothing is written.
+"""
+import csv
+import io
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+
+from feedback_app import admin_schema
+from feedback_app import cache as feedback_cache
+from feedback_app import progress
+from feedback_app import student_auth
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - optional dependency
+    openpyxl = None
+
+DEFAULT_CHUNK_SIZE = 1000
+# Each chunk's pk and FK lookups send one parameter per row; SQL Server takes at most 2100
+MAX_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+TRUE_VALUES = {"true", "t", "yes", "y", "1"}
+FALSE_VALUES = {"false", "f", "no", "n", "0"}
+
+
+class ImportFormatError(ValueError):
+    """The file cannot be read as a roster for the target table."""
+
+
+# -------------------------------------
+# Readers: yield (line_number, {column: value})
+# -------------------------------------
+def read_csv(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_xlsx(binary_stream):
+    if openpyxl is None:
+        raise ImportFormatError("openpyxl is required to import Excel files")
+    workbook = openpyxl.load_workbook(binary_stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if not headers:
+            return
+        headers = [str(h).strip() if h is not None else "" for h in headers]
+        for line, values in enumerate(rows, start=2):
+            if values is None or all(v is None for v in values):
+                continue
+            yield line, dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def open_rows(fileobj, filename):
+    """Pick a reader from the file name; ``fileobj`` is a binary file object."""
+    name = (filename or "").lower()
+    if name.endswith((".xlsx", ".xlsm")):
+        return read_xlsx(fileobj)
+    if name.endswith(".xls"):
+        raise ImportFormatError("legacy .xls files are not supported, save as .xlsx or .csv")
+    return read_csv(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+
+
+def chunked(rows, size):
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# -------------------------------------
+# Importer
+# -------------------------------------
+class RosterImporter:
+    """Import rows into one admin table."""
+
+    def __init__(self, table_name, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        schema = admin_schema.get_schema(table_name)
+        if schema is None:
+            raise ImportFormatError(f"table '{table_name}' not found")
+        if schema.read_only:
+            raise ImportFormatError("This table is read-only")
+
+        self.model = schema.model
+        self.dry_run = dry_run
+        self.chunk_size = min(max(chunk_size, 1), MAX_CHUNK_SIZE)
+        self.fields = {f.name: f for f in self.model._meta.concrete_fields}
+        self.pk = self.model._meta.pk
+        self.pk_is_auto = isinstance(self.pk, admin_schema.AUTO_FIELD_TYPES)
+
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+        self._seen_pks = set()
+        self._cohorts = set()
+
+    def run(self, rows):
+        """Import an iterable of (line, row dict) and return the report."""
+        columns_checked = False
+        for chunk in chunked(rows, self.chunk_size):
+            if not columns_checked:
+                self._check_columns(chunk[0][1])
+                columns_checked = True
+            self._import_chunk(chunk)
+
+        if self._cohorts:
+            progress.refresh_cohorts(self._cohorts)
+        if self.created or self.updated:
+            feedback_cache.invalidate_for_model(self.model)
+        return self.report()
+
+    def report(self):
+        return {
+            "table": self.model._meta.db_table,
+            "dry_run": self.dry_run,
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+    def _check_columns(self, sample):
+        unknown = [c for c in sample if c and c not in self.fields]
+        if unknown:
+            raise ImportFormatError(f"unknown columns: {', '.join(unknown)}")
+        missing = [
+            name for name, f in self.fields.items()
+            if not f.blank and not f.has_default() and name not in sample
+            and not (f.primary_key and self.pk_is_auto)
+        ]
+        if missing:
+            raise ImportFormatError(f"missing required columns: {', '.join(missing)}")
+
+    def _fail(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": line, "errors": errors})
+
+    @staticmethod
+    def _normalize(field, value):
+        if isinstance(value, str):
+            value = value.strip()
+            if value == "":
+                return None
+            if isinstance(field, models.BooleanField):
+                lowered = value.lower()
+                if lowered in TRUE_VALUES:
+                    return True
+                if lowered in FALSE_VALUES:
+                    return False
+        return value
+
+    def _import_chunk(self, chunk):
+        self.rows += len(chunk)
+        lines = [line for line, _ in chunk]
+        errors = [dict() for _ in chunk]
+        present = [name for name in chunk[0][1] if name in self.fields]
+        values = {name: [None] * len(chunk) for name in present}
+
+        # 1. Column-wise validation with the model fields' own cleaning
+        for name in present:
+            field = self.fields[name]
+            column = values[name]
+            is_fk = field.is_relation
+            target = field.target_field if is_fk else field
+            for i, (_, row) in enumerate(chunk):
+                value = self._normalize(field, row.get(name))
+                if value is None:
+                    if field.primary_key and self.pk_is_auto:
+                        continue
+                    if not field.blank and not field.has_default():
+                        errors[i].setdefault(name, []).append("This field is required.")
+                    continue
+                try:
+                    column[i] = target.to_python(value) if is_fk else field.clean(value, None)
+                except ValidationError as e:
+                    errors[i].setdefault(name, []).extend(e.messages)
+
+        # 2. Foreign keys: one in_bulk per FK column
+        for name in present:
+            field = self.fields[name]
+            if not field.is_relation:
+                continue
+            wanted = {v for v in values[name] if v is not None}
+            existing = set(field.related_model.objects.in_bulk(wanted)) if wanted else set()
+            for i, v in enumerate(values[name]):
+                if v is not None and v not in existing and name not in errors[i]:
+                    errors[i].setdefault(name, []).append(f"Invalid ID {v} for field {name}")
+
+        # 3. Duplicate keys within the file
+        pk_values = values.get(self.pk.name, [None] * len(chunk))
+        for i, pk in enumerate(pk_values):
+            if pk is None or errors[i]:
+                continue
+            if pk in self._seen_pks:
+                errors[i].setdefault(self.pk.name, []).append("duplicate key in file")
+            else:
+                self._seen_pks.add(pk)
+
+        valid = [i for i in range(len(chunk)) if not errors[i]]
+        for i in range(len(chunk)):
+            if errors[i]:
+                self._fail(lines[i], errors[i])
+        if not valid:
+            return
+
+        # 4. Split into inserts and updates with one pk lookup
+        keyed = [pk_values[i] for i in valid if pk_values[i] is not None]
+        existing_pks = set(
+            self.model.objects.filter(pk__in=keyed).values_list("pk", flat=True)
+        ) if keyed else set()
+
+        creates, updates = [], []
+        for i in valid:
+            attrs = {}
+            for name in present:
+                field = self.fields[name]
+                if values[name][i] is None and field.has_default():
+                    continue
+                attrs[field.attname] = values[name][i]
+            obj = self.model(**attrs)
+            (updates if pk_values[i] is not None and pk_values[i] in existing_pks else creates).append(obj)
+
+        if self.dry_run:
+            self.created += len(creates)
+            self.updated += len(updates)
+            return
+
+        # Roster/allocation rows may move between cohorts: recount old and new ones at the end
+        self._cohorts |= progress.cohorts_of(self.model, [obj.pk for obj in updates])
+        self._cohorts |= progress.cohorts_of_objects(self.model, creates + updates)
+
+        update_fields = [
+            self.fields[name].attname for name in present if not self.fields[name].primary_key
+        ]
+        with transaction.atomic():
+            if creates:
+                self.model.objects.bulk_create(creates, batch_size=500)
+            if updates and update_fields:
+                self.model.objects.bulk_update(updates, update_fields, batch_size=500)
+        if updates:
+            student_auth.revoke_for_rows(self.model, [obj.pk for obj in updates])
+        self.created += len(creates)
+        self.updated += len(updates)
@@ -0,0 +1,219 @@
+"""
+Admin table search.
+
+Instead of OR-ing ``icontains`` over every column (a LIKE '%term%' scan per
+column), a search term becomes predicates that can use an index:
+
+* ``field:value`` - exact match on that column (``field:value*`` for a prefix)
+* a plain term    - exact match on key columns (pk, EnrollmentNo, TeacherID,
+                    SubjectCode, AllocationID ...), equality on integer columns
+                    when the term is numeric, and a range-based prefix match
+                    (``col >= 'ab' AND col < 'ac'``) on text columns.
+
+With ``FEEDBACK_SEARCH_NGRAM`` enabled, substring matches on FullName,
+SubjectName and Email are answered by a small in-process trigram index that
+returns matching pks. The index is (re)built by a background thread; until the
+first build finishes, or when a term matches more than ``NGRAM_MAX_PKS`` rows,
+the search falls back to the prefix predicates alone.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+
+from feedback_app import cache as feedback_cache
+
+TEXT_TYPES = ('CharField', 'TextField', 'EmailField')
+INTEGER_TYPES = (
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField', 'BigIntegerField',
+    'SmallIntegerField', 'PositiveIntegerField', 'PositiveSmallIntegerField',
+)
+
+# Columns that identify an entity and are matched exactly, never by prefix
+KEY_COLUMNS = ('EnrollmentNo', 'TeacherID', 'SubjectCode', 'AllocationID', 'ResponseID', 'LogID')
+
+NGRAM_COLUMNS = ('FullName', 'SubjectName', 'Email')
+NGRAM_SIZE = 3
+NGRAM_MAX_AGE = 300  # seconds; bounds staleness from writes made outside the app
+# Largest pk__in list sent to the database (SQL Server takes at most 2100 parameters)
+NGRAM_MAX_PKS = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with ``prefix`` (None if unbounded)."""
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+def prefix_q(column, prefix):
+    """Sargable prefix predicate; case-insensitive under SQL Server's default CI collation."""
+    upper = prefix_upper_bound(prefix)
+    q = Q(**{f"{column}__gte": prefix})
+    if upper is not None:
+        q &= Q(**{f"{column}__lt": upper})
+    return q
+
+
+def _columns(model):
+    """(name, attname, internal_type, is_key) for every concrete column."""
+    columns = []
+    for f in model._meta.concrete_fields:
+        target = f.target_field if f.is_relation else f
+        columns.append((
+            f.name,
+            f.attname,
+            target.get_internal_type(),
+            f.primary_key or f.is_relation or f.name in KEY_COLUMNS,
+        ))
+    return columns
+
+
+def _exact_value(internal_type, term):
+    """Term coerced to the column's type, or None when it cannot match."""
+    if internal_type in INTEGER_TYPES:
+        return int(term) if term.lstrip('-').isdigit() else None
+    if internal_type in TEXT_TYPES:
+        return term
+    return None
+
+
+def _typed_q(model, column_name, value):
+    for name, attname, internal_type, _ in _columns(model):
+        if column_name in (name, attname):
+            if value.endswith('*') and internal_type in TEXT_TYPES:
+                return prefix_q(attname, value[:-1])
+            exact = _exact_value(internal_type, value)
+            if exact is None:
+                return Q(pk__in=[])
+            return Q(**{attname: exact})
+    return None
+
+
+def build_search_q(model, term):
+    """Q object implementing the admin search for one term."""
+    term = term.strip()
+    if not term:
+        return Q()
+
+    if ':' in term:
+        column_name, value = term.split(':', 1)
+        q = _typed_q(model, column_name.strip(), value.strip())
+        if q is not None:
+            return q
+
+    q = Q(pk__in=[])
+    for name, attname, internal_type, is_key in _columns(model):
+        if internal_type in INTEGER_TYPES:
+            exact = _exact_value(internal_type, term)
+            if exact is not None:
+                q |= Q(**{attname: exact})
+        elif internal_type in TEXT_TYPES:
+            if is_key:
+                q |= Q(**{attname: term})
+            else:
+                q |= prefix_q(attname, term)
+
+    if getattr(settings, 'FEEDBACK_SEARCH_NGRAM', False):
+        pks = ngram_search(model, term)
+        if pks and len(pks) <= NGRAM_MAX_PKS:
+            q |= Q(pk__in=sorted(pks))
+
+    return q
+
+
+# -------------------------------------
+# In-process trigram index
+# -------------------------------------
+class NgramIndex:
+    """Trigram -> pks map over a model's name/email columns."""
+
+    def __init__(self, model, version):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.grams = {}
+        self.texts = {}
+
+        columns = [f.attname for f in model._meta.concrete_fields if f.name in NGRAM_COLUMNS]
+        for row in model.objects.values_list('pk', *columns).iterator(chunk_size=2000):
+            pk, values = row[0], row[1:]
+            text = " ".join(v for v in values if v).lower()
+            self.texts[pk] = text
+            for gram in self._grams(text):
+                self.grams.setdefault(gram, set()).add(pk)
+
+    @staticmethod
+    def _grams(text):
+        return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+    def search(self, term):
+        term = term.lower()
+        grams = self._grams(term)
+        if not grams:
+            return set()
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self.grams.get(g, ()))):
+            pks = self.grams.get(gram)
+            if not pks:
+                return set()
+            candidates = set(pks) if candidates is None else candidates & pks
+            if not candidates:
+                return set()
+        # Trigram overlap can give false positives; confirm the substring
+        return {pk for pk in candidates if term in self.texts[pk]}
+
+
+_indexes = {}
+_building = set()
+_lock = threading.Lock()
+
+
+def _rebuild(model, version):
+    try:
+        index = NgramIndex(model, version)
+        with _lock:
+            _indexes[model] = index
+    except Exception:
+        logger.exception("Building the search index of %s failed", model._meta.db_table)
+    finally:
+        with _lock:
+            _building.discard(model)
+
+
+def _spawn(target, *args):
+    """Run ``target`` in a daemon thread that closes its own DB connection."""
+    def run():
+        try:
+            target(*args)
+        finally:
+            connections.close_all()
+    threading.Thread(target=run, daemon=True, name="feedback-search-index").start()
+
+
+def ngram_search(model, term):
+    """
+    pks whose FullName/SubjectName/Email contains ``term`` (needs len(term) >= 3),
+    or None while the model has no index yet. A stale index keeps answering
+    while a background thread rebuilds it.
+    """
+    if len(term) < NGRAM_SIZE or not any(f.name in NGRAM_COLUMNS for f in model._meta.concrete_fields):
+        return set()
+
+    # Shared write counter, so writes handled by other workers also retire the index
+    version = feedback_cache.table_versions(model)
+    index = _indexes.get(model)
+    if index is None or index.version != version or time.monotonic() - index.built_at > NGRAM_MAX_AGE:
+        with _lock:
+            start = model not in _building
+            _building.add(model)
+        if start:
+            _spawn(_rebuild, model, version)
+    return index.search(term) if index is not None else None
@@ -1,8 +1,11 @@
-from rest_framework import serializers
-from django.utils import timezone
 from django import forms
 from datetime import date
 
+from feedback_app.rating_schema import (
+    ALLOCATION_ID_MESSAGES, COMMENTS_MAX_LENGTH, SUBJECT_CODE_MAX_LENGTH, SUBJECT_CODE_MESSAGES,
+    rating_form_field,
+)
+
 
 class LoginSerializer(forms.Form):
     REQUIRED_MSG = "email and dob is required"
@@ -38,47 +41,37 @@ class LoginSerializer(forms.Form):
             raise forms.ValidationError("Age must be at least 15 years.")
 
         return value
+
+
 class FeedbackSerializer(forms.Form):
+    """
+    Form version of the submission rules in ``rating_schema``. The submit
+    views use ``rating_schema.validate_feedback()``, which returns the same errors.
+    """
 
     subject_code = forms.CharField(
         required=True,
-        max_length=50,
-        error_messages={
-            'required': 'subject_code is required',
-            'max_length': 'subject_code must be at most 50 characters'
-        }
+        max_length=SUBJECT_CODE_MAX_LENGTH,
+        error_messages=SUBJECT_CODE_MESSAGES
     )
 
     allocation_id = forms.IntegerField(
         required=True,
-        error_messages={
-            'required': 'allocation_id is required',
-            'invalid': 'allocation_id must be an integer'
-        }
+        error_messages=ALLOCATION_ID_MESSAGES
     )
 
-    q1 = forms.IntegerField(min_value=1, max_value=5, required=True,
-        error_messages={"required": "q1 is required", "min_value": "rating must be 1–5", "max_value": "rating must be 1–5"})
-    q2 = forms.IntegerField(min_value=1, max_value=5, required=True,
-        error_messages={"required": "q2 is required", "min_value": "rating must be 1–5", "max_value": "rating must be 1–5"})
-    q3 = forms.IntegerField(min_value=1, max_value=5, required=True,
-        error_messages={"required": "q3 is required", "min_value": "rating must be 1–5", "max_value": "rating must be 1–5"})
-    q4 = forms.IntegerField(min_value=1, max_value=5, required=True,
-        error_messages={"required": "q4 is required", "min_value": "rating must be 1–5", "max_value": "rating must be 1–5"})
-    q5 = forms.IntegerField(min_value=1, max_value=5, required=True,
-        error_messages={"required": "q5 is required", "min_value": "rating must be 1–5", "max_value": "rating must be 1–5"})
-    q6 = forms.IntegerField(min_value=1, max_value=5, required=True,
-        error_messages={"required": "q6 is required", "min_value": "rating must be 1–5", "max_value": "rating must be 1–5"})
-    q7 = forms.IntegerField(min_value=1, max_value=5, required=True,
-        error_messages={"required": "q7 is required", "min_value": "rating must be 1–5", "max_value": "rating must be 1–5"})
-    q8 = forms.IntegerField(min_value=1, max_value=5, required=True,
-        error_messages={"required": "q8 is required", "min_value": "rating must be 1–5", "max_value": "rating must be 1–5"})
-    q9 = forms.IntegerField(min_value=1, max_value=5, required=True,
-        error_messages={"required": "q9 is required", "min_value": "rating must be 1–5", "max_value": "rating must be 1–5"})
-    q10 = forms.IntegerField(min_value=1, max_value=5, required=True,
-        error_messages={"required": "q10 is required", "min_value": "rating must be 1–5", "max_value": "rating must be 1–5"})
-
-    comments = forms.CharField(required=False, max_length=500)
+    q1 = rating_form_field("q1")
+    q2 = rating_form_field("q2")
+    q3 = rating_form_field("q3")
+    q4 = rating_form_field("q4")
+    q5 = rating_form_field("q5")
+    q6 = rating_form_field("q6")
+    q7 = rating_form_field("q7")
+    q8 = rating_form_field("q8")
+    q9 = rating_form_field("q9")
+    q10 = rating_form_field("q10")
+
+    comments = forms.CharField(required=False, max_length=COMMENTS_MAX_LENGTH)
 
     # --- Cleaners ---
     def clean_subject_code(self):
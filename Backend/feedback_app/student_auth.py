@@ -0,0 +1,338 @@
+"""
+Student authentication for the API views.
+
+Two modes, picked with ``FEEDBACK_AUTH_MODE``:
+
+* ``session`` (default) - the Django session set by ``login``.
+* ``token``  - a signed, expiring token issued by ``login`` as an HttpOnly
+  cookie (and in the response body for ``Authorization: Bearer`` clients).
+  It carries the EnrollmentNo and the cohort (Branch/Year/Semester/Section),
+  so authorizing a request reads neither ``django_session`` nor
+  ``Users_Student``.
+
+Tokens are revoked through a deny-list: single tokens by id (logout) and all
+tokens of a student issued before a point in time (admin edits, deactivation,
+deletion). Entries expire together with the tokens they cover, so the list
+stays small. The list must be seen by every server process and must never
+drop a live entry, so it is kept in the Feedback_TokenRevocation table.
+Requests are checked against an in-process snapshot of that table, which is
+reloaded when the table's shared write counter moves; the counter is read at
+most every FEEDBACK_TOKEN_DENY_SNAPSHOT_TTL seconds, which bounds how late a
+revocation made by another process is enforced here.
+FEEDBACK_TOKEN_REVOCATION_CACHE can name a shared cache alias instead (e.g.
+Redis without eviction); a per-process LocMem or dummy cache is refused at
+startup.
+"""
+import time
+import uuid
+from datetime import timedelta
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from feedback_app import cache as feedback_cache
+from feedback_app.models.feedback_tokenrevocation import Feedback_TokenRevocation
+from feedback_app.models.users_student import Users_Student
+
+TOKEN_SALT = "feedback_app.student_token"
+DEFAULT_TOKEN_MAX_AGE = 24 * 3600
+DEFAULT_DENY_SNAPSHOT_TTL = 5  # seconds
+
+
+class StudentIdentity(NamedTuple):
+    """Who is calling; the cohort fields are None when the session only knows the EnrollmentNo."""
+    enrollment_no: str
+    branch: Optional[str] = None
+    year: Optional[int] = None
+    semester: Optional[int] = None
+    section: Optional[int] = None
+    token_id: Optional[str] = None
+    issued_at: Optional[int] = None  # milliseconds since the epoch
+
+    @property
+    def has_cohort(self):
+        return None not in (self.branch, self.year, self.semester, self.section)
+
+
+def token_mode():
+    return getattr(settings, "FEEDBACK_AUTH_MODE", "session") == "token"
+
+
+def token_max_age():
+    return getattr(settings, "FEEDBACK_TOKEN_MAX_AGE", DEFAULT_TOKEN_MAX_AGE)
+
+
+def cookie_name():
+    return getattr(settings, "FEEDBACK_TOKEN_COOKIE", "feedback_token")
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+# -------------------------------------
+# Deny-list store
+# -------------------------------------
+class DatabaseDenyList:
+    """
+    Deny-list in Feedback_TokenRevocation, with the cache methods the checks use.
+
+    Lookups are answered from a snapshot of the live rows. Once the snapshot is
+    older than FEEDBACK_TOKEN_DENY_SNAPSHOT_TTL, the next lookup reads the
+    table's write counter (one primary-key lookup) and reloads the rows only if
+    it moved. Revocations made by this process enter the snapshot at once.
+    """
+
+    BATCH_SIZE = 500  # keys per statement, well under SQL Server's parameter limit
+
+    def __init__(self):
+        self._entries = {}  # key -> (value, expiry as epoch seconds)
+        self._version = None
+        self._checked_at = float("-inf")
+
+    def _is_fresh(self):
+        ttl = getattr(settings, "FEEDBACK_TOKEN_DENY_SNAPSHOT_TTL", DEFAULT_DENY_SNAPSHOT_TTL)
+        return time.monotonic() - self._checked_at < ttl
+
+    @staticmethod
+    def _live_rows():
+        return Feedback_TokenRevocation.objects.filter(ExpiresAt__gt=timezone.now()) \
+            .values_list("Key", "Value", "ExpiresAt")
+
+    def _install(self, version, rows):
+        if version != self._version:
+            self._entries = {key: (value, expires_at.timestamp()) for key, value, expires_at in rows}
+            self._version = version
+        self._checked_at = time.monotonic()
+
+    def _lookup(self, keys):
+        now = time.time()
+        found = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                found[key] = entry[0]
+        return found
+
+    def get_many(self, keys):
+        if not self._is_fresh():
+            # Counter first: a write landing in between only causes one more reload
+            version = feedback_cache.table_versions(Feedback_TokenRevocation)
+            self._install(version, self._live_rows() if version != self._version else ())
+        return self._lookup(keys)
+
+    async def aget_many(self, keys):
+        if not self._is_fresh():
+            version = await feedback_cache.atable_versions(Feedback_TokenRevocation)
+            rows = [row async for row in self._live_rows()] if version != self._version else ()
+            self._install(version, rows)
+        return self._lookup(keys)
+
+    def set(self, key, value, timeout):
+        self.set_many({key: value}, timeout)
+
+    def set_many(self, entries, timeout):
+        """Replace the entries; expired rows are dropped in the same transaction."""
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=timeout)
+        items = list(entries.items())
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    Feedback_TokenRevocation.objects.filter(ExpiresAt__lte=now).delete()
+                    for start in range(0, len(items), self.BATCH_SIZE):
+                        batch = dict(items[start:start + self.BATCH_SIZE])
+                        Feedback_TokenRevocation.objects.filter(Key__in=batch).delete()
+                        Feedback_TokenRevocation.objects.bulk_create([
+                            Feedback_TokenRevocation(Key=key, Value=value, ExpiresAt=expires_at)
+                            for key, value in batch.items()
+                        ])
+                    feedback_cache.bump_table_versions(Feedback_TokenRevocation)
+                break
+            except IntegrityError:
+                # A concurrent revocation inserted one of the keys first
+                if attempt:
+                    raise
+        self._entries = {
+            **self._entries,
+            **{key: (value, expires_at.timestamp()) for key, value in items},
+        }
+
+
+_database_deny_list = DatabaseDenyList()
+
+
+def _deny_cache():
+    alias = getattr(settings, "FEEDBACK_TOKEN_REVOCATION_CACHE", None)
+    return caches[alias] if alias else _database_deny_list
+
+
+def check_revocation_store():
+    """Refuse token mode when revocations would live in a per-process or dummy cache."""
+    alias = getattr(settings, "FEEDBACK_TOKEN_REVOCATION_CACHE", None)
+    if not token_mode() or not alias:
+        return
+    if alias not in settings.CACHES:
+        raise ImproperlyConfigured(f"FEEDBACK_TOKEN_REVOCATION_CACHE names an unknown cache alias '{alias}'")
+    if isinstance(caches[alias], (LocMemCache, DummyCache)):
+        raise ImproperlyConfigured(
+            f"FEEDBACK_AUTH_MODE=token needs a shared, non-evicting revocation store; cache '{alias}' "
+            f"is {type(caches[alias]).__name__}. Use a shared backend or leave "
+            "FEEDBACK_TOKEN_REVOCATION_CACHE unset for the database table."
+        )
+
+
+# -------------------------------------
+# Tokens
+# -------------------------------------
+def issue_token(student):
+    """Signed token for a Users_Student (or any object with its cohort attributes)."""
+    payload = {
+        "e": student.EnrollmentNo,
+        "c": [student.Branch, student.Year, student.Semester, student.Section],
+        "j": uuid.uuid4().hex,
+        "t": _now_ms(),
+    }
+    return signing.dumps(payload, salt=TOKEN_SALT, compress=True)
+
+
+def _decode(token):
+    """StudentIdentity from a token's signed payload, or None if it is invalid or expired."""
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT, max_age=token_max_age())
+        branch, year, semester, section = payload["c"]
+        return StudentIdentity(payload["e"], branch, year, semester, section, payload["j"], payload["t"])
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+def _deny_keys(identity):
+    return f"token-deny:{identity.token_id}", f"token-nbf:{identity.enrollment_no}"
+
+
+def _is_denied(identity, denied):
+    deny_key, nbf_key = _deny_keys(identity)
+    if deny_key in denied:
+        return True
+    not_before = denied.get(nbf_key)
+    return not_before is not None and identity.issued_at <= not_before
+
+
+def read_token(token):
+    """StudentIdentity for a valid, unexpired and not revoked token, else None."""
+    identity = _decode(token)
+    if identity is None or _is_denied(identity, _deny_cache().get_many(_deny_keys(identity))):
+        return None
+    return identity
+
+
+async def aread_token(token):
+    identity = _decode(token)
+    if identity is None or _is_denied(identity, await _deny_cache().aget_many(_deny_keys(identity))):
+        return None
+    return identity
+
+
+def revoke_token(identity):
+    """Deny one token until it would have expired anyway."""
+    if not identity or not identity.token_id:
+        return
+    remaining = int(identity.issued_at / 1000 + token_max_age() - time.time())
+    if remaining > 0:
+        _deny_cache().set(f"token-deny:{identity.token_id}", 1, remaining)
+
+
+def revoke_students(enrollment_nos):
+    """Deny every token issued so far to these students (their row changed or was deleted)."""
+    if not token_mode():
+        return
+    now = _now_ms()
+    entries = {f"token-nbf:{pk}": now for pk in enrollment_nos}
+    if entries:
+        _deny_cache().set_many(entries, token_max_age())
+
+
+def revoke_for_rows(model, pks):
+    """Admin write hook: revoke tokens of students whose rows were updated or deleted."""
+    if model is Users_Student:
+        revoke_students(pks)
+
+
+def set_token_cookie(response, token):
+    response.set_cookie(
+        cookie_name(),
+        token,
+        max_age=token_max_age(),
+        path=settings.SESSION_COOKIE_PATH,
+        domain=settings.SESSION_COOKIE_DOMAIN,
+        secure=settings.SESSION_COOKIE_SECURE or None,
+        httponly=True,
+        samesite=settings.SESSION_COOKIE_SAMESITE,
+    )
+
+
+# -------------------------------------
+# Requests
+# -------------------------------------
+def _request_token(request):
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    if header.startswith("Bearer "):
+        return header[7:].strip()
+    return request.COOKIES.get(cookie_name())
+
+
+def authenticate(request):
+    """StudentIdentity for the request, or None when it is not authenticated."""
+    if token_mode():
+        token = _request_token(request)
+        return read_token(token) if token else None
+
+    if not request.session.get("is_authenticated"):
+        return None
+    enrollment_no = request.session.get("user_enrollment")
+    return StudentIdentity(enrollment_no) if enrollment_no else None
+
+
+async def aauthenticate(request):
+    """Async variant of ``authenticate`` for async views."""
+    if token_mode():
+        token = _request_token(request)
+        return await aread_token(token) if token else None
+
+    if not await request.session.aget("is_authenticated"):
+        return None
+    enrollment_no = await request.session.aget("user_enrollment")
+    return StudentIdentity(enrollment_no) if enrollment_no else None
+
+
+def with_cohort(identity):
+    """The identity with its cohort filled in (one Users_Student query if needed), or None if the student is gone."""
+    if identity.has_cohort:
+        return identity
+    try:
+        branch, year, semester, section = Users_Student.objects.values_list(
+            "Branch", "Year", "Semester", "Section"
+        ).get(EnrollmentNo=identity.enrollment_no)
+    except Users_Student.DoesNotExist:
+        return None
+    return identity._replace(branch=branch, year=year, semester=semester, section=section)
+
+
+async def awith_cohort(identity):
+    """Async variant of ``with_cohort``."""
+    if identity.has_cohort:
+        return identity
+    try:
+        branch, year, semester, section = await Users_Student.objects.values_list(
+            "Branch", "Year", "Semester", "Section"
+        ).aget(EnrollmentNo=identity.enrollment_no)
+    except Users_Student.DoesNotExist:
+        return None
+    return identity._replace(branch=branch, year=year, semester=semester, section=section)
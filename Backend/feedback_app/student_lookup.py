@@ -0,0 +1,137 @@
+"""
+Student lookup for login.
+
+``Email__iexact`` compiles to ``UPPER(Email) = UPPER(%s)`` on SQL Server, which
+cannot seek an index. Login instead resolves the normalized e-mail to an
+EnrollmentNo through an in-process map and then fetches the student by primary
+key. The map is rebuilt when the shared Users_Student write counter changes
+(admin writes and roster imports, in any worker) or after EMAIL_INDEX_MAX_AGE
+seconds.
+
+Rebuilds run on a background thread, never inside a login: until the new map
+is swapped in, logins keep using the old one (every hit is checked against the
+fetched row) and anything missing falls back to the case-insensitive query.
+The first map is built when the server starts (see ``warm()``).
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from feedback_app import cache as feedback_cache
+from feedback_app.models.users_student import Users_Student
+
+# Columns login needs (the cohort goes into stateless tokens); nothing else is loaded
+LOGIN_FIELDS = (
+    "EnrollmentNo", "FullName", "Email", "IsActive", "DateOfBirth",
+    "Branch", "Year", "Semester", "Section",
+)
+
+EMAIL_INDEX_MAX_AGE = 300  # seconds; bounds staleness from writes made outside the app
+EMAIL_INDEX_RETRY = 30     # seconds before a failed rebuild is tried again
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+class EmailIndex:
+    """normalized e-mail -> EnrollmentNo for every student."""
+
+    def __init__(self, version):
+        self.version = version
+        self.built_at = time.monotonic()
+        self.pks = {
+            normalize_email(email): pk
+            for pk, email in Users_Student.objects.values_list("pk", "Email").iterator(chunk_size=2000)
+            if email
+        }
+
+    def is_current(self, version):
+        return self.version == version and time.monotonic() - self.built_at <= EMAIL_INDEX_MAX_AGE
+
+
+_index = None
+_building = False
+_retry_at = 0.0
+_lock = threading.Lock()
+
+
+def _current_version():
+    """Shared write counter of Users_Student (one primary-key lookup), as for the allocation tree."""
+    return feedback_cache.table_versions(Users_Student)
+
+
+def _build(version):
+    global _index, _building, _retry_at
+    try:
+        if version is None:
+            version = _current_version()
+        _index = EmailIndex(version)
+    except Exception:
+        logger.exception("login e-mail index rebuild failed")
+        _retry_at = time.monotonic() + EMAIL_INDEX_RETRY
+    finally:
+        _building = False
+
+
+def _spawn(target, *args):
+    """Run ``target`` in a daemon thread that closes its own DB connection."""
+    def run():
+        try:
+            target(*args)
+        finally:
+            connections.close_all()
+    threading.Thread(target=run, name="login-email-index", daemon=True).start()
+
+
+def refresh_in_background(version=None):
+    """Start rebuilding the index on a background thread unless a rebuild is running or backing off."""
+    global _building
+    with _lock:
+        if _building or time.monotonic() < _retry_at:
+            return False
+        _building = True
+    # Without a version (server start) the thread reads it, keeping queries out of app loading
+    _spawn(_build, version)
+    return True
+
+
+def warm():
+    """Build the first index at server start so early logins do not all fall back."""
+    if getattr(settings, "FEEDBACK_LOGIN_EMAIL_INDEX", True):
+        refresh_in_background()
+
+
+def get_email_index():
+    """The current index (possibly stale, None before the first build); schedules a rebuild when due."""
+    version = _current_version()
+    index = _index
+    if index is None or not index.is_current(version):
+        refresh_in_background(version)
+    return index
+
+
+def find_student(email):
+    """Users_Student with the given e-mail (case-insensitive), loaded with LOGIN_FIELDS only, or None."""
+    key = normalize_email(email)
+    students = Users_Student.objects.only(*LOGIN_FIELDS)
+
+    index = None
+    if getattr(settings, "FEEDBACK_LOGIN_EMAIL_INDEX", True):
+        index = get_email_index()
+        pk = index.pks.get(key) if index is not None else None
+        if pk is not None:
+            student = students.filter(pk=pk).first()
+            # The entry can be stale if the e-mail was changed by another process
+            if student is not None and normalize_email(student.Email) == key:
+                return student
+
+    student = students.filter(Email__iexact=key).first()
+    if student is not None and index is not None:
+        index.pks[key] = student.pk
+    return student
@@ -0,0 +1,83 @@
+"""
+Write path for student feedback.
+
+Rows are written as (Feedback_Response, Feedback_SubmissionLog) pairs. Entries
+are plain ids + rating dicts so any caller (single submit, batch submit) can use
+the same batched insert.
+"""
+from django.db import connection, transaction
+
+from feedback_app.models.feedback_allocationprogress import Feedback_AllocationProgress
+from feedback_app.models.feedback_cohortprogress import Feedback_CohortProgress
+from feedback_app.models.feedback_ratingrollup import Feedback_RatingRollup
+from feedback_app.models.feedback_response import Feedback_Response
+from feedback_app.models.feedback_submissionlog import Feedback_SubmissionLog
+from feedback_app import live_feed
+from feedback_app import progress
+from feedback_app import rollup
+from feedback_app.cache import bump_table_versions, touch_tables
+
+
+def build_response(allocation_id, ratings, comments=None):
+    """Unsaved Feedback_Response for an allocation and a q1..q10 ratings dict."""
+    return Feedback_Response(
+        AllocationID_id=allocation_id,
+        Q1_Rating=ratings["q1"],
+        Q2_Rating=ratings["q2"],
+        Q3_Rating=ratings["q3"],
+        Q4_Rating=ratings["q4"],
+        Q5_Rating=ratings["q5"],
+        Q6_Rating=ratings["q6"],
+        Q7_Rating=ratings["q7"],
+        Q8_Rating=ratings["q8"],
+        Q9_Rating=ratings["q9"],
+        Q10_Rating=ratings["q10"],
+        Comments=comments or None
+    )
+
+
+def write_submissions(entries):
+    """
+    Insert feedback for a list of entries in one transaction.
+
+    Each entry is a dict with ``enrollment_no``, ``allocation_id``, ``ratings``
+    and ``comments``. Returns the created Feedback_SubmissionLog rows in entry
+    order. Callers are responsible for validation and duplicate checks.
+    """
+    if not entries:
+        return []
+
+    responses = [
+        build_response(e["allocation_id"], e["ratings"], e.get("comments"))
+        for e in entries
+    ]
+
+    with transaction.atomic():
+        if connection.features.can_return_rows_from_bulk_insert:
+            Feedback_Response.objects.bulk_create(responses)
+        else:
+            # Backend cannot hand back identity values from a bulk insert
+            for resp in responses:
+                resp.save()
+
+        logs = Feedback_SubmissionLog.objects.bulk_create([
+            Feedback_SubmissionLog(
+                ResponseID_id=resp.ResponseID,
+                EnrollmentNo_id=e["enrollment_no"],
+                AllocationID_id=e["allocation_id"]
+            )
+            for e, resp in zip(entries, responses)
+        ])
+
+        rollup.apply_responses(responses)
+        progress.record_submissions((e["enrollment_no"], e["allocation_id"]) for e in entries)
+        touch_tables(Feedback_Response, Feedback_SubmissionLog)
+        # Shared write counters of every table the submission changed (admin table ETags);
+        # bumped last so the counter rows stay locked only until the commit
+        bump_table_versions(
+            Feedback_Response, Feedback_SubmissionLog,
+            Feedback_RatingRollup, Feedback_CohortProgress, Feedback_AllocationProgress
+        )
+        live_feed.publish_on_commit((e["allocation_id"], e["ratings"]) for e in entries)
+
+    return logs
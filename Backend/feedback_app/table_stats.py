@@ -0,0 +1,96 @@
+"""
+Row counts for the admin tables.
+
+On SQL Server the estimate comes from partition statistics, which is a
+metadata lookup instead of a full COUNT(*) scan. Other backends fall back
+to an exact count. Counts for all tables are fetched in one round trip and
+cached briefly in the ``feedback`` cache.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from feedback_app import cache as feedback_cache
+
+PARTITION_ROWS_SQL = """
+SELECT SUM(row_count)
+FROM sys.dm_db_partition_stats
+WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)
+"""
+
+ALL_PARTITION_ROWS_SQL = """
+SELECT OBJECT_NAME(object_id), SUM(row_count)
+FROM sys.dm_db_partition_stats
+WHERE index_id IN (0, 1) AND object_id IN ({placeholders})
+GROUP BY object_id
+"""
+
+TABLE_COUNTS = "table-counts"
+
+
+def supports_estimates():
+    return connection.vendor == "microsoft"
+
+
+def estimated_row_count(model):
+    """Approximate number of rows in the model's table."""
+    if not supports_estimates():
+        return model.objects.count()
+    with connection.cursor() as cur:
+        cur.execute(PARTITION_ROWS_SQL, [model._meta.db_table])
+        row = cur.fetchone()
+    return int(row[0] or 0) if row else 0
+
+
+def _exact_counts(models):
+    """COUNT(*) of every table in a single UNION ALL statement."""
+    qn = connection.ops.quote_name
+    sql = " UNION ALL ".join(
+        f"SELECT {i}, COUNT(*) FROM {qn(model._meta.db_table)}" for i, model in enumerate(models)
+    )
+    with connection.cursor() as cur:
+        cur.execute(sql)
+        rows = dict(cur.fetchall())
+    return {model._meta.db_table: int(rows.get(i, 0)) for i, model in enumerate(models)}
+
+
+def _estimated_counts(models):
+    """Row counts of every table from partition statistics in a single query."""
+    tables = [model._meta.db_table for model in models]
+    sql = ALL_PARTITION_ROWS_SQL.format(placeholders=", ".join(["OBJECT_ID(%s)"] * len(tables)))
+    with connection.cursor() as cur:
+        cur.execute(sql, tables)
+        counts = {name.lower(): count for name, count in cur.fetchall()}
+    return {table: int(counts.get(table.lower()) or 0) for table in tables}
+
+
+def row_counts(models, exact=False):
+    """
+    ({db_table: row count}, is_estimate) for the given models.
+
+    Exact counts are always computed on request. Otherwise counts come from
+    partition statistics (SQL Server) or one UNION ALL of COUNT(*) (other
+    backends) and are cached for FEEDBACK_TABLE_STATS_TTL seconds.
+    """
+    models = list(models)
+    if not models:
+        return {}, False
+    if exact:
+        return _exact_counts(models), False
+
+    estimate = supports_estimates()
+    # The table list is hashed so the key stays within memcached's 250 characters
+    tables = ",".join(sorted(m._meta.db_table for m in models))
+    key = "{}:{}:{}".format(
+        TABLE_COUNTS,
+        feedback_cache.get_version(TABLE_COUNTS),
+        hashlib.sha1(tables.encode()).hexdigest(),
+    )
+    cache = caches[feedback_cache.CACHE_ALIAS]
+    counts = cache.get(key)
+    if counts is None:
+        counts = _estimated_counts(models) if estimate else _exact_counts(models)
+        cache.set(key, counts, getattr(settings, "FEEDBACK_TABLE_STATS_TTL", 30))
+    return counts, estimate
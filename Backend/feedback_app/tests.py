@@ -1,3 +1,1772 @@
-from django.test import TestCase
+"""
+Tests for the feedback app.
 
-# Create your tests here.
+The main settings point at SQL Server; run these on SQLite with
+
+    python manage.py test feedback_app --settings=feedbacksystem.settings_bench
+
+The college tables are unmanaged, so ``setUpModule`` creates them in the
+test database.
+"""
+import csv
+import datetime
+import decimal
+import io
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import warnings
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import OperationalError, connection
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.forms.utils import ErrorList
+from django.http import JsonResponse as DjangoJsonResponse
+from django.test import AsyncClient, Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+from feedback_app import cache as feedback_cache
+from feedback_app import (
+    admin_schema, analytics, benchmark, conditional, instrumentation, live_feed, pagination, progress, rating_schema,
+    responses, roster_import, rollup, search, student_auth, student_lookup, table_stats,
+)
+from feedback_app.apps import server_started
+from feedback_app.db import pool as db_pool
+from feedback_app.middleware import CsrfExemptMiddleware
+from feedback_app.models import (
+    Academic_Allocation, Academic_Subject, Faculty_Teacher, Feedback_AllocationProgress, Feedback_CohortProgress,
+    Feedback_RatingRollup, Feedback_SubmissionLog, Feedback_TokenRevocation, Users_Student,
+)
+from feedback_app.serializers import FeedbackSerializer
+from feedback_app.submissions import write_submissions
+from feedback_app.write_behind import SubmissionQueue
+from feedbacksystem import startup_profile
+
+
+def setUpModule():
+    existing = set(connection.introspection.table_names())
+    with connection.schema_editor() as editor:
+        for model in apps.get_app_config("feedback_app").get_models():
+            if not model._meta.managed and model._meta.db_table not in existing:
+                editor.create_model(model)
+
+
+def ratings(value=4, **overrides):
+    return {**{key: value for key in rating_schema.RATING_KEYS}, **overrides}
+
+
+class CollegeTestCase(TestCase):
+    """One CSE section (year 2, semester 3) with two subjects taught by two teachers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        teachers = [
+            Faculty_Teacher.objects.create(TeacherID=f"T{i}", FullName=f"Teacher {i}", Designation="Professor")
+            for i in (1, 2)
+        ]
+        subjects = [
+            Academic_Subject.objects.create(
+                SubjectCode=f"CS10{i}", SubjectName=f"Subject {i}", Semester=3, Branch="CSE",
+            )
+            for i in (1, 2)
+        ]
+        cls.allocations = [
+            Academic_Allocation.objects.create(
+                TeacherID=teacher, SubjectCode=subject,
+                TargetBranch="CSE", Target_Year=2, Target_Semester=3, Target_Section=1,
+            )
+            for teacher, subject in zip(teachers, subjects)
+        ]
+        cls.students = [
+            Users_Student.objects.create(
+                EnrollmentNo=f"0827CS{i:04d}", FullName=f"Student {i}", Gender="F",
+                Email=f"student{i}@acropolis.in", Branch="CSE", Year=2, Semester=3, Section=1,
+                DateOfBirth=datetime.date(2004, 1, 1),
+            )
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        caches[feedback_cache.CACHE_ALIAS].clear()
+
+    def submit(self, student, allocation, value=4):
+        return write_submissions([{
+            "enrollment_no": student.EnrollmentNo,
+            "allocation_id": allocation.AllocationID,
+            "ratings": ratings(value),
+            "comments": None,
+        }])
+
+    def student_client(self, student):
+        client = Client()
+        session = client.session
+        session["is_authenticated"] = True
+        session["user_enrollment"] = student.EnrollmentNo
+        session.save()
+        return client
+
+    def post_json(self, client, path, data):
+        return client.post(path, json.dumps(data), content_type="application/json")
+
+    def token_client(self, student):
+        return Client(HTTP_AUTHORIZATION=f"Bearer {student_auth.issue_token(student)}")
+
+    def admin_client(self):
+        client = Client()
+        session = client.session
+        session["is_admin"] = True
+        session.save()
+        return client
+
+
+# -------------------------------------
+# Allocation tree cache
+# -------------------------------------
+class AllocationTreeCacheTests(CollegeTestCase):
+
+    def teacher_names(self, client):
+        response = client.get("/my-teachers/")
+        self.assertEqual(response.status_code, 200)
+        return [t["teacher_name"] for subject in response.json()["subjects"] for t in subject["teachers"]]
+
+    def allocation_queries(self, client):
+        table = f'FROM "{Academic_Allocation._meta.db_table}"'
+        with CaptureQueriesContext(connection) as queries:
+            self.teacher_names(client)
+        return [q for q in queries.captured_queries if table in q["sql"]]
+
+    def test_tree_is_shared_by_the_section(self):
+        self.assertTrue(self.allocation_queries(self.student_client(self.students[0])))
+        self.assertEqual(self.allocation_queries(self.student_client(self.students[1])), [])
+        self.assertEqual(self.teacher_names(self.student_client(self.students[1])), ["Teacher 1", "Teacher 2"])
+
+    def test_submitted_flag_is_per_student(self):
+        self.submit(self.students[0], self.allocations[0])
+        response = self.student_client(self.students[0]).get("/my-teachers/").json()
+        flags = {t["allocation_id"]: t["is_submitted"] for s in response["subjects"] for t in s["teachers"]}
+        self.assertEqual(flags, {self.allocations[0].AllocationID: True, self.allocations[1].AllocationID: False})
+
+        other = self.student_client(self.students[1]).get("/my-teachers/").json()
+        self.assertFalse(any(t["is_submitted"] for s in other["subjects"] for t in s["teachers"]))
+
+    def test_admin_edit_invalidates_the_tree(self):
+        client = self.student_client(self.students[0])
+        self.teacher_names(client)
+
+        response = self.admin_client().post(
+            "/dashboard-admin/table/Faculty_Teacher/T1/update/",
+            json.dumps({"FullName": "Renamed"}), content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.teacher_names(client), ["Renamed", "Teacher 2"])
+
+    def test_other_sections_do_not_see_the_tree(self):
+        student = self.students[0]
+        Users_Student.objects.filter(pk=student.pk).update(Section=2)
+        response = self.student_client(student).get("/my-teachers/")
+        self.assertEqual(response.json()["subjects"], [])
+
+
+# -------------------------------------
+# Feedback submission
+# -------------------------------------
+class SubmitFeedbackTests(CollegeTestCase):
+
+    def item(self, allocation, **overrides):
+        return {
+            "allocation_id": allocation.AllocationID,
+            "subject_code": allocation.SubjectCode_id.lower(),
+            **ratings(),
+            "comments": "good",
+            **overrides,
+        }
+
+    def test_batch_reports_a_status_per_item(self):
+        other_section = Academic_Allocation.objects.create(
+            TeacherID_id="T1", SubjectCode_id="CS101",
+            TargetBranch="CSE", Target_Year=2, Target_Semester=3, Target_Section=2,
+        )
+        first, second = self.allocations
+        items = [
+            self.item(first),
+            self.item(first),
+            self.item(second, q3=9),
+            self.item(second, allocation_id=99999),
+            self.item(second, subject_code="CS101"),
+            self.item(other_section),
+            "not an object",
+        ]
+
+        client = self.student_client(self.students[0])
+        response = self.post_json(client, "/submit-feedback/batch/", {"feedbacks": items})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["submitted"], body["failed"]), (1, 6))
+        results = body["results"]
+        self.assertEqual([r["index"] for r in results], list(range(len(items))))
+        self.assertEqual(results[0]["status"], "ok")
+        self.assertEqual((results[1]["error"], results[1]["code"]), ("feedback already submitted", 409))
+        self.assertEqual(results[2]["errors"], {"q3": [rating_schema.RATING_MESSAGE]})
+        self.assertEqual(results[3]["code"], 404)
+        self.assertEqual((results[4]["error"], results[4]["code"]), ("subject mismatch for allocation_id", 403))
+        self.assertEqual(
+            (results[5]["error"], results[5]["code"]), ("allocation_id does not belong to logged-in student", 403)
+        )
+        self.assertEqual(results[6]["error"], "item must be an object")
+
+        self.assertEqual(
+            list(Feedback_SubmissionLog.objects.values_list("EnrollmentNo", "AllocationID")),
+            [(self.students[0].EnrollmentNo, first.AllocationID)],
+        )
+        self.assertEqual(Feedback_RatingRollup.objects.get(AllocationID=first).ResponseCount, 1)
+
+    def test_batch_rejects_earlier_submissions(self):
+        client = self.student_client(self.students[0])
+        self.submit(self.students[0], self.allocations[0])
+
+        body = self.post_json(client, "/submit-feedback/batch/", [self.item(a) for a in self.allocations]).json()
+
+        self.assertEqual([r["status"] for r in body["results"]], ["error", "ok"])
+        self.assertEqual(Feedback_SubmissionLog.objects.count(), 2)
+
+    def test_batch_size_and_shape_are_checked(self):
+        client = self.student_client(self.students[0])
+        self.assertEqual(self.post_json(client, "/submit-feedback/batch/", {"feedbacks": []}).status_code, 400)
+        too_many = [self.item(self.allocations[0])] * 51
+        self.assertEqual(self.post_json(client, "/submit-feedback/batch/", too_many).status_code, 400)
+        self.assertFalse(Feedback_SubmissionLog.objects.exists())
+
+    def test_single_submit_shares_the_write_path(self):
+        client = self.student_client(self.students[0])
+        response = self.post_json(client, "/submit-feedback/", self.item(self.allocations[0]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Feedback_RatingRollup.objects.get(AllocationID=self.allocations[0]).ResponseCount, 1)
+
+        response = self.post_json(client, "/submit-feedback/", self.item(self.allocations[0]))
+        self.assertEqual(response.status_code, 409)
+
+
+# -------------------------------------
+# Write-behind journal
+# -------------------------------------
+class WriteBehindTests(CollegeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.queue = SubmissionQueue(os.path.join(directory.name, "queue.sqlite3"))
+        self.queue.enqueue([{
+            "enrollment_no": self.students[0].EnrollmentNo,
+            "allocation_id": self.allocations[0].AllocationID,
+            "ratings": ratings(),
+            "comments": "queued",
+        }])
+
+    def journal(self):
+        return self.queue._connect().execute(
+            "SELECT attempts, next_attempt_at, drained_at, last_error FROM submission_queue"
+        ).fetchone()
+
+    def make_due(self):
+        self.queue._connect().execute("UPDATE submission_queue SET next_attempt_at = 0")
+
+    def test_drain_writes_the_submission(self):
+        self.assertEqual(self.queue.drain_once(), 1)
+        self.assertTrue(Feedback_SubmissionLog.objects.filter(EnrollmentNo=self.students[0]).exists())
+        self.assertEqual(self.queue.stats()["depth"], 0)
+
+    def test_failures_back_off_then_go_dead(self):
+        with mock.patch("feedback_app.write_behind.write_submissions", side_effect=ValueError("bad row")):
+            self.assertEqual(self.queue.drain_once(), 0)
+            attempts, next_attempt_at, _, error = self.journal()
+            self.assertEqual((attempts, error), (1, "bad row"))
+            self.assertGreater(next_attempt_at, 0)
+
+            # Not retried before its backoff has passed
+            self.assertEqual(self.queue.drain_once(), 0)
+            self.assertEqual(self.journal()[0], 1)
+
+            for _ in range(SubmissionQueue.MAX_ATTEMPTS - 1):
+                self.make_due()
+                self.queue.drain_once()
+
+        self.assertEqual(self.journal()[0], SubmissionQueue.MAX_ATTEMPTS)
+        self.assertEqual([row["last_error"] for row in self.queue.dead_rows()], ["bad row"])
+        self.assertEqual(self.queue.stats()["dead"], 1)
+
+        # A dead row is left alone until it is requeued
+        self.make_due()
+        self.assertEqual(self.queue.drain_once(), 0)
+        self.assertEqual(self.queue.requeue_dead(), 1)
+        self.assertEqual(self.queue.drain_once(), 1)
+        self.assertEqual(self.queue.dead_rows(), [])
+
+    def test_transient_errors_are_not_counted(self):
+        with mock.patch("feedback_app.write_behind.write_submissions", side_effect=OperationalError("gone")):
+            with self.assertRaises(OperationalError):
+                self.queue.drain_once()
+
+        attempts, next_attempt_at, drained_at, error = self.journal()
+        self.assertEqual(attempts, 0)
+        self.assertIsNone(drained_at)
+        self.assertIn("gone", error)
+
+        self.make_due()
+        self.assertEqual(self.queue.drain_once(), 1)
+
+    @override_settings(FEEDBACK_WRITE_BEHIND=True, FEEDBACK_QUEUE_EMBEDDED_WORKER=False)
+    def test_views_journal_and_report_queued_submissions(self):
+        client = self.student_client(self.students[1])
+        item = {"allocation_id": self.allocations[0].AllocationID, "subject_code": "CS101", **ratings()}
+        with mock.patch("feedback_app.write_behind._queue", self.queue):
+            response = self.post_json(client, "/submit-feedback/batch/", [item])
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(response.json()["results"][0]["status"], "queued")
+            self.assertFalse(Feedback_SubmissionLog.objects.filter(EnrollmentNo=self.students[1]).exists())
+
+            # Queued submissions count as submitted before they are drained
+            teachers = client.get("/my-teachers/").json()["subjects"]
+            self.assertTrue(teachers[0]["teachers"][0]["is_submitted"])
+            repeat = self.post_json(client, "/submit-feedback/batch/", [item]).json()
+            self.assertEqual(repeat["results"][0]["code"], 409)
+
+        self.assertEqual(self.queue.drain_once(), 2)
+        self.assertTrue(Feedback_SubmissionLog.objects.filter(EnrollmentNo=self.students[1]).exists())
+
+    def test_backoff_is_capped(self):
+        delays = [self.queue.backoff(n) for n in range(1, 12)]
+        self.assertEqual(delays[:3], [5.0, 10.0, 20.0])
+        self.assertEqual(max(delays), SubmissionQueue.BACKOFF_MAX)
+
+
+# -------------------------------------
+# Rating rollup
+# -------------------------------------
+class RatingRollupTests(CollegeTestCase):
+
+    def rollup_rows(self):
+        return list(Feedback_RatingRollup.objects.order_by("AllocationID").values().iterator())
+
+    def test_increments_match_a_rebuild(self):
+        for i, student in enumerate(self.students):
+            self.submit(student, self.allocations[0], value=1 + i % 5)
+        write_submissions([
+            {"enrollment_no": student.EnrollmentNo, "allocation_id": self.allocations[1].AllocationID,
+             "ratings": ratings(3, q1=5, q10=1), "comments": None}
+            for student in self.students[:3]
+        ])
+        incremental = self.rollup_rows()
+
+        self.assertEqual(rollup.rebuild(), 2)
+
+        strip = [{k: v for k, v in row.items() if k != "UpdatedAt"} for row in incremental]
+        self.assertEqual(strip, [{k: v for k, v in row.items() if k != "UpdatedAt"} for row in self.rollup_rows()])
+        first = Feedback_RatingRollup.objects.get(AllocationID=self.allocations[0])
+        self.assertEqual((first.ResponseCount, first.Q1_Sum, first.Q1_SumSq), (5, 15, 55))
+
+    def test_report_reads_roster_sizes_from_the_progress_counters(self):
+        for i, student in enumerate(self.students[:4]):
+            self.submit(student, self.allocations[0], value=2 + i % 2)
+        Users_Student.objects.filter(pk=self.students[4].pk).update(IsActive=False)
+        progress.rebuild()
+
+        students_table = f'FROM "{Users_Student._meta.db_table}"'
+        with CaptureQueriesContext(connection) as queries:
+            report = {g["key"]: g for g in rollup.summarize("allocation")}
+        self.assertEqual(len(queries), 1)
+        self.assertFalse([q for q in queries.captured_queries if students_table in q["sql"]])
+
+        first = report[self.allocations[0].AllocationID]
+        self.assertEqual((first["responses"], first["expected"], first["response_rate"]), (4, 4, 1.0))
+        self.assertEqual(first["questions"]["q1"], {"mean": 2.5, "stddev": 0.5})
+        self.assertEqual(report[self.allocations[1].AllocationID]["response_rate"], 0.0)
+
+        # Without counters the roster is counted from the students table
+        Feedback_AllocationProgress.objects.all().delete()
+        fallback = {g["key"]: g for g in rollup.summarize("allocation")}
+        self.assertEqual(fallback[self.allocations[0].AllocationID]["expected"], 4)
+
+
+# -------------------------------------
+# Analytics
+# -------------------------------------
+@skipUnless(analytics.is_available(), "numpy is not installed")
+class AnalyticsTests(CollegeTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        rng = random.Random(3)
+        cls.entries = [
+            {"enrollment_no": student.EnrollmentNo, "allocation_id": allocation.AllocationID,
+             "ratings": {key: rng.randint(1, 5) for key in rating_schema.RATING_KEYS}, "comments": None}
+            for student in cls.students for allocation in cls.allocations
+        ]
+        write_submissions(cls.entries)
+
+    def reference(self, allocation):
+        """Plain-Python statistics for one allocation's responses."""
+        rows = [e["ratings"] for e in self.entries if e["allocation_id"] == allocation.AllocationID]
+        questions = {}
+        for key in rating_schema.RATING_KEYS:
+            values = [row[key] for row in rows]
+            mean = sum(values) / len(values)
+            questions[key] = {
+                "mean": round(mean, 3),
+                "stddev": round(math.sqrt(sum((v - mean) ** 2 for v in values) / len(values)), 3),
+                "histogram": [values.count(level) for level in range(1, 6)],
+            }
+        scores = sorted(sum(row.values()) / len(row) for row in rows)
+        percentiles = {f"p{p}": round(scores[math.floor((len(scores) - 1) * p / 100)], 3) for p in (25, 50, 75)}
+        return len(rows), round(sum(scores) / len(scores), 3), questions, percentiles
+
+    def test_matrix_is_uint8_and_loaded_in_chunks(self):
+        with mock.patch.object(analytics, "CHUNK_SIZE", 3):
+            matrix = analytics.load_matrix()
+        self.assertEqual(len(matrix), len(self.entries))
+        self.assertEqual(matrix.ratings.dtype, analytics.np.uint8)
+        self.assertEqual(
+            sorted(map(tuple, matrix.ratings.tolist())),
+            sorted(tuple(e["ratings"].values()) for e in self.entries),
+        )
+
+    def test_group_report_matches_a_plain_computation(self):
+        report = {row["key"]: row for row in analytics.group_report(analytics.load_matrix(), "allocation")}
+
+        for allocation in self.allocations:
+            responses, mean, questions, percentiles = self.reference(allocation)
+            row = report[allocation.AllocationID]
+            self.assertEqual((row["responses"], row["mean"], row["department"]), (responses, mean, "CSE"))
+            self.assertEqual(row["questions"], questions)
+            self.assertEqual(row["percentiles"], percentiles)
+
+        # Two groups in one department: the better mean ranks 100, the other 0
+        ranked = sorted(report.values(), key=lambda row: row["mean"])
+        self.assertEqual([row["percentile_rank"] for row in ranked], [0.0, 100.0])
+        self.assertLess(ranked[0]["mean"], ranked[1]["mean"])
+        self.assertEqual([row["z_score"] for row in ranked], [-1.0, 1.0])
+
+    def test_question_summary_covers_every_response(self):
+        summary = analytics.question_summary(analytics.load_matrix())
+        for key in rating_schema.RATING_KEYS:
+            values = [e["ratings"][key] for e in self.entries]
+            self.assertEqual(summary[key]["histogram"], [values.count(level) for level in range(1, 6)])
+            self.assertEqual(summary[key]["mean"], round(sum(values) / len(values), 3))
+
+
+# -------------------------------------
+# Table export
+# -------------------------------------
+class ExportTests(CollegeTestCase):
+
+    def export(self, query):
+        response = self.admin_client().get(f"/dashboard-admin/table/Users_Student/export/?{query}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv_has_every_row_in_pk_order(self):
+        response, body = self.export("format=csv")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="Users_Student.csv"', response["Content-Disposition"])
+
+        rows = list(csv.reader(io.StringIO(body)))
+        header = rows[0]
+        self.assertEqual(header, [f.name for f in Users_Student._meta.concrete_fields])
+        self.assertEqual([row[header.index("EnrollmentNo")] for row in rows[1:]],
+                         sorted(s.EnrollmentNo for s in self.students))
+        self.assertEqual(rows[1][header.index("DateOfBirth")], "2004-01-01")
+
+    def test_ndjson_follows_search_and_sort(self):
+        _, body = self.export("format=ndjson&search=Student%203&sort_by=FullName")
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row["EnrollmentNo"] for row in rows], [self.students[3].EnrollmentNo])
+        self.assertEqual(rows[0]["Email"], "student3@acropolis.in")
+
+    def test_foreign_keys_are_exported_as_ids(self):
+        response = self.admin_client().get("/dashboard-admin/table/Academic_Allocation/export/?format=ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([(row["TeacherID"], row["SubjectCode"]) for row in rows], [("T1", "CS101"), ("T2", "CS102")])
+
+    def test_unknown_format_is_rejected(self):
+        response = self.admin_client().get("/dashboard-admin/table/Users_Student/export/?format=xml")
+        self.assertEqual(response.status_code, 400)
+
+
+# -------------------------------------
+# Keyset pagination
+# -------------------------------------
+class KeysetPaginationTests(CollegeTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Repeated names so the pk tie-breaker matters
+        for i in range(5, 23):
+            Users_Student.objects.create(
+                EnrollmentNo=f"0827CS{i:04d}", FullName=f"Student {i % 4}", Gender="M",
+                Email=f"student{i}@acropolis.in", Branch="CSE", Year=2, Semester=3, Section=1,
+                DateOfBirth=datetime.date(2004, 1, 1),
+            )
+
+    def walk(self, fields, descending):
+        queryset = Users_Student.objects.all()
+        pages, cursor = [], None
+        while len(pages) < Users_Student.objects.count():
+            rows, cursor, prev_cursor = pagination.keyset_page(
+                queryset, fields, descending=descending, cursor=cursor, page_size=5
+            )
+            pages.append((rows, prev_cursor))
+            if not cursor:
+                return pages
+        self.fail("cursor pagination did not reach the last page")
+
+    def test_pages_cover_every_row_once_in_order(self):
+        for sort_by, descending in (("FullName", False), ("FullName", True), (None, False)):
+            with self.subTest(sort_by=sort_by, descending=descending):
+                fields = pagination.keyset_fields(Users_Student, sort_by)
+                pages = self.walk(fields, descending)
+                seen = [row.pk for rows, _ in pages for row in rows]
+
+                ordering = [f"-{f.attname}" if descending else f.attname for f in fields]
+                expected = list(Users_Student.objects.order_by(*ordering).values_list("pk", flat=True))
+                self.assertEqual(seen, expected)
+                self.assertEqual(len(pages), 5)
+
+    def test_prev_cursor_returns_the_previous_page(self):
+        fields = pagination.keyset_fields(Users_Student, "FullName")
+        pages = self.walk(fields, descending=False)
+
+        for (previous, _), (_, prev_cursor) in zip(pages, pages[1:]):
+            rows, _, _ = pagination.keyset_page(Users_Student.objects.all(), fields, cursor=prev_cursor, page_size=5)
+            self.assertEqual([row.pk for row in rows], [row.pk for row in previous])
+
+    def test_invalid_cursors_are_rejected(self):
+        fields = pagination.keyset_fields(Users_Student, "FullName")
+        for cursor in ("not-a-cursor", pagination.encode_cursor(["x"], "next"),
+                       pagination.encode_cursor(["x", "y"], "sideways")):
+            with self.subTest(cursor=cursor), self.assertRaises(pagination.InvalidCursor):
+                pagination.keyset_page(Users_Student.objects.all(), fields, cursor=cursor)
+
+    def test_admin_table_cursor_pages(self):
+        client = self.admin_client()
+        seen, cursor = [], ""
+        for _ in range(Users_Student.objects.count()):
+            response = client.get(
+                f"/dashboard-admin/table/Users_Student/?pagination=cursor&page_size=10&sort_by=FullName{cursor}"
+            )
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            seen.extend(body["data"])
+            if not body["next_cursor"]:
+                break
+            cursor = f"&cursor={body['next_cursor']}"
+
+        self.assertEqual(len(seen), Users_Student.objects.count())
+
+    def test_count_modes(self):
+        client = self.admin_client()
+        path = "/dashboard-admin/table/Users_Student/?pagination=cursor&page_size=10"
+        with CaptureQueriesContext(connection) as queries:
+            body = client.get(f"{path}&count=none").json()
+        self.assertIsNone(body["total"])
+        self.assertFalse([q for q in queries.captured_queries if "COUNT(" in q["sql"].upper()])
+
+        self.assertEqual(client.get(path).json()["total"], Users_Student.objects.count())
+        self.assertIsNone(client.get(f"{path}&count=estimate&search=Student").json()["total"])
+
+    def test_bad_cursor_is_a_client_error(self):
+        response = self.admin_client().get("/dashboard-admin/table/Users_Student/?pagination=cursor&cursor=%25%25")
+        self.assertEqual(response.status_code, 400)
+
+
+# -------------------------------------
+# Admin search
+# -------------------------------------
+def run_inline(target, *args):
+    target(*args)
+
+
+class SearchTests(CollegeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        search._indexes.clear()
+        search._building.clear()
+
+    def matches(self, model, term):
+        return sorted(model.objects.filter(search.build_search_q(model, term)).values_list("pk", flat=True))
+
+    def test_prefix_upper_bound(self):
+        self.assertEqual(search.prefix_upper_bound("ab"), "ac")
+        self.assertEqual(search.prefix_upper_bound("a\U0010ffff"), "b")
+        self.assertIsNone(search.prefix_upper_bound(""))
+
+    def test_key_columns_match_exactly(self):
+        self.assertEqual(self.matches(Users_Student, "0827CS0003"), ["0827CS0003"])
+        self.assertEqual(self.matches(Users_Student, "0827CS"), [])
+        self.assertEqual(self.matches(Faculty_Teacher, "T1"), ["T1"])
+
+    def test_text_columns_match_by_prefix(self):
+        self.assertEqual(self.matches(Users_Student, "Student 2"), ["0827CS0002"])
+        self.assertEqual(self.matches(Users_Student, "student4@"), ["0827CS0004"])
+        self.assertEqual(self.matches(Users_Student, "tudent"), [])
+
+    def test_field_terms(self):
+        self.assertEqual(self.matches(Users_Student, "EnrollmentNo:0827CS000*"), [s.pk for s in self.students])
+        self.assertEqual(self.matches(Users_Student, "FullName:Student 1"), ["0827CS0001"])
+        self.assertEqual(len(self.matches(Users_Student, "Year:2")), 5)
+        self.assertEqual(self.matches(Users_Student, "Year:two"), [])
+
+    def test_numeric_terms_match_integer_columns(self):
+        allocation = self.allocations[1]
+        self.assertIn(allocation.pk, self.matches(Academic_Allocation, str(allocation.pk)))
+        self.assertEqual(len(self.matches(Users_Student, "1")), 5)  # Section
+        self.assertEqual(self.matches(Users_Student, "9"), [])
+
+    @override_settings(FEEDBACK_SEARCH_NGRAM=True)
+    def test_ngram_index_answers_substrings_once_built(self):
+        with mock.patch("feedback_app.search._spawn") as spawn:
+            # No index yet: the build is handed to a thread and the prefix predicates answer alone
+            self.assertEqual(self.matches(Users_Student, "tudent 3"), [])
+            spawn.assert_called_once_with(search._rebuild, Users_Student, mock.ANY)
+            self.assertEqual(self.matches(Users_Student, "tudent 3"), [])
+            spawn.assert_called_once()  # one build at a time
+        search._building.clear()  # the mocked thread never ran
+
+        with mock.patch("feedback_app.search._spawn", run_inline):
+            self.matches(Users_Student, "tudent 3")
+        self.assertEqual(self.matches(Users_Student, "tudent 3"), ["0827CS0003"])
+        self.assertEqual(self.matches(Users_Student, "4@acro"), ["0827CS0004"])
+
+    @override_settings(FEEDBACK_SEARCH_NGRAM=True)
+    def test_stale_index_answers_while_it_rebuilds(self):
+        with mock.patch("feedback_app.search._spawn", run_inline):
+            self.matches(Users_Student, "tudent")
+        Users_Student.objects.filter(pk="0827CS0003").update(FullName="Renamed")
+        feedback_cache.invalidate_for_model(Users_Student)
+
+        with mock.patch("feedback_app.search._spawn") as spawn:
+            self.assertEqual(self.matches(Users_Student, "tudent 3"), ["0827CS0003"])
+            spawn.assert_called_once()
+
+    @override_settings(FEEDBACK_SEARCH_NGRAM=True)
+    def test_too_many_ngram_matches_fall_back_to_prefixes(self):
+        with mock.patch("feedback_app.search._spawn", run_inline):
+            self.matches(Users_Student, "tudent")
+        with mock.patch("feedback_app.search.NGRAM_MAX_PKS", 2):
+            self.assertEqual(self.matches(Users_Student, "tudent"), [])
+            self.assertEqual(self.matches(Users_Student, "tudent 3"), ["0827CS0003"])
+
+
+# -------------------------------------
+# Admin schema registry
+# -------------------------------------
+class AdminSchemaTests(CollegeTestCase):
+
+    def test_every_model_is_registered_by_table_and_model_name(self):
+        for model in apps.get_app_config("feedback_app").get_models():
+            with self.subTest(model=model.__name__):
+                self.assertIs(admin_schema.get_schema(model._meta.db_table).model, model)
+                self.assertIs(admin_schema.get_schema(model.__name__).model, model)
+        self.assertIsNone(admin_schema.get_schema("no_such_table"))
+
+    def test_read_only_flags(self):
+        read_only = {s.table_name.lower() for s in admin_schema.all_tables() if s.read_only}
+        self.assertEqual(read_only, admin_schema.READ_ONLY_TABLES)
+        self.assertFalse(admin_schema.get_schema("Users_Student").read_only)
+
+    def test_rows_serialize_like_the_model(self):
+        schema = admin_schema.get_schema("Academic_Allocation")
+        self.assertNotIn("feedback_ratingrollup", schema.fields)
+        row = schema.serialize_rows(Academic_Allocation.objects.values_list(*schema.attnames)[:1])[0]
+        allocation = self.allocations[0]
+        self.assertEqual(row["TeacherID"], allocation.TeacherID_id)
+        self.assertEqual(row["SubjectCode"], allocation.SubjectCode_id)
+
+        student = admin_schema.get_schema("Users_Student")
+        row = student.serialize_rows(Users_Student.objects.filter(pk="0827CS0001").values_list(*student.attnames))[0]
+        self.assertEqual(row["DateOfBirth"], "2004-01-01")
+        self.assertEqual(student.field_meta["Gender"]["type"], "select")
+        self.assertEqual(student.field_meta["DateOfBirth"]["type"], "date")
+
+    def test_schema_endpoint_is_etag_validated(self):
+        client = self.admin_client()
+        response = client.get("/dashboard-admin/schema/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["tables"]), len(admin_schema.all_tables()))
+
+        again = client.get("/dashboard-admin/schema/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        one = client.get("/dashboard-admin/schema/?table=Users_Student").json()["tables"]
+        self.assertEqual([t["table_name"] for t in one], ["Users_Student"])
+        self.assertEqual(client.get("/dashboard-admin/schema/?table=nope").status_code, 404)
+
+
+# -------------------------------------
+# Table row counts
+# -------------------------------------
+class TableStatsTests(CollegeTestCase):
+
+    def models(self):
+        return [schema.model for schema in admin_schema.all_tables()]
+
+    def test_counts_are_cached_under_a_valid_key(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # CacheKeyWarning for keys over 250 characters
+            counts, is_estimate = table_stats.row_counts(self.models())
+            with self.assertNumQueries(0):
+                self.assertEqual(table_stats.row_counts(self.models())[0], counts)
+
+        self.assertFalse(is_estimate)
+        self.assertEqual(counts["Users_Student"], 5)
+        self.assertEqual(counts["Academic_Allocation"], 2)
+
+    def test_admin_writes_refresh_the_counts(self):
+        table_stats.row_counts(self.models())
+        Faculty_Teacher.objects.create(TeacherID="T3", FullName="Teacher 3", Designation="Professor")
+        feedback_cache.invalidate_for_model(Faculty_Teacher)
+        self.assertEqual(table_stats.row_counts(self.models())[0]["Faculty_Teacher"], 3)
+
+    def test_list_tables_in_one_query(self):
+        client = self.admin_client()
+        with CaptureQueriesContext(connection) as queries:
+            body = client.get("/dashboard-admin/tables/").json()
+        self.assertEqual(len([q for q in queries.captured_queries if "COUNT(" in q["sql"]]), 1)
+        counts = {t["table_name"]: t["row_count"] for t in body["tables"]}
+        self.assertEqual(counts["Academic_Subject"], 2)
+
+
+# -------------------------------------
+# Roster import
+# -------------------------------------
+STUDENT_COLUMNS = "EnrollmentNo,FullName,Gender,Email,Branch,Year,Semester,Section,IsActive,DateOfBirth"
+
+
+class RosterImportTests(CollegeTestCase):
+
+    def upload(self, table, lines, **data):
+        content = "\n".join([STUDENT_COLUMNS if table == "Users_Student" else lines.pop(0), *lines])
+        return self.admin_client().post(f"/dashboard-admin/table/{table}/import/", {
+            "file": SimpleUploadedFile("roster.csv", content.encode(), content_type="text/csv"), **data,
+        })
+
+    def student_rows(self):
+        return [
+            "0827CS0100,New Student,M,new@acropolis.in,CSE,2,3,1,yes,2004-05-06",
+            "0827CS0001,Renamed Student,F,student1@acropolis.in,CSE,2,3,1,true,",
+            "0827CS0101,Bad Gender,X,bad@acropolis.in,CSE,2,3,1,true,",
+            "0827CS0102,,M,blank@acropolis.in,CSE,two,3,1,true,",
+            "0827CS0100,Duplicate,M,dup@acropolis.in,CSE,2,3,1,true,",
+        ]
+
+    def test_dry_run_reports_without_writing(self):
+        report = self.upload("Users_Student", self.student_rows(), dry_run="true").json()
+        self.assertEqual((report["dry_run"], report["rows"], report["created"], report["updated"]), (True, 5, 1, 1))
+        self.assertFalse(Users_Student.objects.filter(pk="0827CS0100").exists())
+        self.assertEqual(Users_Student.objects.get(pk="0827CS0001").FullName, "Student 1")
+
+    def test_error_rows_are_reported_by_line(self):
+        report = self.upload("Users_Student", self.student_rows()).json()
+        self.assertEqual((report["created"], report["updated"], report["failed"]), (1, 1, 3))
+        errors = {e["row"]: e["errors"] for e in report["errors"]}
+        self.assertEqual(set(errors), {4, 5, 6})
+        self.assertEqual(set(errors[4]), {"Gender"})
+        self.assertEqual(set(errors[5]), {"FullName", "Year"})
+        self.assertEqual(errors[6], {"EnrollmentNo": ["duplicate key in file"]})
+
+        created = Users_Student.objects.get(pk="0827CS0100")
+        self.assertEqual((created.IsActive, created.DateOfBirth), (True, datetime.date(2004, 5, 6)))
+        self.assertEqual(Users_Student.objects.get(pk="0827CS0001").FullName, "Renamed Student")
+
+    def test_foreign_keys_are_resolved(self):
+        header = "TeacherID,SubjectCode,TargetBranch,Target_Year,Target_Semester,Target_Section"
+        report = self.upload("Academic_Allocation", [header, "T1,CS102,CSE,2,3,1", "T9,CS101,CSE,2,3,1"]).json()
+        self.assertEqual((report["created"], report["failed"]), (1, 1))
+        self.assertEqual(list(report["errors"][0]["errors"]), ["TeacherID"])
+        self.assertEqual(Academic_Allocation.objects.count(), 3)
+
+    def test_chunk_size(self):
+        response = self.upload("Users_Student", self.student_rows(), chunk_size="ten")
+        self.assertEqual(response.status_code, 400)
+
+        created = []
+        original = roster_import.RosterImporter.__init__
+
+        def spy(importer, *args, **kwargs):
+            original(importer, *args, **kwargs)
+            created.append(importer.chunk_size)
+
+        with mock.patch.object(roster_import.RosterImporter, "__init__", spy):
+            for requested in ("0", "2", "50000"):
+                report = self.upload("Users_Student", self.student_rows(), chunk_size=requested, dry_run="true")
+                self.assertEqual(report.json()["created"], 1)
+        self.assertEqual(created, [1, 2, roster_import.MAX_CHUNK_SIZE])
+
+    def test_bad_files_are_rejected(self):
+        response = self.upload("Faculty_Teacher", ["TeacherID,FullName,Nickname", "T5,Teacher 5,T"])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Nickname", response.json()["error"])
+        self.assertEqual(self.upload("Feedback_Response", ["ResponseID", "1"]).status_code, 400)
+
+
+# -------------------------------------
+# Batch row edits
+# -------------------------------------
+class BatchRowsTests(CollegeTestCase):
+
+    def batch(self, table, payload):
+        return self.post_json(self.admin_client(), f"/dashboard-admin/table/{table}/batch/", payload)
+
+    def test_update_reports_each_pk(self):
+        response = self.batch("Users_Student", {
+            "action": "update", "pks": ["0827CS0001", "0827CS0002", "0827CS0001", "nobody"], "patch": {"Section": "2"},
+        })
+        body = response.json()
+        self.assertEqual(body["updated"], 2)
+        self.assertEqual(
+            [(r["pk"], r["status"]) for r in body["results"]],
+            [("0827CS0001", "updated"), ("0827CS0002", "updated"), ("nobody", "not_found")],
+        )
+        self.assertEqual(
+            sorted(Users_Student.objects.filter(Section=2).values_list("pk", flat=True)), ["0827CS0001", "0827CS0002"]
+        )
+
+    def test_invalid_pks_are_reported(self):
+        allocation = self.allocations[0]
+        body = self.batch("Academic_Allocation", {
+            "action": "update", "pks": [allocation.pk, "abc"], "patch": {"Target_Section": 4},
+        }).json()
+        statuses = {r["pk"]: r["status"] for r in body["results"]}
+        self.assertEqual(statuses, {"abc": "invalid", allocation.pk: "updated"})
+
+    def test_invalid_patches_write_nothing(self):
+        for patch in ({"Gender": "X"}, {"Nickname": "x"}, {"EnrollmentNo": "0827CS9999"}, {"FullName": None}, {}):
+            with self.subTest(patch=patch):
+                response = self.batch("Users_Student", {"action": "update", "pks": ["0827CS0001"], "patch": patch})
+                self.assertEqual(response.status_code, 400)
+        student = Users_Student.objects.get(pk="0827CS0001")
+        self.assertEqual((student.Gender, student.FullName), ("F", "Student 1"))
+
+        response = self.batch("Academic_Allocation", {
+            "action": "update", "pks": [self.allocations[0].pk], "patch": {"TeacherID": "T9"},
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("TeacherID", response.json()["error"])
+
+    def test_delete_reports_cascades_and_refreshes_the_tree(self):
+        self.submit(self.students[0], self.allocations[0])
+        client = self.student_client(self.students[1])
+        self.assertEqual(len(client.get("/my-teachers/").json()["subjects"]), 2)
+
+        body = self.batch("Academic_Allocation", {"action": "delete", "pks": [self.allocations[0].pk, 999]}).json()
+        self.assertEqual(body["deleted"], 1)
+        self.assertEqual(body["cascaded"]["Feedback_Response"], 1)
+        self.assertEqual(body["cascaded"]["Feedback_SubmissionLog"], 1)
+        self.assertEqual([r["status"] for r in body["results"]], ["deleted", "not_found"])
+        self.assertEqual(len(client.get("/my-teachers/").json()["subjects"]), 1)
+
+    def test_bad_batches_are_rejected(self):
+        self.assertEqual(self.batch("Feedback_Response", {"action": "delete", "pks": [1]}).status_code, 403)
+        self.assertEqual(self.batch("Nope", {"action": "delete", "pks": [1]}).status_code, 404)
+        self.assertEqual(self.batch("Users_Student", {"action": "rename", "pks": ["x"]}).status_code, 400)
+        self.assertEqual(self.batch("Users_Student", {"action": "delete", "pks": []}).status_code, 400)
+        too_many = [str(i) for i in range(1001)]
+        self.assertEqual(self.batch("Users_Student", {"action": "delete", "pks": too_many}).status_code, 400)
+
+
+# -------------------------------------
+# Login e-mail index
+# -------------------------------------
+class StudentLookupTests(CollegeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.multiple(student_lookup, _index=None, _building=False, _retry_at=0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def build_index(self):
+        with mock.patch("feedback_app.student_lookup._spawn", run_inline):
+            student_lookup.get_email_index()
+        return student_lookup._index
+
+    def login(self, email):
+        return self.post_json(Client(), "/login/", {"email": email, "dob": "2004-01-01"})
+
+    def test_login_by_primary_key_once_indexed(self):
+        self.build_index()
+        with CaptureQueriesContext(connection) as queries:
+            student = student_lookup.find_student("  Student2@Acropolis.IN ")
+        self.assertEqual(student.pk, "0827CS0002")
+        self.assertFalse([q for q in queries.captured_queries if "UPPER(" in q["sql"] or "LIKE" in q["sql"]])
+
+        self.assertEqual(self.login("STUDENT3@acropolis.in").json()["EnrollmentNo"], "0827CS0003")
+        self.assertEqual(self.login("nobody@acropolis.in").status_code, 401)
+
+    def test_write_in_another_worker_schedules_a_rebuild(self):
+        index = self.build_index()
+        Users_Student.objects.filter(pk="0827CS0002").update(Email="moved@acropolis.in")
+        # Only the shared counter moves; this process's cache versions are untouched
+        feedback_cache.bump_table_versions(Users_Student)
+
+        with mock.patch("feedback_app.student_lookup._spawn") as spawn:
+            self.assertIs(student_lookup.get_email_index(), index)
+            spawn.assert_called_once()
+            # The stale entry is checked against the row, then the query fallback finds the new address
+            self.assertIsNone(student_lookup.find_student("student2@acropolis.in"))
+            self.assertEqual(student_lookup.find_student("moved@acropolis.in").pk, "0827CS0002")
+
+        self.assertEqual(self.build_index().pks["moved@acropolis.in"], "0827CS0002")
+
+    def test_no_index_falls_back_to_the_query(self):
+        with mock.patch("feedback_app.student_lookup._spawn") as spawn:
+            self.assertEqual(student_lookup.find_student("student1@acropolis.in").pk, "0827CS0001")
+            spawn.assert_called_once_with(student_lookup._build, mock.ANY)
+
+
+# -------------------------------------
+# Token revocation
+# -------------------------------------
+@override_settings(FEEDBACK_AUTH_MODE="token", FEEDBACK_TOKEN_REVOCATION_CACHE=None)
+class TokenRevocationTests(CollegeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch("feedback_app.student_auth._database_deny_list", student_auth.DatabaseDenyList())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_logout_revokes_only_that_token(self):
+        student = self.students[0]
+        first = student_auth.issue_token(student)
+        second = student_auth.issue_token(student)
+
+        student_auth.revoke_token(student_auth.read_token(first))
+
+        self.assertIsNone(student_auth.read_token(first))
+        self.assertEqual(student_auth.read_token(second).enrollment_no, student.EnrollmentNo)
+
+    def test_revocation_survives_a_cache_clear(self):
+        token = student_auth.issue_token(self.students[0])
+        student_auth.revoke_token(student_auth.read_token(token))
+
+        for alias in ("default", feedback_cache.CACHE_ALIAS):
+            caches[alias].clear()
+        student_auth._database_deny_list.__init__()
+
+        self.assertIsNone(student_auth.read_token(token))
+
+    def test_row_change_revokes_earlier_tokens(self):
+        student = self.students[0]
+        old = student_auth.issue_token(student)
+        with mock.patch("feedback_app.student_auth._now_ms", return_value=student_auth._now_ms() + 1000):
+            student_auth.revoke_for_rows(Users_Student, [student.EnrollmentNo])
+        with mock.patch("feedback_app.student_auth._now_ms", return_value=student_auth._now_ms() + 2000):
+            new = student_auth.issue_token(student)
+
+        self.assertIsNone(student_auth.read_token(old))
+        self.assertIsNotNone(student_auth.read_token(new))
+
+    def test_checks_read_the_snapshot(self):
+        token = student_auth.issue_token(self.students[0])
+        self.assertIsNotNone(student_auth.read_token(token))
+        with self.assertNumQueries(0):
+            self.assertIsNotNone(student_auth.read_token(token))
+
+    def test_revocation_by_another_process_is_seen_once_the_snapshot_is_due(self):
+        identity = student_auth.read_token(student_auth.issue_token(self.students[0]))
+        # Another worker's logout: a row and a counter bump this process has not seen
+        Feedback_TokenRevocation.objects.create(
+            Key=f"token-deny:{identity.token_id}", Value=1,
+            ExpiresAt=timezone.now() + datetime.timedelta(hours=1),
+        )
+        feedback_cache.bump_table_versions(Feedback_TokenRevocation)
+        self.assertFalse(student_auth._is_denied(identity, student_auth._deny_cache().get_many(
+            student_auth._deny_keys(identity)
+        )))
+
+        with override_settings(FEEDBACK_TOKEN_DENY_SNAPSHOT_TTL=0):
+            self.assertTrue(student_auth._is_denied(identity, student_auth._deny_cache().get_many(
+                student_auth._deny_keys(identity)
+            )))
+            # An unchanged counter keeps the snapshot
+            with CaptureQueriesContext(connection) as queries:
+                student_auth._deny_cache().get_many(["token-deny:x"])
+            self.assertEqual(len(queries.captured_queries), 1)
+
+    def test_revoked_token_is_rejected_by_the_views(self):
+        client = self.token_client(self.students[0])
+        self.assertEqual(client.get("/my-teachers/").status_code, 200)
+
+        client.post("/logout/")
+
+        self.assertEqual(client.get("/my-teachers/").status_code, 401)
+
+    @override_settings(FEEDBACK_TOKEN_REVOCATION_CACHE=feedback_cache.CACHE_ALIAS)
+    def test_per_process_cache_is_refused(self):
+        with self.assertRaises(ImproperlyConfigured):
+            student_auth.check_revocation_store()
+
+
+# -------------------------------------
+# Cohort progress counters
+# -------------------------------------
+class ProgressCounterTests(CollegeTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.outsider = Users_Student.objects.create(
+            EnrollmentNo="0827CS0900", FullName="Other Section", Gender="M", Email="other@acropolis.in",
+            Branch="CSE", Year=2, Semester=3, Section=2, DateOfBirth=datetime.date(2004, 1, 1),
+        )
+
+    def setUp(self):
+        super().setUp()
+        progress.rebuild()
+
+    def counters(self):
+        cohort = Feedback_CohortProgress.objects.get(Branch="cse", Year=2, Semester=3, Section=1)
+        allocations = dict(Feedback_AllocationProgress.objects.values_list("AllocationID", "SubmissionCount"))
+        return (cohort.RosterSize, cohort.ExpectedCount, cohort.SubmissionCount), allocations
+
+    def assert_matches_rebuild(self):
+        incremental = self.counters()
+        progress.rebuild()
+        self.assertEqual(incremental, self.counters())
+        return incremental
+
+    def test_submissions_are_counted_per_cohort_and_allocation(self):
+        for student in self.students[:3]:
+            self.submit(student, self.allocations[0])
+        self.submit(self.students[0], self.allocations[1])
+
+        cohort, allocations = self.assert_matches_rebuild()
+        self.assertEqual(cohort, (5, 10, 4))
+        self.assertEqual(allocations, {self.allocations[0].pk: 3, self.allocations[1].pk: 1})
+
+    def test_students_outside_the_cohort_are_not_counted(self):
+        inactive = self.students[4]
+        Users_Student.objects.filter(pk=inactive.pk).update(IsActive=False)
+        progress.refresh_cohorts({progress.cohort_key("CSE", 2, 3, 1)})
+        self.submit(self.outsider, self.allocations[0])
+        self.submit(inactive, self.allocations[0])
+
+        cohort, allocations = self.assert_matches_rebuild()
+        self.assertEqual(cohort, (4, 8, 0))
+        self.assertEqual(allocations[self.allocations[0].pk], 0)
+
+    def test_first_submission_builds_missing_counters(self):
+        Feedback_CohortProgress.objects.all().delete()
+        Feedback_AllocationProgress.objects.all().delete()
+        self.submit(self.students[0], self.allocations[0])
+        self.submit(self.students[1], self.allocations[0])
+        self.assertEqual(self.assert_matches_rebuild()[0], (5, 10, 2))
+
+    def test_roster_edits_refresh_the_counters(self):
+        self.submit(self.students[0], self.allocations[0])
+        self.post_json(self.admin_client(), "/dashboard-admin/table/Users_Student/batch/", {
+            "action": "update", "pks": [self.students[0].pk], "patch": {"Section": 2},
+        })
+        cohort, allocations = self.assert_matches_rebuild()
+        self.assertEqual(cohort, (4, 8, 0))
+
+    def test_reports(self):
+        self.submit(self.students[0], self.allocations[0])
+        client = self.admin_client()
+        summary = client.get("/dashboard-admin/reports/progress/").json()
+        section = next(c for c in summary["cohorts"] if c["section"] == 1)
+        self.assertEqual((section["expected"], section["received"], section["completion"]), (10, 1, 0.1))
+
+        detail = client.get(
+            "/dashboard-admin/reports/progress/cohort/?branch=CSE&year=2&semester=3&section=1"
+        ).json()
+        pending = {s["enrollment_no"]: s["submitted"] for s in detail["pending_students"]}
+        self.assertEqual(pending, {s.pk: int(s.pk == "0827CS0000") for s in self.students})
+
+
+# -------------------------------------
+# Live submission feed
+# -------------------------------------
+class LiveFeedTests(CollegeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch("feedback_app.live_feed.broker", live_feed.Broker())
+        self.broker = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_wsgi_requests_are_told_to_poll(self):
+        response = self.admin_client().get("/dashboard-admin/live/")
+        self.assertEqual(response.status_code, 501)
+        self.assertIn("group_by=allocation", response.json()["poll"])
+
+    def test_commits_are_published_with_aggregates(self):
+        self.submit(self.students[0], self.allocations[0], value=2)
+
+        def commit_another():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.submit(self.students[1], self.allocations[0], value=4)
+
+        async def listen():
+            subscription = self.broker.subscribe()
+            await sync_to_async(commit_another)()
+            return await asyncio.wait_for(subscription.get(), 1)
+
+        self.assertEqual(self.broker.snapshot()[self.allocations[0].pk]["count"], 1)
+        event = async_to_sync(listen)()
+        self.assertEqual((event["allocation_id"], event["average"]), (self.allocations[0].pk, 4))
+        self.assertEqual(event["aggregate"], {"count": 2, "mean": 3.0, "rolling_mean": 4.0})
+        self.assertNotIn("enrollment_no", json.dumps(event).lower())
+
+    def test_slow_viewers_drop_the_oldest_events(self):
+        async def flood():
+            subscription = self.broker.subscribe()
+            for i in range(live_feed.SUBSCRIBER_QUEUE_SIZE + 5):
+                self.broker.publish([(self.allocations[0].pk, ratings(1 + i % 5))])
+            await asyncio.sleep(0)
+            return subscription, await subscription.get()
+
+        subscription, first = async_to_sync(flood)()
+        self.assertEqual(subscription.dropped, 5)
+        self.assertEqual(first["id"], 6)
+
+    def test_asgi_stream_sends_a_snapshot_then_submissions(self):
+        client = AsyncClient()
+        client.cookies[settings.SESSION_COOKIE_NAME] = self.admin_client().session.session_key
+
+        async def read():
+            response = await client.get("/dashboard-admin/live/")
+            chunks = response.streaming_content
+            snapshot = await anext(chunks)
+            self.broker.publish([(self.allocations[1].pk, ratings(5))])
+            submission = await asyncio.wait_for(anext(chunks), 1)
+            await chunks.aclose()
+            return response, snapshot, submission
+
+        response, snapshot, submission = async_to_sync(read)()
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(snapshot.startswith(b"event: snapshot"))
+        self.assertTrue(submission.startswith(b"event: submission\nid: 1\n"))
+        self.assertEqual(self.broker.subscriber_count(), 0)
+
+
+# -------------------------------------
+# Async student views
+# -------------------------------------
+class AsyncViewTests(CollegeTestCase):
+
+    def async_student_client(self, student):
+        client = AsyncClient()
+        client.cookies[settings.SESSION_COOKIE_NAME] = self.student_client(student).session.session_key
+        return client
+
+    def get(self, client, path):
+        return async_to_sync(client.get)(path)
+
+    def test_my_teachers_under_asgi(self):
+        self.submit(self.students[0], self.allocations[1])
+        response = self.get(self.async_student_client(self.students[0]), "/my-teachers/")
+        self.assertEqual(response.status_code, 200)
+        flags = [t["is_submitted"] for s in response.json()["subjects"] for t in s["teachers"]]
+        self.assertEqual(flags, [False, True])
+
+    def test_my_feedbacks_under_asgi(self):
+        self.submit(self.students[0], self.allocations[0], value=3)
+        body = self.get(self.async_student_client(self.students[0]), "/my-feedbacks/").json()
+        self.assertEqual([(f["subject_code"], f["ratings"]["q1"]) for f in body["feedbacks"]], [("CS101", 3)])
+
+    @override_settings(FEEDBACK_AUTH_MODE="token", FEEDBACK_TOKEN_REVOCATION_CACHE=None)
+    def test_bearer_tokens_under_asgi(self):
+        bearer = {"Authorization": f"Bearer {student_auth.issue_token(self.students[2])}"}
+        response = async_to_sync(AsyncClient().get)("/my-feedbacks/", headers=bearer)
+        self.assertEqual(response.json()["feedbacks"], [])
+
+    def test_anonymous_requests_are_rejected(self):
+        for path in ("/my-teachers/", "/my-feedbacks/"):
+            with self.subTest(path=path):
+                self.assertEqual(self.get(AsyncClient(), path).status_code, 401)
+
+
+class CsrfExemptMiddlewareTests(TestCase):
+
+    def requests(self):
+        factory = RequestFactory()
+        return factory.post("/admin/table/x/"), factory.post("/submit-feedback/")
+
+    def test_sync_and_async_chains_mark_the_same_paths(self):
+        def view(request):
+            return getattr(request, "_dont_enforce_csrf_checks", False)
+
+        async def aview(request):
+            return view(request)
+
+        sync_middleware = CsrfExemptMiddleware(view)
+        async_middleware = CsrfExemptMiddleware(aview)
+        self.assertTrue(asyncio.iscoroutinefunction(async_middleware))
+
+        exempt, checked = self.requests()
+        self.assertEqual((sync_middleware(exempt), sync_middleware(checked)), (True, False))
+        exempt, checked = self.requests()
+        self.assertEqual(
+            (async_to_sync(async_middleware)(exempt), async_to_sync(async_middleware)(checked)), (True, False)
+        )
+
+
+# -------------------------------------
+# Benchmark baselines
+# -------------------------------------
+class BenchmarkCompareTests(SimpleTestCase):
+
+    def run_document(self, calibration_ms, p95_ms, queries_max, requests=100):
+        return {
+            "environment": {"calibration_ms": calibration_ms},
+            "results": {"endpoints": {"submit_feedback": {
+                "requests": requests, "p95_ms": p95_ms, "queries_max": queries_max,
+            }}},
+        }
+
+    def test_query_growth_is_a_regression(self):
+        regressions, warnings = benchmark.compare(self.run_document(5, 10, 8), self.run_document(5, 10, 9))
+        self.assertEqual(regressions, ["submit_feedback: queries_max 8 -> 9"])
+        self.assertEqual(warnings, [])
+
+    def test_latency_is_measured_in_calibration_units(self):
+        baseline = self.run_document(5, 10, 8)
+        # Twice as slow on a machine twice as slow: no change
+        self.assertEqual(benchmark.compare(baseline, self.run_document(10, 20, 8)), ([], []))
+
+        regressions, warnings = benchmark.compare(baseline, self.run_document(5, 20, 8))
+        self.assertEqual((regressions, len(warnings)), ([], 1))
+        regressions, warnings = benchmark.compare(baseline, self.run_document(5, 20, 8), strict_latency=True)
+        self.assertEqual((len(regressions), warnings), (1, []))
+
+        self.assertEqual(benchmark.compare(baseline, self.run_document(5, 20, 8, requests=10)), ([], []))
+
+    def test_calibration_is_cpu_only(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertGreater(benchmark.calibrate(rounds=3), 0)
+        self.assertEqual(queries.captured_queries, [])
+
+
+# -------------------------------------
+# Request instrumentation
+# -------------------------------------
+class InstrumentationTests(CollegeTestCase):
+
+    def setUp(self):
+        super().setUp()
+        instrumentation.snapshot(reset=True)
+
+    def server_timing(self, response):
+        return dict(part.split(";", 1) for part in response["Server-Timing"].split(", "))
+
+    def test_server_timing_counts_the_request_queries(self):
+        client = self.student_client(self.students[0])
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get("/my-teachers/")
+        timing = self.server_timing(response)
+        self.assertEqual(set(timing), {"db", "serialize", "app", "total"})
+        self.assertIn(f'desc="{len(queries.captured_queries)} queries"', timing["db"])
+
+    def test_metrics_are_aggregated_per_url_name(self):
+        client = self.student_client(self.students[0])
+        client.get("/my-teachers/")
+        client.get("/my-feedbacks/")
+        client.get("/my-feedbacks/")
+        self.post_json(client, "/submit-feedback/", {"allocation_id": "x"})
+
+        endpoints = self.admin_client().get("/dashboard-admin/metrics/?reset=true").json()["endpoints"]
+        self.assertEqual(endpoints["my_feedbacks"]["requests"], 2)
+        self.assertEqual(sum(endpoints["my_feedbacks"]["query_histogram"].values()), 2)
+        self.assertGreater(endpoints["my_teachers"]["mean_queries"], 0)
+        self.assertGreater(endpoints["my_teachers"]["mean_serialize_ms"], 0)
+        self.assertEqual(endpoints["submit_feedback"]["errors"], 0)
+
+        remaining = instrumentation.snapshot()["endpoints"]
+        self.assertEqual(list(remaining), ["admin_metrics"])
+
+    def test_async_views_are_measured(self):
+        client = AsyncClient()
+        client.cookies[settings.SESSION_COOKIE_NAME] = self.student_client(self.students[0]).session.session_key
+        async_to_sync(client.get)("/my-teachers/")
+        self.assertGreater(instrumentation.snapshot()["endpoints"]["my_teachers"]["max_queries"], 0)
+
+    @override_settings(FEEDBACK_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_their_slowest_query(self):
+        with self.assertLogs("feedback_app.instrumentation", "WARNING") as logs:
+            self.student_client(self.students[0]).get("/my-feedbacks/")
+        self.assertIn("/my-feedbacks/", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+
+# -------------------------------------
+# Connection pool
+# -------------------------------------
+class FakeConnection:
+
+    def __init__(self, broken=False):
+        self.broken = broken
+        self.closed = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        if self.broken:
+            raise OperationalError("connection lost")
+        return mock.Mock()
+
+    def rollback(self):
+        if self.broken:
+            raise OperationalError("connection lost")
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def make_pool(self, **options):
+        return db_pool.ConnectionPool("test", **{
+            "max_size": 2, "timeout": 0.05, "recycle": 60, "health_check_interval": 60, **options,
+        })
+
+    def test_released_connections_are_reused(self):
+        pool = self.make_pool()
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        self.assertIs(pool.acquire(FakeConnection), first)
+        self.assertEqual(first.rollbacks, 1)
+        self.assertEqual((pool.stats()["created"], pool.stats()["acquired"], pool.stats()["in_use"]), (1, 2, 1))
+
+    def test_pool_is_bounded(self):
+        pool = self.make_pool(max_size=1)
+        held = pool.acquire(FakeConnection)
+        with self.assertRaises(db_pool.PoolTimeout):
+            pool.acquire(FakeConnection)
+        self.assertEqual(pool.stats()["timeouts"], 1)
+
+        pool.timeout = 5
+        threading.Timer(0.05, pool.release, [held]).start()
+        self.assertIs(pool.acquire(FakeConnection), held)
+        self.assertEqual(pool.stats()["waits"], 1)
+        self.assertGreater(pool.stats()["max_wait_ms"], 0)
+
+    def test_old_connections_are_recycled(self):
+        pool = self.make_pool(recycle=0)
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        time.sleep(0.001)
+        self.assertIsNot(pool.acquire(FakeConnection), first)
+        self.assertTrue(first.closed)
+        self.assertEqual((pool.stats()["recycled"], pool.stats()["size"]), (1, 1))
+
+    def test_idle_connections_are_health_checked(self):
+        pool = self.make_pool(health_check_interval=0)
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+        first.broken = True
+        time.sleep(0.001)
+        self.assertIsNot(pool.acquire(FakeConnection), first)
+        self.assertEqual(pool.stats()["health_check_failures"], 1)
+
+    def test_broken_connections_are_discarded(self):
+        pool = self.make_pool()
+        broken = pool.acquire(lambda: FakeConnection(broken=True))
+        pool.release(broken)
+        discarded = pool.acquire(FakeConnection)
+        pool.release(discarded, discard=True)
+        self.assertTrue(broken.closed and discarded.closed)
+        self.assertEqual((pool.stats()["discarded"], pool.stats()["size"]), (2, 0))
+
+    def test_failed_opens_free_their_slot(self):
+        pool = self.make_pool(max_size=1)
+        with self.assertRaises(OperationalError):
+            pool.acquire(mock.Mock(side_effect=OperationalError("login failed")))
+        self.assertIsInstance(pool.acquire(FakeConnection), FakeConnection)
+
+    def test_pooled_backend_returns_connections_at_close(self):
+        class PooledSQLite(db_pool.PooledDatabaseWrapperMixin, SQLiteDatabaseWrapper):
+            pass
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_dict = {**connection.settings_dict, "NAME": os.path.join(directory.name, "pool.sqlite3"),
+                         "POOL": {"MAX_SIZE": 1}}
+        alias = f"pool-test-{id(self)}"
+        self.addCleanup(db_pool._pools.pop, alias, None)
+
+        wrapper = PooledSQLite(settings_dict, alias)
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        self.assertEqual(db_pool.stats()[alias]["idle"], 1)
+
+        wrapper.ensure_connection()
+        self.assertIs(wrapper.connection, raw)
+        wrapper.close()
+        self.assertEqual(db_pool.stats()[alias]["created"], 1)
+        db_pool.get_pool(alias, settings_dict).close_idle()
+
+
+# -------------------------------------
+# Startup
+# -------------------------------------
+class StartupTests(SimpleTestCase):
+
+    def test_ready_opens_no_connection(self):
+        with mock.patch("feedback_app.db.pool.startup_report") as report, \
+                mock.patch("feedback_app.student_lookup.warm") as warm, \
+                CaptureQueriesContext(connection) as queries:
+            apps.get_app_config("feedback_app").ready()
+        report.assert_not_called()
+        warm.assert_not_called()
+        self.assertEqual(queries.captured_queries, [])
+
+    def test_server_start_hooks(self):
+        with mock.patch("feedback_app.db.pool.startup_report") as report, \
+                mock.patch("feedback_app.write_behind.start_on_server_start") as worker, \
+                mock.patch("feedback_app.student_lookup.warm") as warm:
+            server_started()
+        report.assert_called_once()
+        worker.assert_called_once_with()
+        warm.assert_called_once_with()
+
+    def test_setup_honours_the_settings_option(self):
+        with mock.patch.dict(os.environ), mock.patch("django.setup") as setup:
+            startup_profile.setup(["manage.py", "check", "--settings=feedbacksystem.settings_bench", "--deploy"])
+            self.assertEqual(os.environ["DJANGO_SETTINGS_MODULE"], "feedbacksystem.settings_bench")
+        setup.assert_called_once_with()
+
+    def test_report_lists_the_slowest_modules(self):
+        timings = {"slow": [0.02, 0.03], "fast": [0.001, 0.001], "middle": [0.01, 0.05]}
+        stream = io.StringIO()
+        with mock.patch.multiple(startup_profile, _enabled=True, _started=time.perf_counter(), _timings=timings):
+            startup_profile.report("test", limit=2, stream=stream)
+        lines = stream.getvalue().splitlines()
+        self.assertIn("3 modules imported in 31.0 ms", lines[0])
+        self.assertEqual([line.split()[-1] for line in lines[2:]], ["slow", "middle"])
+
+        with mock.patch.object(startup_profile, "_enabled", False):
+            startup_profile.report("test", stream=stream)
+        self.assertEqual(len(stream.getvalue().splitlines()), 4)
+
+    def test_manage_py_profiles_with_the_given_settings(self):
+        manage = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "manage.py")
+        result = subprocess.run(
+            [sys.executable, manage, "check", "--settings=feedbacksystem.settings_bench"],
+            env={**os.environ, "FEEDBACK_STARTUP_PROFILE": "true", "FEEDBACK_STARTUP_PROFILE_LIMIT": "3"},
+            capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        profile = [line for line in result.stderr.splitlines() if line.startswith("[startup-profile]")]
+        self.assertIn("manage.py:", profile[0])
+        self.assertEqual(len(profile), 2 + 3)
+
+
+# -------------------------------------
+# Rating payload validation
+# -------------------------------------
+class RatingValidationTests(TestCase):
+    """``validate_feedback`` must accept and reject exactly what ``FeedbackSerializer`` does."""
+
+    VALID = {"subject_code": " cs101 ", "allocation_id": "7", **ratings(), "comments": " fine "}
+
+    CASES = [
+        {},
+        VALID,
+        {**VALID, "q1": 0},
+        {**VALID, "q2": 6},
+        {**VALID, "q3": "3"},
+        {**VALID, "q4": "3.0"},
+        {**VALID, "q5": 3.5},
+        {**VALID, "q6": "x"},
+        {**VALID, "q7": None},
+        {**VALID, "q8": ""},
+        {**VALID, "q9": True},
+        {**VALID, "q10": [3]},
+        {**VALID, "allocation_id": "seven"},
+        {**VALID, "allocation_id": ""},
+        {**VALID, "subject_code": ""},
+        {**VALID, "subject_code": "x" * (rating_schema.SUBJECT_CODE_MAX_LENGTH + 1)},
+        {**VALID, "subject_code": "cs\x00101"},
+        {**VALID, "comments": "y" * (rating_schema.COMMENTS_MAX_LENGTH + 1)},
+        {**VALID, "comments": None},
+    ]
+
+    def test_same_errors_and_cleaned_data_as_the_form(self):
+        for data in self.CASES:
+            with self.subTest(data=data):
+                form = FeedbackSerializer(data=data)
+                valid = form.is_valid()
+                cleaned, errors = rating_schema.validate_feedback(data)
+
+                self.assertEqual(errors, {field: list(messages) for field, messages in form.errors.items()})
+                if valid:
+                    self.assertEqual(cleaned, form.cleaned_data)
+
+    def test_payload_must_be_an_object(self):
+        self.assertEqual(rating_schema.validate_feedback([1, 2])[1], {"__all__": ["payload must be an object"]})
+
+
+# -------------------------------------
+# JSON responses
+# -------------------------------------
+@skipUnless(responses.orjson is not None, "orjson is not installed")
+class JsonResponseTests(CollegeTestCase):
+
+    PAYLOAD = {
+        "text": "café ☃ \"quoted\"",
+        "numbers": [0, -1, 2 ** 63 - 1, 1.5, True, None],
+        "tuple": (1, ("nested", 2)),
+        1: "int key",
+        "when": datetime.datetime(2024, 5, 6, 7, 8, 9, 123456),
+        "day": datetime.date(2024, 5, 6),
+        "decimal": decimal.Decimal("4.25"),
+        "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "error_list": ErrorList(["bad"]),
+        "lazy": gettext_lazy("This field is required."),
+    }
+
+    def test_backends_encode_the_same_values(self):
+        orjson_bytes = responses.orjson_dumps(self.PAYLOAD)
+        stdlib_bytes = responses.stdlib_dumps(self.PAYLOAD)
+        self.assertNotEqual(orjson_bytes, stdlib_bytes)
+        self.assertEqual(json.loads(orjson_bytes), json.loads(stdlib_bytes))
+
+    def test_unencodable_payload_falls_back_to_stdlib(self):
+        data = {"big": 2 ** 70}
+        self.assertEqual(responses.orjson_dumps(data), responses.stdlib_dumps(data))
+
+    def test_backend_setting(self):
+        for choice, expected in (("auto", "orjson"), ("orjson", "orjson"), ("stdlib", "stdlib")):
+            with self.subTest(choice=choice), override_settings(FEEDBACK_JSON_BACKEND=choice):
+                self.assertEqual(responses.backend(), expected)
+        with override_settings(FEEDBACK_JSON_BACKEND="simplejson"):
+            self.assertRaises(ValueError, responses.backend)
+
+    def test_backend_without_orjson(self):
+        with mock.patch.object(responses, "orjson", None):
+            self.assertEqual(responses.backend(), "stdlib")
+            with override_settings(FEEDBACK_JSON_BACKEND="orjson"):
+                self.assertRaises(ImportError, responses.backend)
+
+    def test_response_matches_django(self):
+        for kwargs in ({}, {"json_dumps_params": {"indent": 2}}, {"status": 201}):
+            with self.subTest(kwargs=kwargs):
+                ours = responses.JsonResponse(self.PAYLOAD, **kwargs)
+                django = DjangoJsonResponse(self.PAYLOAD, **kwargs)
+                self.assertEqual(ours.status_code, django.status_code)
+                self.assertEqual(ours["Content-Type"], django["Content-Type"])
+                self.assertEqual(json.loads(ours.content), json.loads(django.content))
+        self.assertEqual(
+            responses.JsonResponse(self.PAYLOAD, json_dumps_params={"indent": 2}).content,
+            DjangoJsonResponse(self.PAYLOAD, json_dumps_params={"indent": 2}).content,
+        )
+        self.assertRaises(TypeError, responses.JsonResponse, [1, 2])
+        self.assertEqual(json.loads(responses.JsonResponse([1, 2], safe=False).content), [1, 2])
+
+    def test_views_return_the_same_body_with_either_backend(self):
+        student = self.students[0]
+        self.submit(student, self.allocations[0])
+        client = self.student_client(student)
+        for path in ("/my-teachers/", "/my-feedbacks/"):
+            with self.subTest(path=path):
+                bodies = []
+                for choice in ("orjson", "stdlib"):
+                    with override_settings(FEEDBACK_JSON_BACKEND=choice):
+                        response = client.get(path)
+                    self.assertEqual(response.status_code, 200)
+                    bodies.append(json.loads(response.content))
+                self.assertEqual(bodies[0], bodies[1])
+
+
+# -------------------------------------
+# Conditional GET
+# -------------------------------------
+class ConditionalGetTests(CollegeTestCase):
+
+    def revalidate(self, client, path, etag):
+        return client.get(path, HTTP_IF_NONE_MATCH=etag)
+
+    def test_student_endpoints_answer_304_until_a_submission(self):
+        student = self.students[0]
+        client = self.token_client(student)
+        with override_settings(FEEDBACK_AUTH_MODE="token"):
+            for path in ("/my-teachers/", "/my-feedbacks/"):
+                with self.subTest(path=path):
+                    etag = client.get(path)["ETag"]
+
+                    response = self.revalidate(client, path, etag)
+                    self.assertEqual(response.status_code, 304)
+                    self.assertEqual(response.content, b"")
+                    self.assertEqual(response["ETag"], etag)
+
+            etags = {path: client.get(path)["ETag"] for path in ("/my-teachers/", "/my-feedbacks/")}
+            self.submit(student, self.allocations[0])
+            for path, etag in etags.items():
+                with self.subTest(path=path):
+                    self.assertEqual(self.revalidate(client, path, etag).status_code, 200)
+
+    def test_tree_change_in_another_worker_is_seen(self):
+        client = self.token_client(self.students[0])
+        with override_settings(FEEDBACK_AUTH_MODE="token"):
+            etag = client.get("/my-teachers/")["ETag"]
+
+            # Another worker renames a teacher: only the shared counter moves, this process's cache does not
+            Faculty_Teacher.objects.filter(pk="T1").update(FullName="Renamed")
+            feedback_cache.bump_table_versions(Faculty_Teacher)
+
+            response = self.revalidate(client, "/my-teachers/", etag)
+        self.assertEqual(response.status_code, 200)
+        names = [t["teacher_name"] for subject in response.json()["subjects"] for t in subject["teachers"]]
+        self.assertIn("Renamed", names)
+
+    def test_admin_table_page(self):
+        client = self.admin_client()
+        path = "/dashboard-admin/table/Faculty_Teacher/?page=1"
+        etag = client.get(path)["ETag"]
+        self.assertEqual(self.revalidate(client, path, etag).status_code, 304)
+        self.assertEqual(self.revalidate(client, path.replace("page=1", "page=2"), etag).status_code, 200)
+
+        response = client.post(
+            "/dashboard-admin/table/Faculty_Teacher/T2/update/",
+            json.dumps({"Designation": "Dean"}), content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.revalidate(client, path, etag).status_code, 200)
+
+    def test_admin_revalidation_reads_only_the_counter(self):
+        client = self.admin_client()
+        path = "/dashboard-admin/table/Users_Student/"
+        etag = client.get(path)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.revalidate(client, path, etag)
+        self.assertEqual(response.status_code, 304)
+        statements = [q["sql"] for q in queries.captured_queries]
+        self.assertEqual(len([sql for sql in statements if "Feedback_TableVersion" in sql]), 1)
+        self.assertFalse([sql for sql in statements if "COUNT(" in sql.upper() or "MAX(" in sql.upper()])
+        self.assertFalse([sql for sql in statements if '"Users_Student"' in sql])
+
+    def test_unconditional_request_gets_validators(self):
+        response = self.admin_client().get("/dashboard-admin/table/Users_Student/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"])
+        self.assertEqual(response["Cache-Control"], conditional.CACHE_CONTROL)
+
+    def test_imports_and_batch_edits_change_the_etag(self):
+        client = self.admin_client()
+        path = "/dashboard-admin/table/Users_Student/"
+        etag = client.get(path)["ETag"]
+
+        content = STUDENT_COLUMNS + "\n0827CS0100,New Student,M,new@acropolis.in,CSE,2,3,1,yes,2004-05-06"
+        response = client.post("/dashboard-admin/table/Users_Student/import/", {
+            "file": SimpleUploadedFile("roster.csv", content.encode(), content_type="text/csv"),
+        })
+        self.assertEqual(response.json()["created"], 1)
+        self.assertEqual(self.revalidate(client, path, etag).status_code, 200)
+
+        etag = client.get(path)["ETag"]
+        response = self.post_json(client, "/dashboard-admin/table/Users_Student/batch/", {
+            "action": "update", "pks": ["0827CS0001"], "patch": {"Section": "2"},
+        })
+        self.assertEqual(response.json()["updated"], 1)
+        self.assertEqual(self.revalidate(client, path, etag).status_code, 200)
+
+    def test_counter_table_follows_submissions(self):
+        client = self.admin_client()
+        path = "/dashboard-admin/table/Feedback_RatingRollup/"
+        self.submit(self.students[0], self.allocations[0])
+        etag = client.get(path)["ETag"]
+
+        self.submit(self.students[1], self.allocations[0])
+
+        self.assertEqual(self.revalidate(client, path, etag).status_code, 200)
+
+    def test_cascaded_delete_changes_related_tables(self):
+        client = self.admin_client()
+        self.submit(self.students[0], self.allocations[0])
+        path = "/dashboard-admin/table/Academic_Allocation/"
+        etag = client.get(path)["ETag"]
+
+        self.assertEqual(client.post("/dashboard-admin/table/Faculty_Teacher/T1/delete/").status_code, 200)
+
+        self.assertEqual(self.revalidate(client, path, etag).status_code, 200)
+
+
+# -------------------------------------
+# Admin table rows
+# -------------------------------------
+class AdminTableDataTests(CollegeTestCase):
+
+    def rows(self, table, query=""):
+        response = self.admin_client().get(f"/dashboard-admin/table/{table}/?{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_rows_match_the_model_instances(self):
+        self.submit(self.students[0], self.allocations[0])
+        for schema in admin_schema.all_tables():
+            with self.subTest(table=schema.table_name):
+                expected = [
+                    {
+                        name: value.isoformat() if isinstance(value, (datetime.date, datetime.time)) else value
+                        for name, value in ((name, getattr(obj, attname))
+                                            for name, attname in zip(schema.fields, schema.attnames))
+                    }
+                    for obj in schema.model.objects.order_by("pk")
+                ]
+                self.assertEqual(self.rows(schema.table_name, "nopaginate=true&sort_by=pk"), expected)
+
+    def test_foreign_keys_are_ids(self):
+        allocation = self.allocations[0]
+        row = next(r for r in self.rows("Academic_Allocation") if r["AllocationID"] == allocation.pk)
+        self.assertEqual((row["TeacherID"], row["SubjectCode"]), ("T1", "CS101"))
+
+    def test_query_count_does_not_grow_with_rows(self):
+        client = self.admin_client()
+
+        def query_counts():
+            counts = []
+            for query in ("page_size=100", "pagination=cursor&page_size=100"):
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(f"/dashboard-admin/table/Users_Student/?{query}")
+                self.assertEqual(response.status_code, 200)
+                counts.append(len(queries))
+            return counts
+
+        before = query_counts()
+        Users_Student.objects.bulk_create(
+            Users_Student(
+                EnrollmentNo=f"0827CS{1000 + i:04d}", FullName="Extra", Gender="M", Email=f"extra{i}@acropolis.in",
+                Branch="CSE", Year=2, Semester=3, Section=1,
+            )
+            for i in range(20)
+        )
+        self.assertEqual(query_counts(), before)
+
+    def test_cursor_pages_serialize_like_offset_pages(self):
+        offset = self.rows("Users_Student", "page_size=3")
+        cursor = self.rows("Users_Student", "pagination=cursor&page_size=3")
+        self.assertEqual(cursor, offset)
@@ -1,23 +1,80 @@
-from django.http import JsonResponse
-from django.db import connections
-from django.db.utils import DatabaseError
-from django.views.decorators.http import require_POST, require_GET
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.views.decorators.http import require_POST, require_GET, etag
 from django.views.decorators.csrf import csrf_exempt
+from django.conf import settings
+from django.apps import apps
+from django.utils.http import http_date
 from django.core.exceptions import ValidationError
-from django.db import transaction
+import asyncio
+import csv
 import json
-from feedback_app.serializers import LoginSerializer, FeedbackSerializer
-from feedback_app.models.feedback_response import Feedback_Response
+import time
+from feedback_app.responses import JsonResponse, dumps as dump_json
+from feedback_app.serializers import LoginSerializer
+from feedback_app import rating_schema
 from feedback_app.models.feedback_submissionlog import Feedback_SubmissionLog
 from feedback_app.models.academic_allocation import Academic_Allocation
-from feedback_app.models.users_student import Users_Student
+from feedback_app import cache as feedback_cache
+from feedback_app.rating_schema import RATING_KEYS
+from feedback_app.submissions import write_submissions
+from feedback_app import write_behind
+from feedback_app import rollup
+from feedback_app import live_feed
+from feedback_app import progress
+from feedback_app import analytics
+from feedback_app import pagination
+from feedback_app import table_stats
+from feedback_app import search
+from feedback_app import admin_schema
+from feedback_app import admin_batch
+from feedback_app import roster_import
+from feedback_app import student_lookup
+from feedback_app import student_auth
+from feedback_app import instrumentation
+from feedback_app import health
+from feedback_app import conditional
+from feedback_app.db import pool as db_pool
 from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+def set_session_cookie(request, response):
+    """
+    Set the cookie for a session that was already saved in the view and mark it
+    clean, so SessionMiddleware does not write the same session a second time.
+    """
+    session = request.session
+    max_age = session.get_expiry_age()
+    response.set_cookie(
+        settings.SESSION_COOKIE_NAME,
+        session.session_key,
+        max_age=max_age,
+        expires=http_date(time.time() + max_age),
+        domain=settings.SESSION_COOKIE_DOMAIN,
+        path=settings.SESSION_COOKIE_PATH,
+        secure=settings.SESSION_COOKIE_SECURE or None,
+        httponly=settings.SESSION_COOKIE_HTTPONLY or None,
+        samesite=settings.SESSION_COOKIE_SAMESITE,
+    )
+    session.modified = False
 
 def login_required_api(view_func):
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            identity = await student_auth.aauthenticate(request)
+            if identity is None:
+                return JsonResponse({"status": "error", "error": "not authenticated please login"}, status=401)
+            request.student = identity
+            return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not request.session.get("is_authenticated"):
+        identity = student_auth.authenticate(request)
+        if identity is None:
             return JsonResponse({"status": "error", "error": "not authenticated please login"}, status=401)
+        request.student = identity
         return view_func(request, *args, **kwargs)
     return wrapper
 
@@ -85,29 +142,38 @@ def login(request):
     email = serializer.cleaned_data.get('email')
     dob = serializer.cleaned_data.get('dob')  # datetime.date
 
-    try:
-        user = Users_Student.objects.get(Email__iexact=email)
-    except Users_Student.DoesNotExist:
+    # Indexed lookup; the row was validated when it was written, so no full_clean() per login
+    user = student_lookup.find_student(email)
+    if user is None:
         return JsonResponse({'status': 'error', 'error': 'invalid credentials'}, status=401)
 
-    try:
-        user.full_clean()
-    except ValidationError as ve:
-        return JsonResponse({'status': 'error', 'error': 'user data invalid', 'details': ve.message_dict}, status=400)
-
     if hasattr(user, 'IsActive') and not user.IsActive:
         return JsonResponse({'status': 'error', 'error': 'account inactive'}, status=403)
 
     user_dob = user.DateOfBirth
+    if user_dob and user_dob == dob and student_auth.token_mode():
+        # Stateless mode: a signed token carrying the cohort, no session row
+        token = student_auth.issue_token(user)
+        response = JsonResponse({
+            'status': 'ok',
+            'message': 'login successful',
+            'EnrollmentNo': user.EnrollmentNo,
+            'FullName': user.FullName,
+            'Email': user.Email,
+            'token': token,
+        })
+        student_auth.set_token_cookie(response, token)
+        return response
+
     if user_dob and user_dob == dob:
         request.session['user_enrollment'] = user.EnrollmentNo
         request.session['user_email'] = user.Email
         request.session['user_fullname'] = user.FullName
         request.session['is_authenticated'] = True
         request.session.set_expiry(24 * 3600)
+        # Saved here because the response carries the session key
         request.session.save()
-        request.session.modified = True
-        return JsonResponse({
+        response = JsonResponse({
             'status': 'ok',
             'message': 'login successful',
             'EnrollmentNo': user.EnrollmentNo,
@@ -115,6 +181,8 @@ def login(request):
             'Email': user.Email,
             'session_key': request.session.session_key,
         })
+        set_session_cookie(request, response)
+        return response
 
     return JsonResponse({'status': 'error', 'error': 'invalid credentials'}, status=401)
 
@@ -123,11 +191,18 @@ def login(request):
 @csrf_exempt
 @require_POST
 def logout(request):
+    response = JsonResponse({"status": "ok", "message": "logged out successfully"})
+
+    if student_auth.token_mode():
+        # Deny the token for the rest of its lifetime
+        student_auth.revoke_token(student_auth.authenticate(request))
+        response.delete_cookie(student_auth.cookie_name())
+        return response
+
     # Clear session data
     request.session.flush()
 
     # Remove cookie from client
-    response = JsonResponse({"status": "ok", "message": "logged out successfully"})
     response.delete_cookie('sessionid')
 
     return response
@@ -136,83 +211,75 @@ def logout(request):
 
 @require_GET
 @login_required_api
-def my_teachers(request):
+async def my_teachers(request):
     """
     Return subjects and their assigned teachers for the logged-in student.
     Matches student Branch, Year, Section, and Semester with Academic_Allocation.
+    Async: the worker is not held while the queries are in flight.
     """
 
-    enrollment = request.session.get("user_enrollment")
-    if not enrollment:
-        return JsonResponse({"status": "error", "error": "not authenticated"}, status=401)
-
-    try:
-        student = Users_Student.objects.get(EnrollmentNo=enrollment)
-    except Users_Student.DoesNotExist:
+    # Token mode carries the cohort; session mode loads it from Users_Student
+    student = await student_auth.awith_cohort(request.student)
+    if student is None:
         return JsonResponse({"status": "error", "error": "student not found"}, status=404)
 
-    branch = student.Branch
-    year = student.Year
-    semester = student.Semester
-    section = student.Section
+    enrollment = student.enrollment_no
+    branch, year, semester, section = student.branch, student.year, student.semester, student.section
 
     if not branch or not year or not semester or not section:
         return JsonResponse({"status": "error", "error": "student data incomplete"}, status=400)
 
-    qs = Academic_Allocation.objects.select_related("TeacherID", "SubjectCode") \
-        .filter(
-            TargetBranch__iexact=branch,
-            Target_Year=year,
-            Target_Section=section,
-            Target_Semester=semester,
-            SubjectCode__Semester=semester,          # subject's Semester matches student
-            SubjectCode__Branch__iexact=branch       # subject's Branch matches student
-        ) \
-    .order_by("SubjectCode__SubjectCode")
-
-    # Get all submitted allocations for this student to show status
-    submitted_allocations = set(
-        Feedback_SubmissionLog.objects.filter(EnrollmentNo=enrollment)
-        .values_list("AllocationID", flat=True)
-    )
+    # Submissions still waiting in the journal count as submitted
+    queued = set()
+    if write_behind.is_enabled():
+        queued = await sync_to_async(write_behind.get_queue().queued_allocations)(enrollment)
 
-    subjects_map = {}
+    # Conditional GET: allocation tree version + the student's submission log
+    tree_version = await feedback_cache.atree_version()
 
-    for alloc in qs:
-        subj = alloc.SubjectCode
-        teacher = alloc.TeacherID
+    def make_etag(last_log_id, log_count):
+        return conditional.make_etag(
+            "my-teachers", enrollment, branch, year, semester, section,
+            tree_version, last_log_id, log_count, sorted(queued)
+        )
 
-        if not subj or not teacher:
-            continue
+    if conditional.is_conditional(request):
+        log_stamp = await conditional.alog_stamp(enrollment)
+        response = conditional.not_modified(request, make_etag(log_stamp["last_id"], log_stamp["count"]))
+        if response is not None:
+            return response
 
-        key = subj.SubjectCode
+    # Subject/teacher tree is shared by the whole cohort and served from cache
+    tree = await sync_to_async(feedback_cache.get_allocation_tree)(branch, year, semester, section, tree_version)
 
-        if key not in subjects_map:
-            subjects_map[key] = {
-                "subject_code": subj.SubjectCode,
-                "subject_name": subj.SubjectName,
-                "semester": subj.Semester,
-                "branch": subj.Branch,
-                "teachers": []
-            }
-
-        subjects_map[key]["teachers"].append({
-            "allocation_id": alloc.AllocationID,
-            "teacher_id": teacher.TeacherID,
-            "teacher_name": teacher.FullName,
-            "designation": teacher.Designation,
-            "is_submitted": alloc.AllocationID in submitted_allocations
-        })
-
-    return JsonResponse({
+    # Get all submitted allocations for this student to show status
+    logs = [
+        row async for row in
+        Feedback_SubmissionLog.objects.filter(EnrollmentNo=enrollment).values_list("AllocationID", "LogID")
+    ]
+    submitted_allocations = {allocation_id for allocation_id, _ in logs} | queued
+    etag = make_etag(max((log_id for _, log_id in logs), default=None), len(logs))
+
+    subjects = [
+        {
+            **subject,
+            "teachers": [
+                {**teacher, "is_submitted": teacher["allocation_id"] in submitted_allocations}
+                for teacher in subject["teachers"]
+            ],
+        }
+        for subject in tree
+    ]
+
+    return conditional.set_validators(JsonResponse({
         "status": "ok",
         "enrollment": enrollment,
         "branch": branch,
         "year": year,
         "semester": semester,
         "section": section,
-        "subjects": list(subjects_map.values())
-    })
+        "subjects": subjects
+    }), etag)
 
 
 
@@ -249,28 +316,23 @@ def submit_feedback(request):
         payload = request.POST.dict() or request.GET.dict()
 
     # -------------------------------------
-    # 2. Validate With Serializer
+    # 2. Validate (same rules and errors as FeedbackSerializer)
     # -------------------------------------
-    form = FeedbackSerializer(data=payload)
-    if not form.is_valid():
-        return JsonResponse({"status": "error", "errors": form.errors}, status=400)
+    cleaned, errors = rating_schema.validate_feedback(payload)
+    if errors:
+        return JsonResponse({"status": "error", "errors": errors}, status=400)
 
-    allocation_id = form.cleaned_data.get("allocation_id")
-    subject_code = form.cleaned_data.get("subject_code")
-    comments = form.cleaned_data.get("comments")
+    allocation_id = cleaned["allocation_id"]
+    subject_code = cleaned["subject_code"]
+    comments = cleaned["comments"]
 
-    ratings = {f"q{i}": form.cleaned_data.get(f"q{i}") for i in range(1, 11)}
+    ratings = {key: cleaned[key] for key in RATING_KEYS}
 
     # -------------------------------------
     # 3. Get Student
     # -------------------------------------
-    enrollment_no = request.session.get("user_enrollment")
-    if not enrollment_no:
-        return JsonResponse({"status": "error", "error": "not authenticated"}, status=401)
-
-    try:
-        student = Users_Student.objects.get(EnrollmentNo=enrollment_no)
-    except Users_Student.DoesNotExist:
+    student = student_auth.with_cohort(request.student)
+    if student is None:
         return JsonResponse({"status": "error", "error": "student not found"}, status=404)
 
     # -------------------------------------
@@ -299,10 +361,10 @@ def submit_feedback(request):
     # 6. Allocation must belong to student's class
     # -------------------------------------
     if (
-        alloc.TargetBranch.lower() != student.Branch.lower()
-        or alloc.Target_Year != student.Year
-        or alloc.Target_Section != student.Section
-        or alloc.Target_Semester != student.Semester
+        alloc.TargetBranch.lower() != student.branch.lower()
+        or alloc.Target_Year != student.year
+        or alloc.Target_Section != student.section
+        or alloc.Target_Semester != student.semester
     ):
         return JsonResponse({
             "status": "error",
@@ -313,7 +375,7 @@ def submit_feedback(request):
     # 7. Check duplicate feedback
     # -------------------------------------
     if Feedback_SubmissionLog.objects.filter(
-        EnrollmentNo=student, AllocationID=alloc
+        EnrollmentNo_id=student.enrollment_no, AllocationID=alloc
     ).exists():
         return JsonResponse({
             "status": "error",
@@ -321,34 +383,39 @@ def submit_feedback(request):
         }, status=409)
 
     # -------------------------------------
-    # 8. Save feedback atomically
+    # 8a. Write-behind mode: journal and acknowledge
     # -------------------------------------
-    try:
-        with transaction.atomic():
-
-            feedback = Feedback_Response(
-                AllocationID=alloc,
-                Q1_Rating=ratings["q1"],
-                Q2_Rating=ratings["q2"],
-                Q3_Rating=ratings["q3"],
-                Q4_Rating=ratings["q4"],
-                Q5_Rating=ratings["q5"],
-                Q6_Rating=ratings["q6"],
-                Q7_Rating=ratings["q7"],
-                Q8_Rating=ratings["q8"],
-                Q9_Rating=ratings["q9"],
-                Q10_Rating=ratings["q10"],
-                Comments=comments or None
-            )
-            feedback.full_clean()
-            feedback.save()
-
-            Feedback_SubmissionLog.objects.create(
-                ResponseID=feedback,
-                EnrollmentNo=student,
-                AllocationID=alloc
-            )
+    if write_behind.is_enabled():
+        try:
+            write_behind.get_queue().enqueue([{
+                "enrollment_no": student.enrollment_no,
+                "allocation_id": alloc.AllocationID,
+                "ratings": ratings,
+                "comments": comments,
+            }])
+        except write_behind.DuplicateSubmission:
+            return JsonResponse({
+                "status": "error",
+                "error": "feedback already submitted"
+            }, status=409)
+        write_behind.ensure_worker()
+
+        return JsonResponse({
+            "status": "accepted",
+            "message": "feedback queued",
+            "allocation_id": alloc.AllocationID
+        }, status=202)
 
+    # -------------------------------------
+    # 8b. Save feedback atomically (same write path as the batch endpoint)
+    # -------------------------------------
+    try:
+        write_submissions([{
+            "enrollment_no": student.enrollment_no,
+            "allocation_id": alloc.AllocationID,
+            "ratings": ratings,
+            "comments": comments,
+        }])
     except Exception as e:
         return JsonResponse({
             "status": "error",
@@ -363,15 +430,186 @@ def submit_feedback(request):
     })
 
 
+MAX_BATCH_SUBMISSIONS = 50
+
+
+@csrf_exempt
+@require_POST
+@login_required_api
+def submit_feedback_batch(request):
+    """
+    Student submits feedback for several allocations in one request.
+    Body: {"feedbacks": [{allocation_id, subject_code, q1..q10, comments}, ...]}
+    (a bare JSON list is accepted too). Valid items are saved in one
+    transaction; the response reports a status per item.
+    """
+
+    # -------------------------------------
+    # 1. Parse Input (JSON only)
+    # -------------------------------------
+    try:
+        payload = json.loads((request.body or b"").decode("utf-8") or "{}")
+    except Exception:
+        return JsonResponse({"status": "error", "error": "invalid JSON"}, status=400)
+
+    items = payload.get("feedbacks") if isinstance(payload, dict) else payload
+    if not isinstance(items, list) or not items:
+        return JsonResponse({"status": "error", "error": "feedbacks must be a non-empty list"}, status=400)
+
+    if len(items) > MAX_BATCH_SUBMISSIONS:
+        return JsonResponse({
+            "status": "error",
+            "error": f"at most {MAX_BATCH_SUBMISSIONS} feedbacks per request"
+        }, status=400)
+
+    # -------------------------------------
+    # 2. Get Student
+    # -------------------------------------
+    student = student_auth.with_cohort(request.student)
+    if student is None:
+        return JsonResponse({"status": "error", "error": "student not found"}, status=404)
+
+    # -------------------------------------
+    # 3. Validate every item
+    # -------------------------------------
+    results = [None] * len(items)
+    valid = []  # (index, cleaned_data)
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {"index": index, "status": "error", "error": "item must be an object"}
+            continue
+
+        cleaned, errors = rating_schema.validate_feedback(item)
+        if errors:
+            results[index] = {
+                "index": index,
+                "allocation_id": item.get("allocation_id"),
+                "status": "error",
+                "errors": errors
+            }
+            continue
+
+        valid.append((index, cleaned))
+
+    # -------------------------------------
+    # 4. Preload allocations and existing submissions (one query each)
+    # -------------------------------------
+    allocation_ids = {data["allocation_id"] for _, data in valid}
+
+    allocations = Academic_Allocation.objects.in_bulk(allocation_ids) if allocation_ids else {}
+    already_submitted = set(
+        Feedback_SubmissionLog.objects.filter(
+            EnrollmentNo_id=student.enrollment_no, AllocationID__in=allocation_ids
+        ).values_list("AllocationID", flat=True)
+    ) if allocation_ids else set()
+    if write_behind.is_enabled() and allocation_ids:
+        # Submissions still waiting in the journal are duplicates too
+        already_submitted |= write_behind.get_queue().queued_allocations(
+            student.enrollment_no, allocation_ids
+        )
+
+    entries = []
+    entry_indexes = []
+
+    for index, data in valid:
+        allocation_id = data["allocation_id"]
+        alloc = allocations.get(allocation_id)
+
+        error = None
+        if alloc is None:
+            error = ("Invalid allocation_id", 404)
+        elif alloc.SubjectCode_id != data["subject_code"]:
+            error = ("subject mismatch for allocation_id", 403)
+        elif (
+            alloc.TargetBranch.lower() != student.branch.lower()
+            or alloc.Target_Year != student.year
+            or alloc.Target_Section != student.section
+            or alloc.Target_Semester != student.semester
+        ):
+            error = ("allocation_id does not belong to logged-in student", 403)
+        elif allocation_id in already_submitted:
+            error = ("feedback already submitted", 409)
+
+        if error:
+            results[index] = {
+                "index": index,
+                "allocation_id": allocation_id,
+                "status": "error",
+                "error": error[0],
+                "code": error[1]
+            }
+            continue
+
+        # Later items in the same batch for this allocation are duplicates
+        already_submitted.add(allocation_id)
+        entries.append({
+            "enrollment_no": student.enrollment_no,
+            "allocation_id": allocation_id,
+            "ratings": {key: data[key] for key in RATING_KEYS},
+            "comments": data.get("comments"),
+        })
+        entry_indexes.append(index)
+
+    # -------------------------------------
+    # 5. Save all valid feedback atomically (or journal them)
+    # -------------------------------------
+    queued = write_behind.is_enabled()
+    if queued and entries:
+        queue = write_behind.get_queue()
+        try:
+            queue.enqueue(entries)
+        except write_behind.DuplicateSubmission:
+            return JsonResponse({"status": "error", "error": "feedback already submitted"}, status=409)
+        write_behind.ensure_worker()
+    else:
+        try:
+            write_submissions(entries)
+        except Exception as e:
+            return JsonResponse({
+                "status": "error",
+                "error": "failed to save feedback",
+                "details": str(e)
+            }, status=500)
+
+    for index, entry in zip(entry_indexes, entries):
+        results[index] = {
+            "index": index,
+            "allocation_id": entry["allocation_id"],
+            "status": "queued" if queued else "ok"
+        }
+
+    return JsonResponse({
+        "status": "accepted" if queued else "ok",
+        "submitted": len(entries),
+        "failed": len(items) - len(entries),
+        "results": results
+    }, status=202 if queued else 200)
+
+
 @require_GET
 @login_required_api
-def my_feedbacks(request):
+async def my_feedbacks(request):
     """
     Return a list of feedbacks submitted by the logged-in student.
     Includes teacher and subject details along with ratings.
     """
-    enrollment = request.session.get("user_enrollment")
-    
+    enrollment = request.student.enrollment_no
+
+    # Conditional GET: the student's latest submission; teacher/subject names follow the allocation tree version
+    tree_version = await feedback_cache.atree_version()
+
+    def make_etag(last_log_id, log_count):
+        return conditional.make_etag("my-feedbacks", enrollment, tree_version, last_log_id, log_count)
+
+    if conditional.is_conditional(request):
+        log_stamp = await conditional.alog_stamp(enrollment)
+        response = conditional.not_modified(
+            request, make_etag(log_stamp["last_id"], log_stamp["count"]), log_stamp["last_at"]
+        )
+        if response is not None:
+            return response
+
     # Filter logs for this student
     logs = Feedback_SubmissionLog.objects.filter(EnrollmentNo=enrollment).select_related(
         "ResponseID", 
@@ -380,7 +618,7 @@ def my_feedbacks(request):
     ).order_by("-Timestamp")
 
     results = []
-    for log in logs:
+    async for log in logs:
         resp = log.ResponseID
         alloc = log.AllocationID
         teacher = alloc.TeacherID
@@ -407,22 +645,35 @@ def my_feedbacks(request):
             "comments": resp.Comments
         })
 
-    return JsonResponse({
+    # Same validators as alog_stamp(), taken from the rows just read
+    etag = make_etag(max((r["log_id"] for r in results), default=None), len(results))
+    last_modified = max((r["timestamp"] for r in results), default=None)
+
+    return conditional.set_validators(JsonResponse({
         "status": "ok",
         "feedbacks": results
-    })
+    }), etag, last_modified)
 
 
-def check_db_connection_and_list_tables():
-    try:
-        with connections['default'].cursor() as cur:
-            # lightweight check
-            cur.execute("SELECT 1")
-        print("database connection successful")
-    except DatabaseError:
-        print("connection failed")
+# ============================================
+# HEALTH ENDPOINTS
+# ============================================
 
-check_db_connection_and_list_tables()
+@require_GET
+def healthz(request):
+    """Liveness: the process serves requests; never touches the database"""
+    return JsonResponse({"status": "ok", **health.liveness()})
+
+
+@require_GET
+def readyz(request):
+    """Readiness: database and cache reachable (result cached for FEEDBACK_READY_CACHE_SECONDS)"""
+    ready, checks, age = health.readiness()
+    return JsonResponse({
+        "status": "ok" if ready else "error",
+        "checks": checks,
+        "age_s": age
+    }, status=200 if ready else 503)
 
 
 # ============================================
@@ -430,10 +681,17 @@ check_db_connection_and_list_tables()
 # ============================================
 
 import os
-from django.apps import apps
 
 def admin_required(view_func):
     """Decorator to check if user is admin"""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            if not await request.session.aget("is_admin"):
+                return JsonResponse({"status": "error", "error": "admin access required"}, status=403)
+            return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
         if not request.session.get("is_admin"):
@@ -480,30 +738,23 @@ def admin_login(request):
 @require_GET
 @admin_required
 def admin_list_tables(request):
-    """List all database tables"""
+    """List all database tables with row counts (one query, briefly cached; exact=true for COUNT(*))"""
     try:
-        # Get all models from the app
-        models = apps.get_app_config('feedback_app').get_models()
-        
+        schemas = admin_schema.all_tables()
+        exact = request.GET.get('exact', 'false').lower() == 'true'
+        counts, is_estimate = table_stats.row_counts([s.model for s in schemas], exact=exact)
+
         tables = []
-        for model in models:
-            table_name = model._meta.db_table
-            model_name = model.__name__
-            
-            # Get row count
-            try:
-                count = model.objects.count()
-            except:
-                count = 0
-            
+        for schema in schemas:
             tables.append({
-                "table_name": table_name,
-                "model_name": model_name,
-                "row_count": count
+                "table_name": schema.table_name,
+                "model_name": schema.model_name,
+                "row_count": counts.get(schema.table_name, 0)
             })
         
         return JsonResponse({
             "status": "ok",
+            "row_count_is_estimate": is_estimate,
             "tables": sorted(tables, key=lambda x: x['model_name'])
         })
     except Exception as e:
@@ -513,67 +764,355 @@ def admin_list_tables(request):
         }, status=500)
 
 
+@require_GET
+@admin_required
+def admin_queue_stats(request):
+    """Depth, drain lag and dead rows of the write-behind submission queue"""
+    try:
+        queue = write_behind.get_queue()
+        stats = queue.stats()
+        stats["dead_rows"] = queue.dead_rows(limit=50)
+    except Exception as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=500)
+
+    return JsonResponse({"status": "ok", "queue": stats})
+
+
+@csrf_exempt
+@require_POST
+@admin_required
+def admin_queue_requeue(request):
+    """
+    Give dead write-behind rows a fresh set of attempts.
+    Body: {"ids": [...]} for specific journal rows, or {} for every dead row
+    """
+    try:
+        payload = json.loads(request.body or b"{}")
+    except Exception:
+        return JsonResponse({"status": "error", "error": "invalid JSON"}, status=400)
+    ids = payload.get("ids") if isinstance(payload, dict) else None
+    if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, int) for i in ids)):
+        return JsonResponse({"status": "error", "error": "ids must be a list of integers"}, status=400)
+
+    try:
+        requeued = write_behind.get_queue().requeue_dead(ids)
+    except Exception as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=500)
+
+    write_behind.ensure_worker()
+    return JsonResponse({"status": "ok", "requeued": requeued})
+
+
+@require_GET
+@admin_required
+def admin_metrics(request):
+    """Per-URL request latency / query count histograms, slowest statements and DB pool stats for this process"""
+    reset = request.GET.get('reset', 'false').lower() == 'true'
+    return JsonResponse({
+        "status": "ok",
+        **instrumentation.snapshot(reset=reset),
+        "db_pools": db_pool.stats(),
+    })
+
+
+@require_GET
+@admin_required
+def admin_rating_report(request):
+    """Rating mean / stddev / response rate per teacher, subject, branch, semester or allocation"""
+    group_by = request.GET.get('group_by', 'teacher')
+    if group_by not in rollup.REPORT_GROUPS:
+        return JsonResponse({
+            "status": "error",
+            "error": f"group_by must be one of {', '.join(rollup.REPORT_GROUPS)}"
+        }, status=400)
+
+    try:
+        semester = int(request.GET['semester']) if request.GET.get('semester') else None
+    except ValueError:
+        return JsonResponse({"status": "error", "error": "semester must be an integer"}, status=400)
+
+    try:
+        groups = rollup.summarize(group_by, branch=request.GET.get('branch'), semester=semester)
+    except Exception as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=500)
+
+    return JsonResponse({
+        "status": "ok",
+        "group_by": group_by,
+        "groups": groups
+    })
+
+
+LIVE_FEED_KEEPALIVE = 15  # seconds between SSE comments on an idle stream
+
+
+def _sse(event, data, event_id=None):
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("data: " + dump_json(data).decode())
+    return "\n".join(lines) + "\n\n"
+
+
+@require_GET
+@admin_required
+async def admin_live_feed(request):
+    """
+    Server-sent events: a `snapshot` of per-allocation aggregates, then one
+    `submission` event per feedback committed in this process. ASGI only.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({
+            "status": "error",
+            "error": "the live feed needs the ASGI server; poll dashboard-admin/reports/ratings/?group_by=allocation",
+            "poll": "/dashboard-admin/reports/ratings/?group_by=allocation",
+        }, status=501)
+
+    subscription = live_feed.broker.subscribe()
+    try:
+        snapshot = await sync_to_async(live_feed.broker.snapshot)()
+    except Exception:
+        live_feed.broker.unsubscribe(subscription)
+        raise
+
+    async def stream():
+        try:
+            yield _sse("snapshot", {"allocations": snapshot})
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), LIVE_FEED_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event["type"], event, event["id"])
+        finally:
+            live_feed.broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # let nginx pass events through unbuffered
+    return response
+
+
+def _int_params(params, names):
+    """Optional integer query parameters; raises ValueError naming the bad one."""
+    values = {}
+    for name in names:
+        raw = params.get(name)
+        try:
+            values[name] = int(raw) if raw else None
+        except ValueError:
+            raise ValueError(f"{name} must be an integer")
+    return values
+
+
+@require_GET
+@admin_required
+def admin_progress_report(request):
+    """Expected vs received submissions per cohort (Branch/Year/Semester/Section), least complete first"""
+    try:
+        filters = _int_params(request.GET, ('year', 'semester', 'section'))
+    except ValueError as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=400)
+
+    try:
+        cohorts = progress.cohort_summary(
+            branch=request.GET.get('branch'),
+            incomplete_only=request.GET.get('incomplete', 'false').lower() == 'true',
+            **filters
+        )
+    except Exception as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=500)
+
+    response = {"status": "ok", "cohorts": cohorts}
+    if not cohorts and not progress.counters_built():
+        response["message"] = "progress counters are empty; run manage.py rebuild_cohort_progress"
+    return JsonResponse(response)
+
+
+@require_GET
+@admin_required
+def admin_progress_cohort(request):
+    """Per-allocation completion and pending students for one cohort (optionally one allocation)"""
+    try:
+        params = _int_params(request.GET, ('year', 'semester', 'section', 'allocation_id'))
+    except ValueError as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=400)
+
+    branch = (request.GET.get('branch') or '').strip()
+    if not branch or None in (params['year'], params['semester'], params['section']):
+        return JsonResponse({
+            "status": "error",
+            "error": "branch, year, semester and section are required"
+        }, status=400)
+
+    try:
+        detail = progress.cohort_detail(
+            branch, params['year'], params['semester'], params['section'],
+            allocation_id=params['allocation_id']
+        )
+    except Exception as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=500)
+
+    return JsonResponse({"status": "ok", **detail})
+
+
+@require_GET
+@admin_required
+def admin_analytics_report(request):
+    """Per-question and per-group rating statistics (means, histograms, percentiles, z-scores)"""
+    if not analytics.is_available():
+        return JsonResponse({"status": "error", "error": "numpy is required for analytics"}, status=501)
+
+    group_by = request.GET.get('group_by', 'teacher')
+    if group_by not in analytics.GROUP_COLUMNS:
+        return JsonResponse({
+            "status": "error",
+            "error": f"group_by must be one of {', '.join(analytics.GROUP_COLUMNS)}"
+        }, status=400)
+
+    try:
+        semester = int(request.GET['semester']) if request.GET.get('semester') else None
+    except ValueError:
+        return JsonResponse({"status": "error", "error": "semester must be an integer"}, status=400)
+
+    try:
+        matrix = analytics.load_matrix(branch=request.GET.get('branch'), semester=semester)
+        questions = analytics.question_summary(matrix)
+        groups = analytics.group_report(matrix, group_by)
+    except Exception as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=500)
+
+    return JsonResponse({
+        "status": "ok",
+        "group_by": group_by,
+        "responses": len(matrix),
+        "questions": questions,
+        "groups": groups
+    })
+
+
+@require_GET
+@admin_required
+@etag(lambda request: admin_schema.etag())
+def admin_schema_view(request):
+    """Field list and form metadata for every admin table (cacheable, ETag-validated)"""
+    tables = admin_schema.all_tables()
+    table_name = request.GET.get('table')
+    if table_name:
+        schema = admin_schema.get_schema(table_name)
+        if not schema:
+            return JsonResponse({
+                "status": "error",
+                "error": f"table '{table_name}' not found"
+            }, status=404)
+        tables = [schema]
+
+    response = JsonResponse({
+        "status": "ok",
+        "tables": [schema.as_dict() for schema in tables]
+    })
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _filtered_table_queryset(model, params):
+    """Apply the admin table `search` / `sort_by` / `order` query parameters to a model's rows"""
+    sort_by = params.get('sort_by')
+    order = params.get('order', 'asc')
+    search_term = params.get('search', '')
+
+    # Initial queryset
+    queryset = model.objects.all()
+
+    # Apply Search (index-friendly exact/prefix predicates, see feedback_app.search)
+    if search_term:
+        queryset = queryset.filter(search.build_search_q(model, search_term))
+
+    # Apply Sorting
+    if sort_by:
+        # Validate field exists
+        field_names = [f.name for f in model._meta.get_fields()]
+        if sort_by in field_names:
+            if order == 'desc':
+                queryset = queryset.order_by(f'-{sort_by}')
+            else:
+                queryset = queryset.order_by(sort_by)
+
+    return queryset
+
+
 @require_GET
 @admin_required
 def admin_get_table_data(request, table_name):
     """Get data from a specific table with optional pagination"""
     try:
         # Find the model by table name
-        model = None
-        for m in apps.get_app_config('feedback_app').get_models():
-            if m._meta.db_table == table_name or m.__name__ == table_name:
-                model = m
-                break
+        schema = admin_schema.get_schema(table_name)
+        model = schema.model if schema else None
         
         if not model:
             return JsonResponse({
                 "status": "error",
                 "error": f"table '{table_name}' not found"
             }, status=404)
-        
+
+        # Conditional GET: the page only changes with the table's write counter (or the schema).
+        # The counter is read before the rows so a concurrent write can only make the ETag older
+        etag = conditional.make_etag(
+            "table", schema.table_name,
+            conditional.table_stamp(model),
+            admin_schema.etag(), request.get_full_path()
+        )
+        if conditional.is_conditional(request):
+            response = conditional.not_modified(request, etag)
+            if response is not None:
+                return response
+
         # Check for no-pagination flag
         nopaginate = request.GET.get('nopaginate', 'false').lower() == 'true'
         
-        # Get query parameters for sorting and searching
-        sort_by = request.GET.get('sort_by')
-        order = request.GET.get('order', 'asc')
-        search_term = request.GET.get('search', '')
-        
-        # Initial queryset
-        queryset = model.objects.all()
-        
-        # Apply Search
-        if search_term:
-            from django.db.models import Q
-            search_query = Q()
-            # Search across all text-based fields
-            for field in model._meta.get_fields():
-                if field.is_relation:
-                     continue
-                # Simple check for text fields (adjust based on needs)
-                internal_type = field.get_internal_type()
-                if internal_type in ['CharField', 'TextField', 'IntegerField', 'EmailField', 'FloatField', 'DecimalField']:
-                     search_query |= Q(**{f"{field.name}__icontains": search_term})
-            
-            queryset = queryset.filter(search_query)
-
-        # Apply Sorting
-        if sort_by:
-            # Validate field exists
-            field_names = [f.name for f in model._meta.get_fields()]
-            if sort_by in field_names:
-                if order == 'desc':
-                    queryset = queryset.order_by(f'-{sort_by}')
-                else:
-                    queryset = queryset.order_by(sort_by)
+        # Apply search and sorting from the query string
+        queryset = _filtered_table_queryset(model, request.GET)
+
+        # Row count: exact (default), estimate (table statistics, unfiltered only) or none
+        count_mode = request.GET.get('count', 'exact').lower()
+        if count_mode == 'none' or (count_mode == 'estimate' and request.GET.get('search')):
+            total = None
+        elif count_mode == 'estimate':
+            total = table_stats.estimated_row_count(model)
+        else:
+            total = queryset.count()
 
-        # Get total count after filtering
-        total = queryset.count()
-        
-        if nopaginate:
+        # Cursor (keyset) pagination: seek on (sort_by, pk) instead of OFFSET
+        cursor_mode = request.GET.get('pagination') == 'cursor' or 'cursor' in request.GET
+        next_cursor = prev_cursor = None
+
+        # Rows are read as tuples of the table's columns (FKs as their *_id value), no model
+        # instances; cursor mode uses named rows so the keyset can be read off the page edges
+        rows = queryset.values_list(*schema.attnames, named=cursor_mode)
+
+        if cursor_mode:
+            page = None
+            page_size = int(request.GET.get('page_size', 50))
+            if page_size < 1: page_size = 10
+
+            try:
+                keys = pagination.keyset_fields(model, request.GET.get('sort_by'))
+                rows, next_cursor, prev_cursor = pagination.keyset_page(
+                    rows,
+                    keys,
+                    descending=request.GET.get('order', 'asc') == 'desc',
+                    cursor=request.GET.get('cursor') or None,
+                    page_size=page_size
+                )
+            except pagination.InvalidCursor as e:
+                return JsonResponse({"status": "error", "error": str(e)}, status=400)
+            total_pages = (total + page_size - 1) // page_size if total is not None else None
+        elif nopaginate:
             # Get all data
             page = 1
-            page_size = total if total > 0 else 1
+            page_size = total if total else 1
             total_pages = 1
         else:
             # Standard Pagination
@@ -583,86 +1122,37 @@ def admin_get_table_data(request, table_name):
             
             start = (page - 1) * page_size
             end = start + page_size
-            queryset = queryset[start:end]
-            total_pages = (total + page_size - 1) // page_size if page_size > 0 else 1
-            
-        # Get field names and metadata
-        fields = []
-        field_meta = {}
-        
-        for f in model._meta.get_fields():
-            if f.many_to_many or f.one_to_many:
-                continue
+            rows = rows[start:end]
+            total_pages = (total + page_size - 1) // page_size if total is not None else None
             
-            fields.append(f.name)
-            
-            # Determine type
-            internal_type = f.get_internal_type()
-            
-            # Extract metadata
-            meta = {
-                'type': 'text',
-                'required': not f.blank and not f.null,
-                'choices': [],
-                'is_auto': False
-            }
-            
-            if internal_type == 'BooleanField':
-                meta['type'] = 'boolean'
-            elif internal_type in ['DateField', 'DateTimeField']:
-                meta['type'] = 'date'
-            elif internal_type in ['IntegerField', 'BigIntegerField', 'PositiveSmallIntegerField']:
-                meta['type'] = 'number'
-                # Check for AutoField
-                from django.db import models # Local import to avoid circular dependency issues if any, or ensuring it's available
-                if isinstance(f, (models.AutoField, models.BigAutoField, models.SmallAutoField)):
-                    meta['is_auto'] = True
-            elif internal_type in ['FloatField', 'DecimalField']:
-                meta['type'] = 'float'
-                
-            # Extract choices if available
-            if f.choices:
-                meta['type'] = 'select'  # Override type to select if choices exist
-                meta['choices'] = [{'value': c[0], 'label': str(c[1])} for c in f.choices]
-            
-            field_meta[f.name] = meta
-        
-        # Convert to list of dicts
-        
-        # Convert to list of dicts
-        data = []
-        for obj in queryset:
-            row = {}
-            for field in fields:
-                try:
-                    value = getattr(obj, field)
-                    # Convert to JSON-serializable format
-                    if hasattr(value, 'isoformat'):  # datetime/date
-                        value = value.isoformat()
-                    elif hasattr(value, 'pk'):  # Foreign key
-                        # USER REQUEST: Show raw ID instead of str(obj)
-                        value = value.pk
-                    row[field] = value
-                except:
-                    row[field] = None
-            data.append(row)
+        # Field list and metadata come precomputed from the schema registry;
+        # clients that cached dashboard-admin/schema/ can skip field_meta with meta=false
+        fields = list(schema.fields)
+        include_meta = request.GET.get('meta', 'true').lower() != 'false'
+
+        # Convert to list of dicts with the schema's precomputed converters
+        data = schema.serialize_rows(rows)
         
         # Get primary key field
-        pk_field = model._meta.pk.name
+        pk_field = schema.pk_field
         
-        return JsonResponse({
+        return conditional.set_validators(JsonResponse({
             "status": "ok",
             "model_name": model.__name__,
             "table_name": model._meta.db_table,
             "pk_field": pk_field,
             "fields": fields,
-            "field_meta": field_meta,
+            "field_meta": dict(schema.field_meta) if include_meta else None,
             "data": data,
             "total": total,
+            "total_is_estimate": count_mode == 'estimate' and total is not None,
             "page": page,
             "page_size": page_size,
-            "total_pages": total_pages
-        })
+            "total_pages": total_pages,
+            "pagination": "cursor" if cursor_mode else "page",
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
+        }), etag)
     except Exception as e:
         return JsonResponse({
             "status": "error",
@@ -670,22 +1160,150 @@ def admin_get_table_data(request, table_name):
         }, status=500)
 
 
+class _Echo:
+    """File-like object whose write() hands the value back, for streaming csv.writer output"""
+    def write(self, value):
+        return value
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+@require_GET
+@admin_required
+def admin_export_table(request, table_name):
+    """Stream a whole table (after search/sort) as CSV or NDJSON with constant memory"""
+    # Find the model by table name
+    schema = admin_schema.get_schema(table_name)
+    model = schema.model if schema else None
+
+    if not model:
+        return JsonResponse({
+            "status": "error",
+            "error": f"table '{table_name}' not found"
+        }, status=404)
+
+    export_format = request.GET.get('format', 'csv').lower()
+    if export_format not in ('csv', 'ndjson'):
+        return JsonResponse({"status": "error", "error": "format must be csv or ndjson"}, status=400)
+
+    queryset = _filtered_table_queryset(model, request.GET)
+    if not queryset.query.order_by:
+        # Stable output order for repeatable exports
+        queryset = queryset.order_by(model._meta.pk.attname)
+
+    # FK columns are exported as their raw id (attname), labelled with the field name
+    concrete = model._meta.concrete_fields
+    headers = [f.name for f in concrete]
+    rows = queryset.values_list(*[f.attname for f in concrete]).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    def to_text(value):
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+
+    if export_format == 'csv':
+        writer = csv.writer(_Echo())
+
+        def stream():
+            yield writer.writerow(headers)
+            for row in rows:
+                yield writer.writerow([to_text(v) for v in row])
+
+        content_type = 'text/csv; charset=utf-8'
+    else:
+        def stream():
+            for row in rows:
+                yield dump_json(dict(zip(headers, row))) + b"\n"
+
+        content_type = 'application/x-ndjson'
+
+    response = StreamingHttpResponse(stream(), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{model._meta.db_table}.{export_format}"'
+    return response
+
+
+@csrf_exempt
+@require_POST
+@admin_required
+def admin_import_table(request, table_name):
+    """Bulk import a CSV/Excel file (multipart field `file`) into a table; dry_run=true validates only"""
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({"status": "error", "error": "file is required"}, status=400)
+
+    dry_run = request.POST.get('dry_run', request.GET.get('dry_run', 'false')).lower() == 'true'
+    try:
+        chunk_size = int(request.POST.get('chunk_size', roster_import.DEFAULT_CHUNK_SIZE))
+    except ValueError:
+        return JsonResponse({"status": "error", "error": "chunk_size must be an integer"}, status=400)
+    chunk_size = min(max(chunk_size, 1), roster_import.MAX_CHUNK_SIZE)
+
+    try:
+        importer = roster_import.RosterImporter(table_name, dry_run=dry_run, chunk_size=chunk_size)
+        report = importer.run(roster_import.open_rows(upload.file, upload.name))
+    except roster_import.ImportFormatError as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=500)
+
+    return JsonResponse({"status": "ok", **report})
+
+
+@csrf_exempt
+@require_POST
+@admin_required
+def admin_batch_rows(request, table_name):
+    """
+    Update or delete many rows in one request.
+    Body: {"action": "update", "pks": [...], "patch": {field: value}}
+       or {"action": "delete", "pks": [...]}
+    """
+    if admin_schema.is_read_only(table_name):
+        return JsonResponse({"status": "error", "error": "This table is read-only"}, status=403)
+
+    schema = admin_schema.get_schema(table_name)
+    if schema is None:
+        return JsonResponse({"status": "error", "error": f"table '{table_name}' not found"}, status=404)
+
+    try:
+        payload = json.loads(request.body)
+    except Exception:
+        return JsonResponse({"status": "error", "error": "invalid JSON"}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({"status": "error", "error": "request body must be an object"}, status=400)
+
+    action = payload.get("action")
+    try:
+        if action == "update":
+            updated, results = admin_batch.batch_update(schema.model, payload.get("pks"), payload.get("patch"))
+            return JsonResponse({"status": "ok", "updated": updated, "results": results})
+        if action == "delete":
+            deleted, results = admin_batch.batch_delete(schema.model, payload.get("pks"))
+            return JsonResponse({
+                "status": "ok",
+                "deleted": deleted.get(schema.table_name, 0),
+                "cascaded": deleted,
+                "results": results,
+            })
+        return JsonResponse({"status": "error", "error": "action must be 'update' or 'delete'"}, status=400)
+    except admin_batch.BatchError as e:
+        return JsonResponse({"status": "error", "error": e.args[0]}, status=400)
+    except Exception as e:
+        return JsonResponse({"status": "error", "error": str(e)}, status=500)
+
+
 @csrf_exempt
 @require_POST
 @admin_required
 def admin_add_row(request, table_name):
     """Add a new row to a table"""
     # Restricted Tables
-    if table_name.lower() in ['feedback_response', 'feedback_submissionlog']:
+    if admin_schema.is_read_only(table_name):
         return JsonResponse({"status": "error", "error": "This table is read-only"}, status=403)
         
     try:
         # Find the model
-        model = None
-        for m in apps.get_app_config('feedback_app').get_models():
-            if m._meta.db_table == table_name or m.__name__ == table_name:
-                model = m
-                break
+        schema = admin_schema.get_schema(table_name)
+        model = schema.model if schema else None
         
         if not model:
             return JsonResponse({
@@ -727,6 +1345,8 @@ def admin_add_row(request, table_name):
         try:
             obj.full_clean()
             obj.save()
+            feedback_cache.invalidate_for_model(model)
+            progress.refresh_cohorts(progress.cohorts_of_objects(model, [obj]))
             return JsonResponse({
                 "status": "ok",
                 "message": "row added successfully",
@@ -748,16 +1368,13 @@ def admin_add_row(request, table_name):
 def admin_update_row(request, table_name, row_id):
     """Update a row in a table"""
     # Restricted Tables
-    if table_name.lower() in ['feedback_response', 'feedback_submissionlog']:
+    if admin_schema.is_read_only(table_name):
         return JsonResponse({"status": "error", "error": "This table is read-only"}, status=403)
         
     try:
         # Find the model
-        model = None
-        for m in apps.get_app_config('feedback_app').get_models():
-            if m._meta.db_table == table_name or m.__name__ == table_name:
-                model = m
-                break
+        schema = admin_schema.get_schema(table_name)
+        model = schema.model if schema else None
         
         if not model:
             return JsonResponse({
@@ -780,6 +1397,9 @@ def admin_update_row(request, table_name, row_id):
                 "error": f"row with id {row_id} not found"
             }, status=404)
         
+        # Cohorts the row counts towards before the edit
+        cohorts = progress.cohorts_of_objects(model, [obj])
+
         # Update fields
         for field, value in payload.items():
             if hasattr(obj, field):
@@ -798,6 +1418,9 @@ def admin_update_row(request, table_name, row_id):
                     setattr(obj, field, value)
         
         obj.save()
+        feedback_cache.invalidate_for_model(model)
+        student_auth.revoke_for_rows(model, [obj.pk])
+        progress.refresh_cohorts(cohorts | progress.cohorts_of_objects(model, [obj]))
         
         return JsonResponse({
             "status": "ok",
@@ -816,16 +1439,13 @@ def admin_update_row(request, table_name, row_id):
 def admin_delete_row(request, table_name, row_id):
     """Delete a row from a table"""
     # Restricted Tables
-    if table_name.lower() in ['feedback_response', 'feedback_submissionlog']:
+    if admin_schema.is_read_only(table_name):
         return JsonResponse({"status": "error", "error": "This table is read-only"}, status=403)
 
     try:
         # Find the model
-        model = None
-        for m in apps.get_app_config('feedback_app').get_models():
-            if m._meta.db_table == table_name or m.__name__ == table_name:
-                model = m
-                break
+        schema = admin_schema.get_schema(table_name)
+        model = schema.model if schema else None
         
         if not model:
             return JsonResponse({
@@ -836,7 +1456,14 @@ def admin_delete_row(request, table_name, row_id):
         # Get and delete the object
         try:
             obj = model.objects.get(pk=row_id)
-            obj.delete()
+            cohorts = progress.cohorts_of(model, [obj.pk])
+            _, per_model = obj.delete()
+            # Cascades touch other tables too (responses, logs, rollups)
+            for label, count in per_model.items():
+                if count:
+                    feedback_cache.invalidate_for_model(apps.get_model(label))
+            student_auth.revoke_for_rows(model, [row_id])
+            progress.refresh_cohorts(cohorts)
             
             return JsonResponse({
                 "status": "ok",
@@ -0,0 +1,387 @@
+"""
+Write-behind queue for feedback submissions.
+
+When ``FEEDBACK_WRITE_BEHIND`` is enabled, validated submissions are appended
+to a local SQLite journal and acknowledged immediately. A drain worker (an
+in-process thread, or ``manage.py drain_feedback_queue``) moves them into
+Feedback_Response / Feedback_SubmissionLog with batched inserts.
+
+The journal keeps a UNIQUE(enrollment_no, allocation_id) constraint so the
+one-submission-per-allocation rule holds before rows reach SQL Server. Drained
+rows are kept for a retention window so that check stays valid while the
+database catches up.
+
+A row that fails to write is retried with exponential backoff
+(``next_attempt_at``). Connection and pool errors mean the database is
+unreachable, not that the row is bad, so they release the batch without
+counting an attempt. After MAX_ATTEMPTS counted failures a row is dead: it
+stays in the journal, is reported by ``stats()`` and can be put back with
+``requeue_dead()`` (``manage.py drain_feedback_queue --requeue-dead``).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, close_old_connections
+
+from feedback_app.db.pool import PoolTimeout
+from feedback_app.models.feedback_submissionlog import Feedback_SubmissionLog
+from feedback_app.submissions import write_submissions
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submission_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    enrollment_no TEXT NOT NULL,
+    allocation_id INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    enqueued_at REAL NOT NULL,
+    claimed_by TEXT,
+    claimed_at REAL,
+    drained_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL,
+    last_error TEXT,
+    UNIQUE (enrollment_no, allocation_id)
+);
+CREATE INDEX IF NOT EXISTS submission_queue_pending
+    ON submission_queue (drained_at, id);
+"""
+
+# The database could not be reached; says nothing about the rows being written
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, PoolTimeout)
+
+
+class DuplicateSubmission(Exception):
+    """The (EnrollmentNo, AllocationID) pair is already queued."""
+
+
+def is_enabled():
+    return getattr(settings, "FEEDBACK_WRITE_BEHIND", False)
+
+
+class SubmissionQueue:
+    """Durable append-only journal of submissions waiting to be written."""
+
+    # A claim older than this is assumed to belong to a dead worker
+    CLAIM_TIMEOUT = 60.0
+    # Rows that failed this many times stay in the journal for inspection
+    MAX_ATTEMPTS = 8
+    # Retry delay after the n-th failure: BACKOFF_BASE * 2 ** (n - 1), capped at BACKOFF_MAX
+    BACKOFF_BASE = 5.0
+    BACKOFF_MAX = 600.0
+
+    def __init__(self, path, batch_size=200, retention=24 * 3600):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.retention = retention
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        self._local = threading.local()
+        self._last_drain = None
+        self._last_error = None
+
+    def _connect(self):
+        """This thread's connection to the journal, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            if not self._schema_ready:
+                with self._schema_lock:
+                    if not self._schema_ready:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(SCHEMA)
+                        columns = {row[1] for row in conn.execute("PRAGMA table_info(submission_queue)")}
+                        if "next_attempt_at" not in columns:
+                            # Journal created before retries were scheduled
+                            conn.execute("ALTER TABLE submission_queue ADD COLUMN next_attempt_at REAL")
+                        self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def backoff(self, attempts):
+        """Seconds to wait before retrying a row that has failed ``attempts`` times."""
+        return min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** max(0, attempts - 1))
+
+    # -------------------------------------
+    # Producer side
+    # -------------------------------------
+    def enqueue(self, entries):
+        """
+        Append entries (dicts shaped like ``write_submissions`` input) in one
+        transaction. Raises DuplicateSubmission if any pair is already queued.
+        """
+        now = time.time()
+        rows = [
+            (e["enrollment_no"], e["allocation_id"], json.dumps(
+                {"ratings": e["ratings"], "comments": e.get("comments")}
+            ), now)
+            for e in entries
+        ]
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO submission_queue (enrollment_no, allocation_id, payload, enqueued_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+        except sqlite3.IntegrityError:
+            conn.execute("ROLLBACK")
+            raise DuplicateSubmission()
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def queued_allocations(self, enrollment_no, allocation_ids=None):
+        """Allocation ids this student has in the journal (pending or recently drained)."""
+        rows = self._connect().execute(
+            "SELECT allocation_id FROM submission_queue WHERE enrollment_no = ?",
+            (enrollment_no,)
+        ).fetchall()
+        queued = {row[0] for row in rows}
+        if allocation_ids is not None:
+            queued &= set(allocation_ids)
+        return queued
+
+    # -------------------------------------
+    # Consumer side
+    # -------------------------------------
+    def _claim(self, conn):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            "SELECT id, enrollment_no, allocation_id, payload, attempts FROM submission_queue "
+            "WHERE drained_at IS NULL AND attempts < ? "
+            "AND (next_attempt_at IS NULL OR next_attempt_at <= ?) "
+            "AND (claimed_by IS NULL OR claimed_at < ?) "
+            "ORDER BY id LIMIT ?",
+            (self.MAX_ATTEMPTS, now, now - self.CLAIM_TIMEOUT, self.batch_size)
+        ).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE submission_queue SET claimed_by = ?, claimed_at = ? WHERE id = ?",
+                [(self.worker_id, now, row[0]) for row in rows]
+            )
+        conn.execute("COMMIT")
+        return rows
+
+    def drain_once(self):
+        """
+        Move one batch into the database. Returns the number of rows drained.
+        Re-raises connection / pool errors after releasing the batch.
+        """
+        conn = self._connect()
+        rows = self._claim(conn)
+        if not rows:
+            self._purge(conn)
+            return 0
+
+        done = []
+        failed = []
+        try:
+            # Rows whose pair already reached the database (e.g. a previous
+            # drain that committed but crashed before marking) are skipped
+            existing = set(
+                Feedback_SubmissionLog.objects.filter(
+                    EnrollmentNo__in={row[1] for row in rows},
+                    AllocationID__in={row[2] for row in rows}
+                ).values_list("EnrollmentNo", "AllocationID")
+            )
+            done = [row[0] for row in rows if (row[1], row[2]) in existing]
+            pending = [row for row in rows if (row[1], row[2]) not in existing]
+
+            try:
+                write_submissions([self._entry(row) for row in pending])
+                done.extend(row[0] for row in pending)
+            except TRANSIENT_ERRORS:
+                raise
+            except Exception:
+                # Isolate the rows that cannot be written so they do not block the batch
+                for row in pending:
+                    try:
+                        write_submissions([self._entry(row)])
+                        done.append(row[0])
+                    except TRANSIENT_ERRORS:
+                        raise
+                    except Exception as e:
+                        failed.append((row, str(e)))
+        except TRANSIENT_ERRORS as e:
+            settled = set(done) | {row[0] for row, _ in failed}
+            released = [row[0] for row in rows if row[0] not in settled]
+            self._settle(conn, done, failed, released, f"{type(e).__name__}: {e}")
+            raise
+
+        self._settle(conn, done, failed)
+        return len(done)
+
+    def _settle(self, conn, done, failed, released=(), release_error=None):
+        """Mark drained rows, schedule failed ones for a retry and hand released ones back uncounted."""
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            "UPDATE submission_queue SET drained_at = ?, claimed_by = NULL, next_attempt_at = NULL, "
+            "last_error = NULL WHERE id = ?",
+            [(now, row_id) for row_id in done]
+        )
+        conn.executemany(
+            "UPDATE submission_queue SET claimed_by = NULL, claimed_at = NULL, attempts = ?, "
+            "next_attempt_at = ?, last_error = ? WHERE id = ?",
+            [(row[4] + 1, now + self.backoff(row[4] + 1), error, row[0]) for row, error in failed]
+        )
+        conn.executemany(
+            "UPDATE submission_queue SET claimed_by = NULL, claimed_at = NULL, next_attempt_at = ?, "
+            "last_error = ? WHERE id = ?",
+            [(now + self.BACKOFF_BASE, release_error, row_id) for row_id in released]
+        )
+        conn.execute("COMMIT")
+
+        if done:
+            self._last_drain = now
+        if failed or released:
+            self._last_error = release_error or failed[-1][1]
+        elif done:
+            self._last_error = None
+
+    def dead_rows(self, limit=100):
+        """Rows that used up their attempts, oldest first."""
+        rows = self._connect().execute(
+            "SELECT id, enrollment_no, allocation_id, enqueued_at, attempts, last_error "
+            "FROM submission_queue WHERE drained_at IS NULL AND attempts >= ? ORDER BY id LIMIT ?",
+            (self.MAX_ATTEMPTS, limit)
+        ).fetchall()
+        columns = ("id", "enrollment_no", "allocation_id", "enqueued_at", "attempts", "last_error")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def requeue_dead(self, ids=None):
+        """Give dead rows (all, or the given journal ids) a fresh set of attempts. Returns the count."""
+        sql = (
+            "UPDATE submission_queue SET attempts = 0, next_attempt_at = NULL, claimed_by = NULL, "
+            "claimed_at = NULL WHERE drained_at IS NULL AND attempts >= ?"
+        )
+        params = [self.MAX_ATTEMPTS]
+        if ids is not None:
+            ids = list(ids)
+            if not ids:
+                return 0
+            sql += f" AND id IN ({', '.join('?' * len(ids))})"
+            params.extend(ids)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        count = conn.execute(sql, params).rowcount
+        conn.execute("COMMIT")
+        return count
+
+    @staticmethod
+    def _entry(row):
+        _, enrollment_no, allocation_id, payload, _ = row
+        data = json.loads(payload)
+        return {
+            "enrollment_no": enrollment_no,
+            "allocation_id": allocation_id,
+            "ratings": data["ratings"],
+            "comments": data.get("comments"),
+        }
+
+    def _purge(self, conn):
+        conn.execute(
+            "DELETE FROM submission_queue WHERE drained_at IS NOT NULL AND drained_at < ?",
+            (time.time() - self.retention,)
+        )
+
+    def stats(self):
+        """Queue depth and drain lag (age of the oldest pending submission, in seconds)."""
+        conn = self._connect()
+        depth, oldest = conn.execute(
+            "SELECT COUNT(*), MIN(enqueued_at) FROM submission_queue WHERE drained_at IS NULL"
+        ).fetchone()
+        failing, dead = conn.execute(
+            "SELECT COALESCE(SUM(attempts < ?), 0), COALESCE(SUM(attempts >= ?), 0) FROM submission_queue "
+            "WHERE drained_at IS NULL AND last_error IS NOT NULL",
+            (self.MAX_ATTEMPTS, self.MAX_ATTEMPTS)
+        ).fetchone()
+        now = time.time()
+        return {
+            "enabled": is_enabled(),
+            "depth": depth,
+            "drain_lag_seconds": round(now - oldest, 3) if oldest else 0.0,
+            "failing": failing,
+            "dead": dead,
+            "last_drain_at": self._last_drain,
+            "last_error": self._last_error,
+            "worker_running": _worker is not None and _worker.is_alive(),
+        }
+
+
+class DrainWorker(threading.Thread):
+    """Background thread that keeps draining the queue."""
+
+    def __init__(self, queue, interval):
+        super().__init__(name="feedback-queue-drain", daemon=True)
+        self.queue = queue
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        failures = 0
+        while not self._stop_event.is_set():
+            drained = 0
+            try:
+                drained = self.queue.drain_once()
+                failures = 0
+            except Exception as e:
+                # Database unreachable: the batch was released, back off before the next try
+                failures += 1
+                self.queue._last_error = f"{type(e).__name__}: {e}"
+            finally:
+                close_old_connections()
+            if failures:
+                self._stop_event.wait(min(self.queue.BACKOFF_MAX, self.interval * 2 ** failures))
+            elif drained < self.queue.batch_size:
+                self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_queue = None
+_worker = None
+_lock = threading.Lock()
+
+
+def get_queue():
+    global _queue
+    if _queue is None:
+        with _lock:
+            if _queue is None:
+                _queue = SubmissionQueue(
+                    getattr(settings, "FEEDBACK_QUEUE_PATH", os.path.join(settings.BASE_DIR, "feedback_queue.sqlite3")),
+                    batch_size=getattr(settings, "FEEDBACK_QUEUE_BATCH_SIZE", 200),
+                    retention=getattr(settings, "FEEDBACK_QUEUE_RETENTION", 24 * 3600),
+                )
+    return _queue
+
+
+def ensure_worker():
+    """Start the in-process drain thread unless draining runs in a separate process."""
+    global _worker
+    if not getattr(settings, "FEEDBACK_QUEUE_EMBEDDED_WORKER", True):
+        return
+    if _worker is not None and _worker.is_alive():
+        return
+    queue = get_queue()  # takes _lock itself
+    with _lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = DrainWorker(queue, getattr(settings, "FEEDBACK_QUEUE_DRAIN_INTERVAL", 1.0))
+            _worker.start()
+
+
+def start_on_server_start():
+    """Drain submissions journaled before a restart without waiting for the next enqueue."""
+    if is_enabled():
+        ensure_worker()
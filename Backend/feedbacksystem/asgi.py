@@ -8,8 +8,19 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
 
 import os
-from django.core.asgi import get_asgi_application
+
+from feedbacksystem import startup_profile
+startup_profile.enable_from_env()
+
+from django.core.asgi import get_asgi_application  # noqa: E402 - imported once profiling is on
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'feedbacksystem.settings')
 
 application = get_asgi_application()
+
+from feedback_app.apps import server_started  # noqa: E402
+server_started()
+
+if startup_profile.is_enabled():
+    startup_profile.load_project()
+    startup_profile.report("asgi")
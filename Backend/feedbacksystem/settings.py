@@ -11,8 +11,6 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
-from datetime import datetime
-from zoneinfo import ZoneInfo
 import os
 from dotenv import load_dotenv
 
@@ -22,9 +20,6 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Load environment variables from .env file
 load_dotenv(os.path.join(BASE_DIR, '.env'))
 
-now_ist = datetime.now(ZoneInfo("Asia/Kolkata"))
-print(now_ist.isoformat())
-
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
@@ -53,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'feedback_app.instrumentation.InstrumentationMiddleware',  # query count / DB time / Server-Timing
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -119,9 +115,14 @@ WSGI_APPLICATION = 'feedbacksystem.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# DB_POOL=true (default) serves connections from a bounded per-process pool (feedback_app.db.pool);
+# connections go back to the pool at the end of every request, so CONN_MAX_AGE stays 0.
+# With DB_POOL=false each thread keeps a persistent connection for DB_CONN_MAX_AGE seconds.
+DB_POOL = os.getenv("DB_POOL", "true").lower() == "true"
+
 DATABASES = {
     "default": {
-        "ENGINE": "mssql",
+        "ENGINE": "feedback_app.db.mssql_pool" if DB_POOL else "mssql",
         "NAME": os.getenv("DB_NAME"),
         "USER": os.getenv("DB_USER"),
         "PASSWORD": os.getenv("DB_PASSWORD"),
@@ -132,11 +133,102 @@ DATABASES = {
             "Encrypt": "no",  # Disable SSL to avoid certificate errors
             "TrustServerCertificate": "yes"  # Required for ODBC 18
         },
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "600")),
+        "CONN_HEALTH_CHECKS": True,
+        "POOL": {
+            "MAX_SIZE": int(os.getenv("DB_POOL_MAX_SIZE", "20")),
+            "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            "RECYCLE": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            "HEALTH_CHECK_INTERVAL": int(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30")),
+        },
     }
 }
 
 
 
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "feedback_app": {
+            "handlers": ["console"],
+            "level": os.getenv("FEEDBACK_LOG_LEVEL", "INFO"),
+        },
+    },
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Cohort subject/teacher trees and other derived read models
+    "feedback": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "feedback-cache",
+        "TIMEOUT": int(os.getenv("FEEDBACK_CACHE_TTL", 300)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("FEEDBACK_CACHE_MAX_ENTRIES", 2048)),
+        },
+    },
+}
+
+
+# Write-behind submission queue
+# Submissions are journalled locally (SQLite) and drained into SQL Server in batches.
+# The embedded drain thread starts with the server (wsgi.py / asgi.py); set
+# FEEDBACK_QUEUE_EMBEDDED_WORKER=false when running `manage.py drain_feedback_queue` separately.
+# Dead rows: `manage.py drain_feedback_queue --list-dead` / `--requeue-dead [ID ...]`.
+
+FEEDBACK_WRITE_BEHIND = os.getenv("FEEDBACK_WRITE_BEHIND", "false").lower() == "true"
+FEEDBACK_QUEUE_PATH = os.getenv("FEEDBACK_QUEUE_PATH", os.path.join(BASE_DIR, "feedback_queue.sqlite3"))
+FEEDBACK_QUEUE_BATCH_SIZE = int(os.getenv("FEEDBACK_QUEUE_BATCH_SIZE", 200))
+FEEDBACK_QUEUE_DRAIN_INTERVAL = float(os.getenv("FEEDBACK_QUEUE_DRAIN_INTERVAL", 1.0))
+FEEDBACK_QUEUE_EMBEDDED_WORKER = os.getenv("FEEDBACK_QUEUE_EMBEDDED_WORKER", "true").lower() == "true"
+
+
+# Admin dashboard row counts are cached for this many seconds
+FEEDBACK_TABLE_STATS_TTL = int(os.getenv("FEEDBACK_TABLE_STATS_TTL", 30))
+
+# Admin table search: in-process trigram index for substring matches on names/emails
+FEEDBACK_SEARCH_NGRAM = os.getenv("FEEDBACK_SEARCH_NGRAM", "false").lower() == "true"
+
+# Student login: resolve emails through an in-process normalized-email -> EnrollmentNo map
+FEEDBACK_LOGIN_EMAIL_INDEX = os.getenv("FEEDBACK_LOGIN_EMAIL_INDEX", "true").lower() == "true"
+
+# Student auth: "session" (django_session) or "token" (signed cookie/bearer token carrying the cohort).
+# Token revocations are kept in the Feedback_TokenRevocation table, or in the cache alias named by
+# FEEDBACK_TOKEN_REVOCATION_CACHE (it must be shared and non-evicting; LocMem is refused at startup).
+# With the table, each process checks tokens against a snapshot it revalidates every
+# FEEDBACK_TOKEN_DENY_SNAPSHOT_TTL seconds (the longest a revocation from another process goes unseen).
+FEEDBACK_AUTH_MODE = os.getenv("FEEDBACK_AUTH_MODE", "session")
+FEEDBACK_TOKEN_REVOCATION_CACHE = os.getenv("FEEDBACK_TOKEN_REVOCATION_CACHE") or None
+FEEDBACK_TOKEN_DENY_SNAPSHOT_TTL = float(os.getenv("FEEDBACK_TOKEN_DENY_SNAPSHOT_TTL", "5"))
+FEEDBACK_TOKEN_MAX_AGE = int(os.getenv("FEEDBACK_TOKEN_MAX_AGE", str(24 * 3600)))
+FEEDBACK_TOKEN_COOKIE = "feedback_token"
+
+# Request instrumentation: Server-Timing headers, per-URL histograms at dashboard-admin/metrics/,
+# and a warning log for requests slower than FEEDBACK_SLOW_REQUEST_MS or running FEEDBACK_MANY_QUERIES queries
+FEEDBACK_INSTRUMENTATION = os.getenv("FEEDBACK_INSTRUMENTATION", "true").lower() == "true"
+FEEDBACK_SLOW_REQUEST_MS = int(os.getenv("FEEDBACK_SLOW_REQUEST_MS", "1000"))
+FEEDBACK_MANY_QUERIES = int(os.getenv("FEEDBACK_MANY_QUERIES", "50"))
+
+# API response encoder: auto (orjson when installed, else stdlib json), orjson or stdlib
+FEEDBACK_JSON_BACKEND = os.getenv("FEEDBACK_JSON_BACKEND", "auto")
+
+# /readyz re-runs its database and cache checks at most once per FEEDBACK_READY_CACHE_SECONDS
+FEEDBACK_READY_CACHE_SECONDS = float(os.getenv("FEEDBACK_READY_CACHE_SECONDS", "5"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,17 @@
+"""
+Settings for the benchmark harness (`manage.py benchmark --settings=feedbacksystem.settings_bench`).
+
+Same as the main settings but on a local SQLite file standing in for SQL
+Server, so a realistic dataset can be seeded and replayed without touching
+the real database.
+"""
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.getenv("FEEDBACK_BENCH_DB", str(BASE_DIR / "bench.sqlite3")),  # noqa: F405
+    }
+}
+
+FEEDBACK_QUEUE_PATH = os.getenv("FEEDBACK_QUEUE_PATH", str(BASE_DIR / "bench_queue.sqlite3"))  # noqa: F405
@@ -0,0 +1,118 @@
+"""
+Startup profile: how long each module takes to import.
+
+Enabled with FEEDBACK_STARTUP_PROFILE=true. ``manage.py``, ``wsgi.py`` and
+``asgi.py`` call ``enable_from_env()`` before importing Django and
+``report()`` once the application and URLconf are loaded, which prints the
+slowest modules to stderr:
+
+    FEEDBACK_STARTUP_PROFILE=true python manage.py check
+
+``self`` is the time spent executing the module's own body, ``total``
+includes the modules it imported for the first time.
+"""
+import importlib.abc
+import os
+import sys
+import time
+
+_enabled = False
+_started = None
+_timings = {}   # module name -> [self seconds, total seconds]
+_stack = []     # child time accumulated by each module being imported
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader):
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        _stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - started
+            children = _stack.pop()
+            if _stack:
+                _stack[-1] += total
+            _timings[module.__name__] = [total - children, total]
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Wraps the loader found by the remaining finders so module execution is timed."""
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader)
+                return spec
+        return None
+
+
+def enable():
+    global _enabled, _started
+    if _enabled:
+        return
+    _enabled = True
+    _started = time.perf_counter()
+    sys.meta_path.insert(0, _TimingFinder())
+
+
+def enable_from_env():
+    if os.getenv("FEEDBACK_STARTUP_PROFILE", "false").lower() == "true":
+        enable()
+
+
+def is_enabled():
+    return _enabled
+
+
+def report(stage="startup", limit=None, stream=None):
+    """Print the slowest imports since ``enable()``; a no-op when profiling is off."""
+    if not _enabled:
+        return
+    stream = stream or sys.stderr
+    limit = limit or int(os.getenv("FEEDBACK_STARTUP_PROFILE_LIMIT", "25"))
+    elapsed = time.perf_counter() - _started
+    imported = sum(self_time for self_time, _ in _timings.values())
+
+    print(f"[startup-profile] {stage}: {elapsed * 1000:.1f} ms, "
+          f"{len(_timings)} modules imported in {imported * 1000:.1f} ms", file=stream)
+    print(f"[startup-profile] {'self ms':>9} {'total ms':>9}  module", file=stream)
+    slowest = sorted(_timings.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+    for name, (self_time, total) in slowest:
+        print(f"[startup-profile] {self_time * 1000:9.1f} {total * 1000:9.1f}  {name}", file=stream)
+    stream.flush()
+
+
+def setup(argv):
+    """
+    ``django.setup()`` for manage.py, honouring ``--settings`` / ``--pythonpath``
+    in ``argv`` the same way ``execute_from_command_line`` would.
+    """
+    import django
+    from django.core.management.base import CommandParser, handle_default_options
+
+    parser = CommandParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("--settings")
+    parser.add_argument("--pythonpath")
+    options, _ = parser.parse_known_args(argv[1:])
+    handle_default_options(options)
+    django.setup()
+
+
+def load_project():
+    """Import the URLconf (and with it every view module) so the profile covers the request path."""
+    from django.urls import get_resolver
+    get_resolver().urlconf_module
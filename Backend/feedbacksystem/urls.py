@@ -8,12 +8,27 @@ urlpatterns = [
     path('logout/', feedback_views.logout, name='logout'),
     path("my-teachers/", feedback_views.my_teachers),
     path("submit-feedback/", feedback_views.submit_feedback),
+    path("submit-feedback/batch/", feedback_views.submit_feedback_batch),
     path("my-feedbacks/", feedback_views.my_feedbacks),
+    path("healthz", feedback_views.healthz, name='healthz'),
+    path("readyz", feedback_views.readyz, name='readyz'),
     
     # Admin endpoints
     path("dashboard-admin/login/", feedback_views.admin_login, name='admin_login'),
     path("dashboard-admin/tables/", feedback_views.admin_list_tables, name='admin_list_tables'),
+    path("dashboard-admin/schema/", feedback_views.admin_schema_view, name='admin_schema'),
+    path("dashboard-admin/live/", feedback_views.admin_live_feed, name='admin_live_feed'),
+    path("dashboard-admin/metrics/", feedback_views.admin_metrics, name='admin_metrics'),
+    path("dashboard-admin/queue/", feedback_views.admin_queue_stats, name='admin_queue_stats'),
+    path("dashboard-admin/queue/requeue/", feedback_views.admin_queue_requeue, name='admin_queue_requeue'),
+    path("dashboard-admin/reports/ratings/", feedback_views.admin_rating_report, name='admin_rating_report'),
+    path("dashboard-admin/reports/progress/", feedback_views.admin_progress_report, name='admin_progress_report'),
+    path("dashboard-admin/reports/progress/cohort/", feedback_views.admin_progress_cohort, name='admin_progress_cohort'),
+    path("dashboard-admin/reports/analytics/", feedback_views.admin_analytics_report, name='admin_analytics_report'),
     path("dashboard-admin/table/<str:table_name>/", feedback_views.admin_get_table_data, name='admin_get_table_data'),
+    path("dashboard-admin/table/<str:table_name>/export/", feedback_views.admin_export_table, name='admin_export_table'),
+    path("dashboard-admin/table/<str:table_name>/batch/", feedback_views.admin_batch_rows, name='admin_batch_rows'),
+    path("dashboard-admin/table/<str:table_name>/import/", feedback_views.admin_import_table, name='admin_import_table'),
     path("dashboard-admin/table/<str:table_name>/add/", feedback_views.admin_add_row, name='admin_add_row'),
     path("dashboard-admin/table/<str:table_name>/<str:row_id>/update/", feedback_views.admin_update_row, name='admin_update_row'),
     path("dashboard-admin/table/<str:table_name>/<str:row_id>/delete/", feedback_views.admin_delete_row, name='admin_delete_row'),
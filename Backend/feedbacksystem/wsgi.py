@@ -1,6 +1,17 @@
 import os
-from django.core.wsgi import get_wsgi_application
+
+from feedbacksystem import startup_profile
+startup_profile.enable_from_env()
+
+from django.core.wsgi import get_wsgi_application  # noqa: E402 - imported once profiling is on
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'feedbacksystem.settings')  # changed
 
 application = get_wsgi_application()
+
+from feedback_app.apps import server_started  # noqa: E402
+server_started()
+
+if startup_profile.is_enabled():
+    startup_profile.load_project()
+    startup_profile.report("wsgi")
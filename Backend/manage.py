@@ -7,6 +7,8 @@ import sys
 def main():
     """Run administrative tasks."""
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'feedbacksystem.settings')
+    from feedbacksystem import startup_profile
+    startup_profile.enable_from_env()
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -15,6 +17,10 @@ def main():
             "available on your PYTHONPATH environment variable? Did you "
             "forget to activate a virtual environment?"
         ) from exc
+    if startup_profile.is_enabled():
+        startup_profile.setup(sys.argv)
+        startup_profile.load_project()
+        startup_profile.report("manage.py")
     execute_from_command_line(sys.argv)
 
 
@@ -12,6 +12,15 @@ interface Table {
     row_count: number;
 }
 
+interface TableSchema {
+    model_name: string;
+    table_name: string;
+    pk_field: string;
+    fields: string[];
+    field_meta: TableData['field_meta'];
+    read_only: boolean;
+}
+
 interface TableData {
     model_name: string;
     table_name: string;
@@ -90,6 +99,7 @@ export default function AdminDashboard() {
     const [tables, setTables] = useState<Table[]>([]);
     const [selectedTable, setSelectedTable] = useState<string>('');
     const [tableData, setTableData] = useState<TableData | null>(null);
+    const [schema, setSchema] = useState<Record<string, TableSchema>>({});
     const [loading, setLoading] = useState(false);
 
     // Pagination & Sorting State
@@ -100,7 +110,8 @@ export default function AdminDashboard() {
     const [searchQuery, setSearchQuery] = useState('');
     const [isPaginated, setIsPaginated] = useState(true);
 
-    const READ_ONLY_TABLES = ['feedback_response', 'feedback_submissionlog'];
+    // Writable tables come from the schema's read_only flag; until it loads, offer no edits
+    const isReadOnly = schema[selectedTable]?.read_only ?? true;
 
     const [editingRow, setEditingRow] = useState<any | null>(null);
     const [deleteConfirm, setDeleteConfirm] = useState<any | null>(null);
@@ -120,6 +131,7 @@ export default function AdminDashboard() {
 
     useEffect(() => {
         fetchTables();
+        fetchSchema();
     }, []);
 
     // Debounce search query
@@ -154,6 +166,25 @@ export default function AdminDashboard() {
         }
     };
 
+    // Field metadata rarely changes; fetch it once (ETag-revalidated) instead of with every page
+    const fetchSchema = async () => {
+        try {
+            const res = await fetch(`${API_BASE_URL}/dashboard-admin/schema/`, {
+                credentials: 'include',
+            });
+            const data = await res.json();
+            if (data.status === 'ok') {
+                const byTable: Record<string, TableSchema> = {};
+                data.tables.forEach((t: TableSchema) => {
+                    byTable[t.table_name] = t;
+                });
+                setSchema(byTable);
+            }
+        } catch (error) {
+            // Table pages still carry field_meta when the schema is unavailable
+        }
+    };
+
     const fetchTableData = async (page: number) => {
         setLoading(true);
         try {
@@ -173,12 +204,17 @@ export default function AdminDashboard() {
                 url += `&search=${encodeURIComponent(searchQuery)}`;
             }
 
+            const tableSchema = schema[selectedTable];
+            if (tableSchema) {
+                url += `&meta=false`;
+            }
+
             const res = await fetch(url, {
                 credentials: 'include',
             });
             const data = await res.json();
             if (data.status === 'ok') {
-                setTableData(data);
+                setTableData({ ...data, field_meta: data.field_meta ?? tableSchema?.field_meta });
                 setCurrentPage(data.page); // Update current page from server response
             } else {
                 showToast(data.error || 'Failed to load table data', 'error');
@@ -378,7 +414,7 @@ export default function AdminDashboard() {
                                     </div>
                                 </div>
                                 <div className="flex flex-wrap items-center gap-3">
-                                    {!READ_ONLY_TABLES.some(t => t.toLowerCase() === selectedTable.toLowerCase()) && (
+                                    {!isReadOnly && (
                                         <button
                                             onClick={() => {
                                                 setNewRowData({});
@@ -455,7 +491,7 @@ export default function AdminDashboard() {
                                                         </div>
                                                     </th>
                                                 ))}
-                                                {!READ_ONLY_TABLES.some(t => t.toLowerCase() === selectedTable.toLowerCase()) && (
+                                                {!isReadOnly && (
                                                     <th className="px-3 py-2 text-right text-xs font-bold uppercase tracking-wide sticky right-0 bg-indigo-600 shadow-[-4px_0_12px_-4px_rgba(0,0,0,0.2)] z-20 last:rounded-tr-lg">
                                                         Actions
                                                     </th>
@@ -491,7 +527,7 @@ export default function AdminDashboard() {
                                                         );
                                                     })}
                                                     <td className="px-3 py-2 text-right sticky right-0 group-even:bg-slate-50/50 bg-white group-hover:bg-indigo-50/50 border-l border-slate-200 shadow-[-4px_0_12px_-4px_rgba(0,0,0,0.05)] align-middle z-10">
-                                                        {!READ_ONLY_TABLES.some(t => t.toLowerCase() === selectedTable.toLowerCase()) && (
+                                                        {!isReadOnly && (
                                                             <div className="flex justify-end gap-2">
                                                                 <button
                                                                     onClick={() => handleEdit(row)}
@@ -25,8 +25,8 @@ export default function DashboardLayout({
     useEffect(() => {
         // Check auth
         if (typeof window !== 'undefined') {
-            const session = localStorage.getItem('session_key');
-            if (!session) {
+            const isStudent = localStorage.getItem('is_student');
+            if (!isStudent) {
                 router.push('/');
             } else {
                 setUser({
@@ -54,7 +54,6 @@ export default function LoginPage() {
         const data = await res.json();
         if (data.status === "ok") {
           if (typeof window !== 'undefined') {
-            localStorage.setItem("session_key", data.session_key);
             localStorage.setItem("admin_username", data.username);
             localStorage.setItem("is_admin", "true");
           }
@@ -87,7 +86,8 @@ export default function LoginPage() {
       const data = await res.json();
       if (data.status === "ok") {
         if (typeof window !== 'undefined') {
-          localStorage.setItem("session_key", data.session_key);
+          // The credential stays in its HttpOnly cookie; only a UI marker is kept here
+          localStorage.setItem("is_student", "true");
           localStorage.setItem("enrollment", data.EnrollmentNo);
           localStorage.setItem("fullName", data.FullName);
           localStorage.setItem("email", data.Email);